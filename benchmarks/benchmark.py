@@ -0,0 +1,226 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.fuzzy_topsis import TriangularFuzzyNumber, calculate_fuzzy_topsis
+from mcdm_app.mcdm.topsis import PRECISIONS, calculate_topsis
+
+IMPORT_MODULES = ("mcdm_app.mcdm.core", "mcdm_app.mcdm.topsis")
+
+
+def generate_scores(options: int, criteria: int, seed: int = 0, *, exact: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    weights = rng.uniform(0.1, 1, criteria)
+    is_negative = rng.uniform(size=criteria) < 0.3  # noqa: PLR2004
+    scores = pd.DataFrame(
+        {
+            "Option": np.repeat([f"O{option}" for option in range(options)], criteria),
+            "Criterion": np.tile([f"C{criterion}" for criterion in range(criteria)], options),
+            "Weight": np.tile(weights, options),
+            "Is Negative": np.tile(is_negative, options),
+            "Score": rng.uniform(1, 100, options * criteria).round(2),
+        }
+    )
+    if exact:
+        scores["Score"] = scores["Score"].map(lambda x: Decimal(str(x)))
+        scores["Weight"] = scores["Weight"].map(lambda x: Decimal(str(round(x, 4))))
+    return scores
+
+
+def generate_fuzzy_decision_matrixes(options: int, criteria: int, decision_makers: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(decision_makers):
+        scores = np.sort(rng.integers(1, 10, (options * criteria, 3)), axis=1)
+        weights = np.tile(np.sort(rng.integers(1, 10, (criteria, 3)), axis=1), (options, 1))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Option": np.repeat([f"O{option}" for option in range(options)], criteria),
+                    "Criterion": np.tile([f"C{criterion}" for criterion in range(criteria)], options),
+                    "Is Negative": np.tile(np.arange(criteria) % 3 == 0, options),
+                    "Weight": [TriangularFuzzyNumber(*(Decimal(int(x)) for x in row)) for row in weights],
+                    "Score": [TriangularFuzzyNumber(*(Decimal(int(x)) for x in row)) for row in scores],
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def measure(function: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Best of `repeat` untraced runs, and the peak bytes of one more run under tracemalloc.
+
+    Tracing slows object-heavy Decimal code far more than NumPy code, so timing traced runs would skew the ratios.
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(seconds), peak_bytes
+
+
+def measure_cold_import(module: str, repeat: int) -> tuple[float, int]:
+    """Seconds to import `module` in a fresh interpreter, and the bytes it allocates in a separate traced run."""
+    timed = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    traced = f"import tracemalloc; tracemalloc.start(); import {module}; print(tracemalloc.get_traced_memory()[1])"
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+    def run_child(code: str) -> float:
+        command = [sys.executable, "-c", code]
+        child = subprocess.run(command, capture_output=True, text=True, check=True, env=environment)  # noqa: S603
+        return float(child.stdout)
+
+    seconds = min(run_child(timed) for _ in range(repeat))
+    return seconds, int(run_child(traced))
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    for module in args.import_modules:
+        seconds, peak_bytes = measure_cold_import(module, args.repeat)
+        results.append(
+            {
+                "method": "import",
+                "module": module,
+                "precision": None,
+                "options": 0,
+                "criteria": 0,
+                "decision_makers": 0,
+                "seconds": seconds,
+                "peak_bytes": peak_bytes,
+            }
+        )
+        print(json.dumps(results[-1]), file=sys.stderr)  # noqa: T201
+
+    for options, criteria in itertools.product(args.options, args.criteria):
+        for precision in args.precisions:
+            if precision == "exact" and options * criteria > args.exact_max_cells:
+                continue
+            scores = generate_scores(options, criteria, exact=precision == "exact")
+            seconds, peak_bytes = measure(
+                lambda scores=scores, precision=precision: calculate_topsis(
+                    scores.copy(), precision=precision, deviation_sample=0
+                ),
+                args.repeat,
+            )
+            results.append(
+                {
+                    "method": "topsis",
+                    "precision": precision,
+                    "options": options,
+                    "criteria": criteria,
+                    "decision_makers": 1,
+                    "seconds": seconds,
+                    "peak_bytes": peak_bytes,
+                }
+            )
+            print(json.dumps(results[-1]), file=sys.stderr)  # noqa: T201
+
+        for decision_makers in args.decision_makers:
+            decision_matrixes = generate_fuzzy_decision_matrixes(options, criteria, decision_makers)
+            for precision in args.precisions:
+                if precision == "exact" and options * criteria * decision_makers > args.exact_max_cells:
+                    continue
+                seconds, peak_bytes = measure(
+                    lambda decision_matrixes=decision_matrixes, precision=precision: calculate_fuzzy_topsis(
+                        decision_matrixes.copy(), precision=precision, deviation_sample=0
+                    ),
+                    args.repeat,
+                )
+                results.append(
+                    {
+                        "method": "fuzzy_topsis",
+                        "precision": precision,
+                        "options": options,
+                        "criteria": criteria,
+                        "decision_makers": decision_makers,
+                        "seconds": seconds,
+                        "peak_bytes": peak_bytes,
+                    }
+                )
+                print(json.dumps(results[-1]), file=sys.stderr)  # noqa: T201
+    return results
+
+
+def key(result: dict) -> tuple:
+    return (
+        result["method"],
+        result.get("module"),
+        result["precision"],
+        result["options"],
+        result["criteria"],
+        result["decision_makers"],
+    )
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[str]:
+    baseline_by_key = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        reference = baseline_by_key.get(key(result))
+        if reference is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if result[metric] > reference[metric] * (1 + threshold):
+                regressions.append(
+                    f"{key(result)} {metric}: {reference[metric]:.6g} -> {result[metric]:.6g} "
+                    f"(+{result[metric] / reference[metric] - 1:.0%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the TOPSIS and fuzzy TOPSIS pipelines.")
+    parser.add_argument("--options", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--criteria", type=int, nargs="+", default=[5, 40])
+    parser.add_argument("--decision-makers", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--precisions", nargs="+", choices=PRECISIONS, default=list(PRECISIONS))
+    parser.add_argument("--exact-max-cells", type=int, default=50_000)
+    parser.add_argument("--import-modules", nargs="*", default=list(IMPORT_MODULES), help="modules to cold-import")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown before flagging")
+    args = parser.parse_args()
+
+    results = run(args)
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text())["results"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")  # noqa: T201
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+import json
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray
+from mcdm_app.mcdm.fuzzy_topsis import StackedDecisionMatrixes
+from mcdm_app.mcdm.profiling import profiled_stage
+from mcdm_app.mcdm.streaming import (
+    StreamingCriteria,
+    accumulate_criterion_statistics,
+    calculate_chunk_performance_scores,
+    import_parquet,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+METADATA_KEY = b"mcdm"
+VERTICES = ("a", "b", "c")
+STREAM_BATCH_ROWS = 65_536
+
+ParquetPath = str | Path
+
+
+def criteria_metadata(entries: list[dict[str, Any]]) -> dict[bytes, bytes]:
+    return {METADATA_KEY: json.dumps({"criteria": entries}).encode()}
+
+
+def read_criteria_metadata(schema: "pa.Schema", criteria: Optional[Sequence[str]] = None) -> list[dict[str, Any]]:
+    """The criterion entries stored with a matrix, restricted to and ordered like `criteria` when given."""
+    if not schema.metadata or METADATA_KEY not in schema.metadata:
+        msg = "Parquet file has no decision matrix metadata, write it with write_decision_matrix."
+        raise ValueError(msg)
+    entries = json.loads(schema.metadata[METADATA_KEY])["criteria"]
+    if criteria is None:
+        return entries
+
+    by_name = {entry["name"]: entry for entry in entries}
+    unknown = set(criteria) - set(by_name)
+    if unknown:
+        msg = f"Unknown criteria {sorted(unknown)}."
+        raise ValueError(msg)
+    return [by_name[criterion] for criterion in criteria]
+
+
+def columns_to_matrix(columns: Sequence["pa.Array | pa.ChunkedArray"], dtype: type = np.float64) -> np.ndarray:
+    matrix = np.empty((len(columns[0]) if columns else 0, len(columns)), dtype=dtype)
+    for index, column in enumerate(columns):
+        if column.null_count:
+            msg = "Every option needs a score for every criterion."
+            raise ValueError(msg)
+        # Null-free numeric Arrow buffers convert to NumPy without Python objects; this assignment is the only copy.
+        matrix[:, index] = column.to_numpy()
+    return matrix
+
+
+def to_index(column: "pa.Array | pa.ChunkedArray") -> pd.Index:
+    index = pd.Index(column.to_numpy(zero_copy_only=False))
+    if index.has_duplicates:
+        msg = "Every option can appear only once."
+        raise ValueError(msg)
+    return index
+
+
+def write_decision_matrix(
+    decision_matrix: DecisionMatrix, destination: ParquetPath, row_group_size: Optional[int] = None
+) -> None:
+    """Write options x criteria scores as one float column per criterion, with weights and directions as metadata."""
+    pa, pq = import_parquet()
+    table = pa.table(
+        {
+            "Option": decision_matrix.options.to_numpy(),
+            **{
+                str(criterion): decision_matrix.matrix[:, index]
+                for index, criterion in enumerate(decision_matrix.criteria)
+            },
+        }
+    )
+    entries = [
+        {"name": str(criterion), "weight": float(weight), "is_negative": bool(is_negative)}
+        for criterion, weight, is_negative in zip(
+            decision_matrix.criteria, decision_matrix.weights, decision_matrix.is_negative, strict=True
+        )
+    ]
+    pq.write_table(
+        table.replace_schema_metadata(criteria_metadata(entries)), destination, row_group_size=row_group_size
+    )
+
+
+@profiled_stage
+def read_decision_matrix(
+    source: ParquetPath, criteria: Optional[Sequence[str]] = None, dtype: type = np.float64
+) -> DecisionMatrix:
+    """Read a matrix written by write_decision_matrix, loading only the Option column and the selected criteria."""
+    _, pq = import_parquet()
+    entries = read_criteria_metadata(pq.read_schema(source), criteria)
+    names = [entry["name"] for entry in entries]
+    table = pq.read_table(source, columns=["Option", *names])
+
+    return DecisionMatrix(
+        to_index(table.column("Option")),
+        pd.Index(names),
+        columns_to_matrix([table.column(name) for name in names], dtype),
+        np.array([entry["weight"] for entry in entries], dtype=dtype),
+        np.array([entry["is_negative"] for entry in entries], dtype=bool),
+    )
+
+
+def to_struct_array(values: np.ndarray) -> "pa.StructArray":
+    pa, _ = import_parquet()
+    return pa.StructArray.from_arrays(
+        [pa.array(values[:, vertex]) for vertex in range(len(VERTICES))],
+        names=list(VERTICES),
+        mask=pa.array(np.isnan(values).any(axis=1)),
+    )
+
+
+def write_fuzzy_decision_matrixes(
+    stacked: StackedDecisionMatrixes, destination: ParquetPath, row_group_size: Optional[int] = None
+) -> None:
+    """Write one row per decision maker and option with an a/b/c struct column per criterion.
+
+    Weights go to the metadata, so every decision maker needs a single weight per criterion.
+    """
+    pa, pq = import_parquet()
+    decision_makers, options = len(stacked.decision_makers), len(stacked.options)
+    weights = stacked.weights.values
+    criterion_weights = np.fmax.reduce(weights, axis=1)
+    if (np.abs(weights - criterion_weights[:, None]) > 0).any():
+        msg = "Every decision maker needs a single weight per criterion to be written to Parquet."
+        raise ValueError(msg)
+
+    table = pa.table(
+        {
+            "Decision Maker": np.repeat(stacked.decision_makers.to_numpy(), options),
+            "Option": np.tile(stacked.options.to_numpy(), decision_makers),
+            **{
+                str(criterion): to_struct_array(stacked.scores.values[:, :, index].reshape(-1, len(VERTICES)))
+                for index, criterion in enumerate(stacked.criteria)
+            },
+        }
+    )
+    entries = [
+        {
+            "name": str(criterion),
+            "is_negative": bool(is_negative),
+            "weights": {
+                str(decision_maker): criterion_weights[position, index].tolist()
+                for position, decision_maker in enumerate(stacked.decision_makers)
+            },
+        }
+        for index, (criterion, is_negative) in enumerate(zip(stacked.criteria, stacked.is_negative, strict=True))
+    ]
+    pq.write_table(
+        table.replace_schema_metadata(criteria_metadata(entries)), destination, row_group_size=row_group_size
+    )
+
+
+@profiled_stage
+def read_fuzzy_decision_matrixes(
+    source: ParquetPath, criteria: Optional[Sequence[str]] = None, dtype: type = np.float64
+) -> StackedDecisionMatrixes:
+    _, pq = import_parquet()
+    schema = pq.read_schema(source)
+    entries = read_criteria_metadata(schema, criteria)
+    names = [entry["name"] for entry in entries]
+    has_decision_makers = "Decision Maker" in schema.names
+    table = pq.read_table(source, columns=[*(["Decision Maker"] if has_decision_makers else []), "Option", *names])
+
+    option_codes, options = pd.factorize(table.column("Option").to_numpy(zero_copy_only=False), sort=True)
+    if has_decision_makers:
+        decision_maker_codes, decision_makers = pd.factorize(
+            table.column("Decision Maker").to_numpy(zero_copy_only=False), sort=True
+        )
+    else:
+        decision_maker_codes, decision_makers = np.zeros(table.num_rows, dtype=np.intp), pd.RangeIndex(1)
+    cells = decision_maker_codes * len(options) + option_codes
+    if len(np.unique(cells)) != len(cells):
+        msg = "Every decision maker can evaluate each option only once."
+        raise ValueError(msg)
+
+    shape = (len(decision_makers), len(options), len(names), len(VERTICES))
+    scores = np.full(shape, np.nan, dtype=dtype)
+    for index, name in enumerate(names):
+        column = table.column(name).combine_chunks()
+        evaluated = column.is_valid().to_numpy(zero_copy_only=False)
+        for vertex, field in enumerate(VERTICES):
+            scores[decision_maker_codes[evaluated], option_codes[evaluated], index, vertex] = column.field(
+                field
+            ).to_numpy(zero_copy_only=False)[evaluated]
+
+    criterion_weights = np.array(
+        [[entry["weights"][str(decision_maker)] for entry in entries] for decision_maker in decision_makers],
+        dtype=dtype,
+    ).reshape(len(decision_makers), len(names), len(VERTICES))
+    weights = np.where(np.isnan(scores), np.nan, criterion_weights[:, None])
+
+    return StackedDecisionMatrixes(
+        pd.Index(options),
+        pd.Index(names),
+        pd.Index(decision_makers),
+        FuzzyArray(scores, validate=False),
+        FuzzyArray(weights, validate=False),
+        np.array([entry["is_negative"] for entry in entries], dtype=bool),
+    )
+
+
+def iter_score_batches(
+    parquet: "pq.ParquetFile", names: list[str], batch_rows: int = STREAM_BATCH_ROWS, dtype: type = np.float64
+) -> Iterator[np.ndarray]:
+    for batch in parquet.iter_batches(batch_size=batch_rows, columns=names):
+        yield columns_to_matrix(batch.columns, dtype)
+
+
+@profiled_stage
+def calculate_parquet_topsis(
+    source: ParquetPath,
+    destination: ParquetPath,
+    criteria: Optional[Sequence[str]] = None,
+    batch_rows: int = STREAM_BATCH_ROWS,
+) -> None:
+    """Score a matrix written by write_decision_matrix batch by batch and write Option and Performance Score.
+
+    The first pass gathers the column norms and extremes and the second scores each batch against them and writes it
+    out, so only one batch is held at a time. Ranks are left out because they need every score at once, as in
+    stream_topsis.
+    """
+    pa, pq = import_parquet()
+    parquet = pq.ParquetFile(source)
+    entries = read_criteria_metadata(parquet.schema_arrow, criteria)
+    names = [entry["name"] for entry in entries]
+    streaming_criteria = StreamingCriteria(
+        pd.Index(names),
+        np.array([entry["weight"] for entry in entries], dtype=np.float64),
+        np.array([entry["is_negative"] for entry in entries], dtype=bool),
+    )
+
+    statistics = accumulate_criterion_statistics(iter_score_batches(parquet, names, batch_rows), len(names))
+    schema = pa.schema([parquet.schema_arrow.field("Option"), pa.field("Performance Score", pa.float64())])
+    with pq.ParquetWriter(destination, schema) as writer:
+        for batch in parquet.iter_batches(batch_size=batch_rows, columns=["Option", *names]):
+            performance_scores = calculate_chunk_performance_scores(
+                columns_to_matrix(batch.columns[1:]), streaming_criteria, statistics
+            )
+            writer.write_batch(pa.record_batch([batch.column(0), pa.array(performance_scores)], schema=schema))
+
+
+def write_performance(performance: pd.DataFrame, destination: ParquetPath) -> None:
+    pa, pq = import_parquet()
+    pq.write_table(
+        pa.Table.from_pandas(performance[["Option", "Performance Score", "Rank"]], preserve_index=False), destination
+    )
@@ -0,0 +1,93 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+import numpy as np
+import pandas as pd
+
+Result = TypeVar("Result")
+
+
+def hash_frame(frame: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def hash_param(value: Any) -> str:
+    """Key of one keyword parameter; arrays and frames are hashed by content because their repr truncates."""
+    if isinstance(value, pd.DataFrame):
+        return hash_frame(value)
+    if isinstance(value, pd.Series):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{value.dtype}".encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return repr((value.shape, value.tolist()))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{value.dtype}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+        return digest.hexdigest()
+    return repr(value)
+
+
+def _copy(result: Any) -> Any:
+    if isinstance(result, pd.DataFrame | pd.Series):
+        return result.copy()
+    return result
+
+
+class ScoreCache:
+    """Size-bounded LRU cache of scoring results keyed on the content of their input frames.
+
+    One instance is shared by every Streamlit session, so lookups, inserts and evictions hold a lock; the scoring
+    itself runs outside it, and two sessions missing on the same key at once both compute it.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def get_or_compute(self, function: Callable[..., Result], *frames: pd.DataFrame, **params: Any) -> Result:
+        key = (
+            f"{function.__module__}.{function.__qualname__}",
+            tuple(hash_frame(frame) for frame in frames),
+            tuple((name, hash_param(value)) for name, value in sorted(params.items())),
+        )
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                self._results.move_to_end(key)
+                return _copy(self._results[key])
+            self.misses += 1
+
+        # The scoring pipelines add columns to their inputs, so they get copies to keep the cached key truthful.
+        result = function(*(frame.copy() for frame in frames), **params)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return _copy(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._results), "maxsize": self.maxsize}
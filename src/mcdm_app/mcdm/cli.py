@@ -0,0 +1,180 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+import pandas as pd
+
+from mcdm_app.mcdm.fuzzy_topsis import TriangularFuzzyNumber, calculate_fuzzy_topsis
+from mcdm_app.mcdm.topsis import DEFAULT_DEVIATION_SAMPLE, PRECISIONS, calculate_topsis, to_decimal
+
+METHODS = ("topsis", "fuzzy_topsis")
+FUZZY_CSV_COLUMNS = {
+    "Score": ("Score a", "Score b", "Score c"),
+    "Weight": ("Weight a", "Weight b", "Weight c"),
+}
+
+# A task is (fallback problem id, "jsonl" or "csv", JSON line or CSV path); workers parse their own input.
+Task = tuple[str, str, str]
+
+
+def to_fuzzy_number(vertices: Sequence[Any]) -> TriangularFuzzyNumber:
+    a, b, c = (Decimal(str(vertex)) for vertex in vertices)
+    return TriangularFuzzyNumber(a, b, c)
+
+
+def read_problem(kind: str, payload: str) -> dict[str, Any]:
+    if kind == "jsonl":
+        return json.loads(payload)
+
+    path = Path(payload)
+    frame = pd.read_csv(path)
+    fuzzy = all(column in frame for columns in FUZZY_CSV_COLUMNS.values() for column in columns)
+    if fuzzy:
+        for column, vertices in FUZZY_CSV_COLUMNS.items():
+            frame[column] = frame[list(vertices)].to_numpy().tolist()
+        frame = frame.drop(columns=[vertex for vertices in FUZZY_CSV_COLUMNS.values() for vertex in vertices])
+    return {"id": path.stem, "method": "fuzzy_topsis" if fuzzy else "topsis", "scores": frame.to_dict("records")}
+
+
+def score_problem(problem: dict[str, Any], precision: str, deviation_sample: int) -> pd.DataFrame:
+    method = problem.get("method", "topsis")
+    if method not in METHODS:
+        msg = f"Unknown method {method!r}, expected one of {METHODS}."
+        raise ValueError(msg)
+    precision = problem.get("precision", precision)
+
+    scores = pd.DataFrame.from_records(problem["scores"])
+    scores["Is Negative"] = scores["Is Negative"].fillna(False).astype(bool) if "Is Negative" in scores else False
+    if method == "fuzzy_topsis":
+        scores["Score"] = scores["Score"].map(to_fuzzy_number)
+        scores["Weight"] = scores["Weight"].map(to_fuzzy_number)
+        return calculate_fuzzy_topsis(scores, precision=precision, deviation_sample=deviation_sample)
+
+    if precision == "exact":
+        scores["Score"] = scores["Score"].map(to_decimal)
+        scores["Weight"] = scores["Weight"].map(to_decimal)
+    return calculate_topsis(scores, precision=precision, deviation_sample=deviation_sample)
+
+
+def to_json_number(value: Any) -> Optional[float]:
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def ranking_records(performance: pd.DataFrame) -> list[dict[str, Any]]:
+    return [
+        {"Option": option, "Performance Score": to_json_number(score), "Rank": to_json_number(rank)}
+        for option, score, rank in performance[["Option", "Performance Score", "Rank"]].itertuples(index=False)
+    ]
+
+
+def score_task(
+    task: Task, precision: str = "float64", deviation_sample: int = DEFAULT_DEVIATION_SAMPLE
+) -> tuple[str, Optional[str]]:
+    """Score one problem, returning its JSON result line and, if it failed, the error."""
+    problem_id, kind, payload = task
+    try:
+        problem = read_problem(kind, payload)
+        problem_id = str(problem.get("id", problem_id))
+        performance = score_problem(problem, precision, deviation_sample)
+    except Exception as error:  # One bad problem must not stop the batch.
+        failure = f"{type(error).__name__}: {error}"
+        return json.dumps({"id": problem_id, "error": failure}), f"{problem_id}: {failure}"
+
+    result = {"id": problem_id, "ranking": ranking_records(performance)}
+    if "max_score_deviation" in performance.attrs:
+        result["max_score_deviation"] = to_json_number(performance.attrs["max_score_deviation"])
+    return json.dumps(result, default=str), None
+
+
+def read_tasks(source: Path) -> Iterator[Task]:
+    if source.is_dir():
+        for path in sorted(source.glob("*.csv")):
+            yield path.stem, "csv", str(path)
+        return
+
+    with source.open() as lines:
+        for number, line in enumerate(lines, start=1):
+            if line.strip():
+                yield f"line {number}", "jsonl", line
+
+
+def _score_task_with_options(arguments: tuple[Task, str, int]) -> tuple[str, Optional[str]]:
+    return score_task(*arguments)
+
+
+def _write_results(results: Iterator[tuple[str, Optional[str]]], output: TextIO) -> tuple[int, list[str]]:
+    processed = 0
+    failures = []
+    for line, failure in results:
+        output.write(line + "\n")
+        processed += 1
+        if failure is not None:
+            failures.append(failure)
+    return processed, failures
+
+
+def score_batch(
+    source: Path,
+    output: Path,
+    precision: str = "float64",
+    deviation_sample: int = DEFAULT_DEVIATION_SAMPLE,
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> tuple[int, list[str]]:
+    """Score every problem in `source`, writing one JSON result per line to `output` in input order."""
+    tasks = ((task, precision, deviation_sample) for task in read_tasks(source))
+    with output.open("w") as results:
+        if workers == 1:
+            return _write_results(map(_score_task_with_options, tasks), results)
+        # imap keeps input order while chunksize amortizes the pickling round trip over many small problems.
+        with multiprocessing.Pool(workers) as pool:
+            return _write_results(pool.imap(_score_task_with_options, tasks, chunksize=chunk_size), results)
+
+
+def positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        msg = f"expected a positive integer, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score a batch of TOPSIS and fuzzy TOPSIS decision problems.")
+    parser.add_argument("source", type=Path, help="JSONL file with one problem per line, or a directory of CSV files")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="JSONL file to write results to")
+    parser.add_argument("--precision", choices=PRECISIONS, default="float64")
+    parser.add_argument(
+        "--deviation-sample", type=int, default=DEFAULT_DEVIATION_SAMPLE, help="options re-scored exactly per problem"
+    )
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=positive_int, default=16, help="problems sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    processed, failures = score_batch(
+        args.source, args.output, args.precision, args.deviation_sample, args.workers, args.chunk_size
+    )
+    elapsed = time.perf_counter() - started
+
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)  # noqa: T201
+    print(  # noqa: T201
+        f"Scored {processed - len(failures)}/{processed} problems in {elapsed:.2f}s "
+        f"({processed / elapsed if elapsed else 0:.1f} problems/s, {len(failures)} failed).",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+
+from mcdm_app.mcdm.fuzzy_array import FUZZY_NUMBER_VERTICES, FuzzyArray
+from mcdm_app.mcdm.profiling import profiled_stage
+
+# Batch workers import this module alone to score plain arrays, so pandas is only imported once a DataFrame is passed.
+if TYPE_CHECKING:
+    import pandas as pd
+
+DECISION_MAKER_AGGREGATIONS = ("mean", "geometric", "weighted")
+ROW_HASH_SEED = 0
+
+
+def validate_weights(weights: np.ndarray) -> np.ndarray:
+    """Reject negative weights, which the crisp kernels need because they take the ideal points from raw extremes."""
+    weights = np.asarray(weights, dtype=np.float64)
+    if (weights < 0).any():
+        msg = "Weights must be non-negative."
+        raise ValueError(msg)
+    return weights
+
+
+def normalize_matrix(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.sqrt(np.square(matrix).sum(axis=-2, keepdims=True))
+
+
+@profiled_stage
+def calculate_dense_performance_scores(matrix: np.ndarray, weights: np.ndarray, is_negative: np.ndarray) -> np.ndarray:
+    normalized_weighted = normalize_matrix(matrix) * weights[..., None, :]
+
+    column_max = normalized_weighted.max(axis=-2, keepdims=True)
+    column_min = normalized_weighted.min(axis=-2, keepdims=True)
+    ideal_best = np.where(is_negative, column_min, column_max)
+    ideal_worst = np.where(is_negative, column_max, column_min)
+
+    distance_best = np.sqrt(np.square(normalized_weighted - ideal_best).sum(axis=-1))
+    distance_worst = np.sqrt(np.square(normalized_weighted - ideal_worst).sum(axis=-1))
+
+    return distance_worst / (distance_best + distance_worst)
+
+
+@profiled_stage
+def combine_decision_maker_arrays(
+    decision_makers: FuzzyArray, how: str = "mean", expertise: Optional[np.ndarray] = None
+) -> FuzzyArray:
+    values = decision_makers.values
+    evaluated = ~np.isnan(values[..., 0])
+    evaluations = evaluated.sum(axis=0).astype(values.dtype)
+    if (evaluations == 0).any():
+        msg = "Every option and criterion needs at least one evaluation."
+        raise ValueError(msg)
+
+    if how == "mean":
+        return FuzzyArray(
+            np.stack(
+                [
+                    np.where(evaluated, values[..., 0], np.inf).min(axis=0),
+                    np.where(evaluated, values[..., 1], 0).sum(axis=0) / evaluations,
+                    np.where(evaluated, values[..., 2], -np.inf).max(axis=0),
+                ],
+                axis=-1,
+            ),
+            validate=False,
+        )
+
+    if how not in DECISION_MAKER_AGGREGATIONS:
+        msg = f"Unknown aggregation {how!r}, expected one of {DECISION_MAKER_AGGREGATIONS}."
+        raise ValueError(msg)
+
+    if expertise is None:
+        expertise = np.ones(len(values))
+    expertise = np.asarray(expertise, dtype=values.dtype).reshape(-1, *([1] * (values.ndim - 1)))
+    weights = np.where(evaluated[..., None], expertise, 0)
+    total_expertise = weights.sum(axis=0)
+    if (total_expertise == 0).any():
+        msg = "Every option and criterion needs an evaluation from a decision maker with non-zero expertise."
+        raise ValueError(msg)
+    weights = weights / total_expertise
+
+    if how == "geometric":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logarithms = np.where(evaluated[..., None], np.log(values), 0)
+            weighted_logarithms = np.where(weights == 0, 0, weights * logarithms)
+        return FuzzyArray(np.exp(weighted_logarithms.sum(axis=0)), validate=False)
+
+    return FuzzyArray((weights * np.where(evaluated[..., None], values, 0)).sum(axis=0), validate=False)
+
+
+def calculate_dense_distances(
+    scores: FuzzyArray, weights: FuzzyArray, is_negative: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    normalization_factor = np.where(is_negative, scores.a.min(axis=0), scores.c.max(axis=0))
+
+    normalized = np.empty_like(scores.values)
+    normalized[:, ~is_negative] = (scores[:, ~is_negative] / normalization_factor[~is_negative]).values
+    normalized[:, is_negative] = (scores[:, is_negative] ** -1 * normalization_factor[is_negative]).values
+
+    weighted_normalized = FuzzyArray(normalized, validate=False) * weights
+    ideal_best = weighted_normalized.combine(axis=0, how="max")
+    ideal_worst = weighted_normalized.combine(axis=0, how="min")
+
+    return (
+        FuzzyArray.euclidean_distance(weighted_normalized, ideal_best).sum(axis=-1),
+        FuzzyArray.euclidean_distance(weighted_normalized, ideal_worst).sum(axis=-1),
+    )
+
+
+@profiled_stage
+def calculate_dense_closeness_coefficients(
+    scores: FuzzyArray, weights: FuzzyArray, is_negative: np.ndarray
+) -> np.ndarray:
+    distance_best, distance_worst = calculate_dense_distances(scores, weights, is_negative)
+    return distance_worst / (distance_worst + distance_best)
+
+
+def find_duplicate_rows(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First occurrence of each distinct row, the distinct row of every row and how often each distinct row occurs.
+
+    Rows are compared bit for bit through a 64-bit hash, which only needs a one-dimensional sort; a hash collision is
+    caught by checking every row against its representative and falls back to sorting the rows themselves.
+    """
+    rows = np.ascontiguousarray(rows.reshape(len(rows), -1))
+    bits = rows.view(f"u{rows.dtype.itemsize}").astype(np.uint64, copy=False)
+    multipliers = np.random.default_rng(ROW_HASH_SEED).integers(1, 2**63, rows.shape[1], dtype=np.uint64) | 1
+    # Folding the high half in first lets exponent and sign bits reach the low bits of the product.
+    hashes = (bits ^ (bits >> np.uint64(32))) @ multipliers
+
+    _, first, inverse, counts = np.unique(hashes, return_index=True, return_inverse=True, return_counts=True)
+    if not (bits == bits[first][inverse]).all():
+        _, first, inverse, counts = np.unique(bits, axis=0, return_index=True, return_inverse=True, return_counts=True)
+    return first, inverse.reshape(-1), counts
+
+
+@dataclass(frozen=True)
+class Ranking:
+    options: np.ndarray
+    scores: np.ndarray
+    ranks: np.ndarray
+
+
+def is_frame(value: Any) -> bool:
+    # A DataFrame can only exist once pandas is imported, so checking sys.modules never imports it.
+    pandas = sys.modules.get("pandas")
+    return pandas is not None and isinstance(value, pandas.DataFrame)
+
+
+def rank_descending(scores: np.ndarray) -> np.ndarray:
+    """1-based ranks with the highest score first, ties sharing their average rank and NaN left unranked."""
+    scores = np.asarray(scores, dtype=np.float64)
+    ranks = np.full(len(scores), np.nan)
+    evaluated = ~np.isnan(scores)
+    order = np.argsort(-scores[evaluated], kind="stable")
+    ordered = scores[evaluated][order]
+
+    starts = np.flatnonzero(np.concatenate([[True], ordered[1:] != ordered[:-1]]))
+    ends = np.append(starts[1:], len(ordered))
+    evaluated_ranks = np.empty(len(ordered))
+    evaluated_ranks[order] = np.repeat((starts + ends + 1) / 2, ends - starts)
+    ranks[evaluated] = evaluated_ranks
+    return ranks
+
+
+def to_options(options: Optional[Sequence[Any]], count: int) -> np.ndarray:
+    if options is None:
+        return np.arange(count)
+    options = np.asarray(options)
+    if options.shape != (count,):
+        msg = f"Options need shape ({count},), got {options.shape}."
+        raise ValueError(msg)
+    return options
+
+
+def topsis(
+    scores: "np.ndarray | Sequence[Sequence[float]] | pd.DataFrame",
+    weights: "Optional[np.ndarray | Sequence[float]]" = None,
+    is_negative: "Optional[np.ndarray | Sequence[bool]]" = None,
+    options: Optional[Sequence[Any]] = None,
+) -> Ranking:
+    """TOPSIS of an options x criteria matrix, or of the long Option / Criterion / Weight / Is Negative / Score frame.
+
+    Weights default to equal and every criterion to benefit.
+    """
+    if is_frame(scores):
+        from mcdm_app.mcdm.decision_matrix import pivot_scores
+
+        frame_options, _, matrix, weights, is_negative = pivot_scores(scores)
+        options = frame_options.to_numpy()
+    else:
+        matrix = np.asarray(scores, dtype=np.float64)
+        if matrix.ndim != 2:  # noqa: PLR2004
+            msg = f"Scores need shape (options, criteria), got {matrix.shape}."
+            raise ValueError(msg)
+        weights = np.ones(matrix.shape[1]) if weights is None else validate_weights(weights)
+        is_negative = np.zeros(matrix.shape[1], dtype=bool) if is_negative is None else np.asarray(is_negative, bool)
+
+    performance_scores = calculate_dense_performance_scores(matrix, weights, is_negative)
+    return Ranking(to_options(options, len(matrix)), performance_scores, rank_descending(performance_scores))
+
+
+def fuzzy_topsis(
+    scores: "np.ndarray | Sequence[Any] | pd.DataFrame",
+    weights: "Optional[np.ndarray | Sequence[Any]]" = None,
+    is_negative: "Optional[np.ndarray | Sequence[bool]]" = None,
+    options: Optional[Sequence[Any]] = None,
+    how: str = "mean",
+    expertise: "Optional[np.ndarray | Sequence[float] | pd.Series]" = None,
+) -> Ranking:
+    """Fuzzy TOPSIS of options x criteria x 3 scores, or decision makers x options x criteria x 3 with NaN where a
+    decision maker gave no score, or of the long fuzzy frame.
+
+    Weights are criteria x 3 or shaped like the scores and default to (1, 1, 1) everywhere. `expertise` weighs the
+    decision makers for the "geometric" and "weighted" aggregations, in order or by Decision Maker for a frame.
+    """
+    if is_frame(scores):
+        from mcdm_app.mcdm.fuzzy_topsis import stack_decision_makers
+
+        stacked = stack_decision_makers(scores)
+        combined_scores, combined_weights = stacked.combine(how, expertise)
+        performance_scores = calculate_dense_closeness_coefficients(
+            combined_scores, combined_weights, stacked.is_negative
+        )
+        return Ranking(stacked.options.to_numpy(), performance_scores, rank_descending(performance_scores))
+
+    values = np.asarray(scores, dtype=np.float64)
+    if values.ndim == 3:  # noqa: PLR2004
+        values = values[None]
+    if values.ndim != 4 or values.shape[-1] != FUZZY_NUMBER_VERTICES:  # noqa: PLR2004
+        msg = f"Fuzzy scores need shape ([decision makers,] options, criteria, 3), got {values.shape}."
+        raise ValueError(msg)
+    weight_values = np.ones(values.shape[-2:]) if weights is None else np.asarray(weights, dtype=np.float64)
+    weight_values = np.where(np.isnan(values), np.nan, np.broadcast_to(weight_values, values.shape))
+    is_negative = np.zeros(values.shape[2], dtype=bool) if is_negative is None else np.asarray(is_negative, bool)
+
+    FuzzyArray.validate(values[~np.isnan(values).any(axis=-1)])
+    performance_scores = calculate_dense_closeness_coefficients(
+        combine_decision_maker_arrays(FuzzyArray(values, validate=False), how, expertise),
+        combine_decision_maker_arrays(FuzzyArray(weight_values, validate=False), how, expertise),
+        is_negative,
+    )
+    return Ranking(to_options(options, values.shape[1]), performance_scores, rank_descending(performance_scores))
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.core import find_duplicate_rows, validate_weights
+from mcdm_app.mcdm.profiling import profiled_stage
+
+
+@profiled_stage
+def pivot_scores(
+    scores: pd.DataFrame, dtype: type = np.float64
+) -> tuple[pd.Index, pd.Index, np.ndarray, np.ndarray, np.ndarray]:
+    matrix = scores.pivot(index="Option", columns="Criterion", values="Score")
+    if matrix.isna().to_numpy().any():
+        msg = "Every option needs a score for every criterion."
+        raise ValueError(msg)
+
+    criteria = scores.drop_duplicates(["Criterion", "Weight", "Is Negative"]).set_index("Criterion")
+    if criteria.index.has_duplicates:
+        msg = "Every criterion needs a single weight and direction."
+        raise ValueError(msg)
+    criteria = criteria.reindex(matrix.columns)
+    validate_weights(criteria["Weight"])
+
+    return (
+        matrix.index,
+        matrix.columns,
+        matrix.to_numpy(dtype=dtype),
+        criteria["Weight"].to_numpy(dtype=dtype),
+        criteria["Is Negative"].to_numpy(dtype=bool),
+    )
+
+
+@dataclass(frozen=True)
+class DecisionMatrix:
+    """Options x criteria scores whose normalizations and extremes are computed on first use and then shared.
+
+    With `multiplicities`, each row stands for that many identical options in the vector normalization.
+    """
+
+    options: pd.Index
+    criteria: pd.Index
+    matrix: np.ndarray
+    weights: np.ndarray
+    is_negative: np.ndarray
+    multiplicities: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_scores(cls, scores: pd.DataFrame, dtype: type = np.float64) -> "DecisionMatrix":
+        return cls(*pivot_scores(scores, dtype))
+
+    @profiled_stage
+    def deduplicate(self) -> tuple["DecisionMatrix", np.ndarray]:
+        """The distinct score rows weighted by how many options share them, and the distinct row of every option."""
+        first, inverse, counts = find_duplicate_rows(self.matrix)
+        if self.multiplicities is not None:
+            counts = np.bincount(inverse, weights=self.multiplicities)
+        deduplicated = DecisionMatrix(
+            self.options[first], self.criteria, self.matrix[first], self.weights, self.is_negative, counts
+        )
+        return deduplicated, inverse
+
+    @cached_property
+    def column_max(self) -> np.ndarray:
+        return self.matrix.max(axis=0)
+
+    @cached_property
+    def column_min(self) -> np.ndarray:
+        return self.matrix.min(axis=0)
+
+    @cached_property
+    def best(self) -> np.ndarray:
+        return np.where(self.is_negative, self.column_min, self.column_max)
+
+    @cached_property
+    def worst(self) -> np.ndarray:
+        return np.where(self.is_negative, self.column_max, self.column_min)
+
+    @cached_property
+    def normalized_weights(self) -> np.ndarray:
+        return self.weights / self.weights.sum()
+
+    @cached_property
+    def vector_norms(self) -> np.ndarray:
+        if self.multiplicities is not None:
+            return np.sqrt(self.multiplicities @ np.square(self.matrix))
+        return np.sqrt(np.square(self.matrix).sum(axis=0))
+
+    @cached_property
+    def squared_gap_best(self) -> np.ndarray:
+        """Per-criterion squared distance of each vector-normalized, unweighted score from the ideal best."""
+        return np.square((self.matrix - self.best) / self.vector_norms)
+
+    @cached_property
+    def squared_gap_worst(self) -> np.ndarray:
+        return np.square((self.matrix - self.worst) / self.vector_norms)
+
+    @cached_property
+    def weighted_vector_normalized(self) -> np.ndarray:
+        return self.matrix * (self.weights / self.vector_norms)
+
+    @cached_property
+    def ratio_normalized(self) -> np.ndarray:
+        """Scores over the column best for benefit criteria and the column best over scores for cost criteria."""
+        if (self.matrix <= 0).any():
+            msg = "Ratio normalization needs strictly positive scores."
+            raise ValueError(msg)
+        return np.where(self.is_negative, self.column_min / self.matrix, self.matrix / self.column_max)
+
+    @cached_property
+    def ideal_gap(self) -> np.ndarray:
+        """Distance of each score from the column best as a fraction of the best-to-worst range, from 0 to 1."""
+        span = self.best - self.worst
+        return np.divide(self.best - self.matrix, span, out=np.zeros_like(self.matrix), where=span != 0)
+
+
+def as_decision_matrix(scores: "pd.DataFrame | DecisionMatrix", dtype: type = np.float64) -> DecisionMatrix:
+    return scores if isinstance(scores, DecisionMatrix) else DecisionMatrix.from_scores(scores, dtype)
+
+
+def rank_options(options: pd.Index, performance_scores: np.ndarray, *, ascending: bool = False) -> pd.DataFrame:
+    performance = pd.DataFrame({"Option": options.to_numpy(), "Performance Score": performance_scores})
+    performance["Rank"] = performance["Performance Score"].rank(ascending=ascending)
+    return performance
@@ -0,0 +1,112 @@
+from collections.abc import Iterable
+from typing import Any, Optional
+
+import numpy as np
+
+FUZZY_NUMBER_VERTICES = 3
+MAX_REPORTED_CELLS = 10
+
+
+class FuzzyArrayValidationError(ValueError):
+    def __init__(self, cells: list[tuple[int, ...]]):
+        self.cells = cells
+        reported = ", ".join(str(cell) for cell in cells[:MAX_REPORTED_CELLS])
+        if len(cells) > MAX_REPORTED_CELLS:
+            reported += f" and {len(cells) - MAX_REPORTED_CELLS} more"
+        super().__init__(f"Invalid triangular fuzzy numbers at cells {reported}.")
+
+
+class FuzzyArray:
+    """Packed triangular fuzzy numbers stored as a contiguous float array of shape (..., 3), float64 by default."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Any, *, validate: bool = True, dtype: Optional[type] = None):
+        if dtype is None:
+            floating = isinstance(values, np.ndarray) and values.dtype.kind == "f"
+            dtype = values.dtype if floating else np.float64
+        values = np.ascontiguousarray(values, dtype=dtype)
+        if values.ndim == 0 or values.shape[-1] != FUZZY_NUMBER_VERTICES:
+            msg = f"Fuzzy array needs a trailing axis of length 3, got shape {values.shape}."
+            raise ValueError(msg)
+        if validate:
+            FuzzyArray.validate(values)
+        self.values = values
+
+    @staticmethod
+    def validate(values: np.ndarray) -> None:
+        a, b, c = values[..., 0], values[..., 1], values[..., 2]
+        with np.errstate(invalid="ignore"):
+            invalid = ~((a >= 0) & (a <= b) & (b <= c))
+        if invalid.any():
+            raise FuzzyArrayValidationError([tuple(int(i) for i in cell) for cell in np.argwhere(invalid)])
+
+    @classmethod
+    def from_numbers(cls, numbers: Iterable[Any], dtype: type = np.float64) -> "FuzzyArray":
+        # Going through float() per vertex is far cheaper than letting NumPy coerce Decimal objects.
+        flat = np.fromiter(
+            (float(vertex) for number in numbers for vertex in (number.a, number.b, number.c)), dtype=dtype
+        )
+        return cls(flat.reshape(-1, FUZZY_NUMBER_VERTICES))
+
+    @property
+    def a(self) -> np.ndarray:
+        return self.values[..., 0]
+
+    @property
+    def b(self) -> np.ndarray:
+        return self.values[..., 1]
+
+    @property
+    def c(self) -> np.ndarray:
+        return self.values[..., 2]
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.values.shape[:-1]
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __getitem__(self, key: Any) -> "FuzzyArray":
+        if not isinstance(key, tuple):
+            key = (key,)
+        return FuzzyArray(self.values[(*key, Ellipsis, slice(None))], validate=False)
+
+    def __repr__(self) -> str:
+        return f"FuzzyArray(shape={self.shape})"
+
+    def _operand(self, other: "FuzzyArray | float | np.ndarray") -> np.ndarray:
+        if isinstance(other, FuzzyArray):
+            return other.values
+        return np.asarray(other, dtype=self.values.dtype)[..., None]
+
+    # Operands were validated when they were built, so intermediates skip the per-cell check.
+    def __mul__(self, other: "FuzzyArray | float | np.ndarray") -> "FuzzyArray":
+        return FuzzyArray(self.values * self._operand(other), validate=False)
+
+    def __truediv__(self, other: "FuzzyArray | float | np.ndarray") -> "FuzzyArray":
+        return FuzzyArray(self.values / self._operand(other), validate=False)
+
+    def __pow__(self, other: float) -> "FuzzyArray":
+        if other < 0:
+            return FuzzyArray(1 / self.values[..., ::-1] ** abs(other), validate=False)
+        return FuzzyArray(self.values**other, validate=False)
+
+    def combine(self, axis: int = 0, how: Optional[str] = None) -> "FuzzyArray":
+        values_axis = axis - 1 if axis < 0 else axis
+
+        if how == "max":
+            return FuzzyArray(self.values.max(axis=values_axis), validate=False)
+
+        if how == "min":
+            return FuzzyArray(self.values.min(axis=values_axis), validate=False)
+
+        return FuzzyArray(
+            np.stack([self.a.min(axis=axis), self.b.mean(axis=axis), self.c.max(axis=axis)], axis=-1),
+            validate=False,
+        )
+
+    @staticmethod
+    def euclidean_distance(left: "FuzzyArray", right: "FuzzyArray") -> np.ndarray:
+        return np.sqrt(np.square(left.values - right.values).mean(axis=-1))
@@ -1,10 +1,31 @@
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from decimal import Decimal
+from itertools import pairwise
 from typing import Optional
 
 import numpy as np
 import pandas as pd
 
+from mcdm_app.mcdm.core import (
+    DECISION_MAKER_AGGREGATIONS,
+    calculate_dense_closeness_coefficients,
+    calculate_dense_distances,
+    combine_decision_maker_arrays,
+    find_duplicate_rows,
+)
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray
+from mcdm_app.mcdm.profiling import profiled_stage
+from mcdm_app.mcdm.shared_arrays import SharedArray, SharedArraySpec, attach_shared_array
+from mcdm_app.mcdm.topsis import (
+    DEFAULT_DEVIATION_SAMPLE,
+    FLOAT_PRECISIONS,
+    PRECISIONS,
+    measure_max_score_deviation,
+    select_top_k,
+    to_decimal,
+)
+
 
 @dataclass(frozen=True)
 class TriangularFuzzyNumber:
@@ -103,6 +124,7 @@ class TriangularFuzzyNumber:
         ) ** Decimal("0.5")
 
 
+@profiled_stage
 def combine_decision_makers(decision_matrixes: pd.DataFrame) -> pd.DataFrame:
     decision_combined = (
         decision_matrixes.groupby(["Option", "Criterion", "Is Negative"])
@@ -118,6 +140,7 @@ def combine_decision_makers(decision_matrixes: pd.DataFrame) -> pd.DataFrame:
     return decision_combined
 
 
+@profiled_stage
 def calculate_normalized_fuzzy_decision_matrix(combined_decision_matrix: pd.DataFrame) -> pd.DataFrame:
     benefit_criteria = combined_decision_matrix[~combined_decision_matrix["Is Negative"]]
     c_max = (
@@ -146,6 +169,7 @@ def calculate_normalized_fuzzy_decision_matrix(combined_decision_matrix: pd.Data
     return matrix_with_factor
 
 
+@profiled_stage
 def calculate_weighted_normalized_fuzzy_decision_matrix(normalized_fuzzy_decision_matrix: pd.DataFrame) -> pd.DataFrame:
     normalized_fuzzy_decision_matrix["WeightedNormalizedScore"] = (
         normalized_fuzzy_decision_matrix["NormalizedScore"] * normalized_fuzzy_decision_matrix["Weight"]
@@ -154,6 +178,7 @@ def calculate_weighted_normalized_fuzzy_decision_matrix(normalized_fuzzy_decisio
     return normalized_fuzzy_decision_matrix
 
 
+@profiled_stage
 def calculate_ideal_solutions(weighted_normalized_fuzzy_decision_matrix: pd.DataFrame) -> pd.DataFrame:
     ideal_best = (
         weighted_normalized_fuzzy_decision_matrix.groupby("Criterion")["WeightedNormalizedScore"]
@@ -172,6 +197,7 @@ def calculate_ideal_solutions(weighted_normalized_fuzzy_decision_matrix: pd.Data
     return with_ideal_best_worst
 
 
+@profiled_stage
 def calculate_distance_from_solutions(with_ideal_solutions: pd.DataFrame) -> pd.DataFrame:
     with_ideal_solutions["DistanceBest"] = with_ideal_solutions.apply(
         lambda row: TriangularFuzzyNumber.euclidean_distance(row["WeightedNormalizedScore"], row["IdealBest"]),
@@ -184,6 +210,7 @@ def calculate_distance_from_solutions(with_ideal_solutions: pd.DataFrame) -> pd.
     return with_ideal_solutions
 
 
+@profiled_stage
 def calculate_closeness_coefficient(distance_from_solutions: pd.DataFrame) -> pd.DataFrame:
     distance_per_option = (
         distance_from_solutions.groupby("Option")
@@ -204,7 +231,226 @@ def calculate_closeness_coefficient(distance_from_solutions: pd.DataFrame) -> pd
     return distance_per_option
 
 
-def calculate_fuzzy_topsis(decision_matrixes: pd.DataFrame) -> pd.DataFrame:
+@dataclass(frozen=True)
+class StackedDecisionMatrixes:
+    options: pd.Index
+    criteria: pd.Index
+    decision_makers: pd.Index
+    scores: FuzzyArray
+    weights: FuzzyArray
+    is_negative: np.ndarray
+
+    def combine(
+        self, how: str = "mean", expertise: "Optional[np.ndarray | pd.Series]" = None
+    ) -> tuple[FuzzyArray, FuzzyArray]:
+        expertise = self.align_expertise(expertise)
+        return (
+            combine_decision_maker_arrays(self.scores, how, expertise),
+            combine_decision_maker_arrays(self.weights, how, expertise),
+        )
+
+    def select_options(self, positions: np.ndarray) -> "StackedDecisionMatrixes":
+        return replace(
+            self, options=self.options[positions], scores=self.scores[:, positions], weights=self.weights[:, positions]
+        )
+
+    def align_expertise(self, expertise: "Optional[np.ndarray | pd.Series]") -> Optional[np.ndarray]:
+        if isinstance(expertise, pd.Series):
+            return expertise.reindex(self.decision_makers).to_numpy(dtype=np.float64)
+        return expertise
+
+
+@dataclass(frozen=True)
+class DecisionMatrixCells:
+    options: pd.Index
+    criteria: pd.Index
+    decision_makers: pd.Index
+    decision_maker_codes: np.ndarray
+    option_codes: np.ndarray
+    criterion_codes: np.ndarray
+    is_negative: np.ndarray
+
+
+def index_decision_matrixes(decision_matrixes: pd.DataFrame) -> DecisionMatrixCells:
+    option_codes, options = pd.factorize(decision_matrixes["Option"], sort=True)
+    criterion_codes, criteria = pd.factorize(decision_matrixes["Criterion"], sort=True)
+    if "Decision Maker" in decision_matrixes:
+        decision_maker_codes, decision_makers = pd.factorize(decision_matrixes["Decision Maker"], sort=True)
+    else:
+        decision_maker_codes = decision_matrixes.groupby(["Option", "Criterion"]).cumcount().to_numpy()
+        decision_makers = pd.RangeIndex(decision_maker_codes.max() + 1)
+
+    cells = (decision_maker_codes * len(options) + option_codes) * len(criteria) + criterion_codes
+    if len(np.unique(cells)) != len(cells):
+        msg = "Every decision maker can evaluate each option and criterion only once."
+        raise ValueError(msg)
+
+    is_negative = np.zeros(len(criteria), dtype=bool)
+    is_negative[criterion_codes] = decision_matrixes["Is Negative"].to_numpy(dtype=bool)
+
+    return DecisionMatrixCells(
+        options, criteria, decision_makers, decision_maker_codes, option_codes, criterion_codes, is_negative
+    )
+
+
+@profiled_stage
+def stack_decision_makers(decision_matrixes: pd.DataFrame, dtype: type = np.float64) -> StackedDecisionMatrixes:
+    cells = index_decision_matrixes(decision_matrixes)
+    shape = (len(cells.decision_makers), len(cells.options), len(cells.criteria), 3)
+    scores = np.full(shape, np.nan, dtype=dtype)
+    scores[cells.decision_maker_codes, cells.option_codes, cells.criterion_codes] = FuzzyArray.from_numbers(
+        decision_matrixes["Score"], dtype
+    ).values
+    weights = np.full(shape, np.nan, dtype=dtype)
+    weights[cells.decision_maker_codes, cells.option_codes, cells.criterion_codes] = FuzzyArray.from_numbers(
+        decision_matrixes["Weight"], dtype
+    ).values
+
+    return StackedDecisionMatrixes(
+        cells.options,
+        cells.criteria,
+        cells.decision_makers,
+        FuzzyArray(scores, validate=False),
+        FuzzyArray(weights, validate=False),
+        cells.is_negative,
+    )
+
+
+def calculate_segmented_closeness_coefficients(
+    scores: np.ndarray, weights: np.ndarray, segment_starts: np.ndarray, is_negative: np.ndarray
+) -> np.ndarray:
+    """Closeness coefficients of many combined fuzzy problems stacked row-wise as options x criteria x 3.
+
+    Each problem starts at a row in `segment_starts` and needs at least one option.
+    """
+    segment_lengths = np.diff(segment_starts, append=len(scores))
+    normalization_factor = np.where(
+        is_negative,
+        np.minimum.reduceat(scores[..., 0], segment_starts),
+        np.maximum.reduceat(scores[..., 2], segment_starts),
+    )
+    normalization_factor = np.repeat(normalization_factor, segment_lengths, axis=0)[..., None]
+    with np.errstate(divide="ignore"):
+        normalized = np.where(
+            is_negative[:, None], normalization_factor / scores[..., ::-1], scores / normalization_factor
+        )
+
+    weighted_normalized = normalized * weights
+    ideal_best = np.repeat(np.maximum.reduceat(weighted_normalized, segment_starts), segment_lengths, axis=0)
+    ideal_worst = np.repeat(np.minimum.reduceat(weighted_normalized, segment_starts), segment_lengths, axis=0)
+
+    distance_best = np.sqrt(np.square(weighted_normalized - ideal_best).mean(axis=-1)).sum(axis=-1)
+    distance_worst = np.sqrt(np.square(weighted_normalized - ideal_worst).mean(axis=-1)).sum(axis=-1)
+    return distance_worst / (distance_worst + distance_best)
+
+
+_shard_state: dict[str, object] = {}
+
+
+def _initialize_shard_worker(
+    scores: SharedArraySpec,
+    weights: SharedArraySpec,
+    is_negative: np.ndarray,
+    how: str,
+    expertise: Optional[np.ndarray],
+) -> None:
+    _shard_state["scores"] = attach_shared_array(scores)
+    _shard_state["weights"] = attach_shared_array(weights)
+    _shard_state["is_negative"] = is_negative
+    _shard_state["how"] = how
+    _shard_state["expertise"] = expertise
+
+
+def _calculate_shard_distances(criteria: slice) -> tuple[np.ndarray, np.ndarray]:
+    how: str = _shard_state["how"]  # pyright: ignore
+    expertise: Optional[np.ndarray] = _shard_state["expertise"]  # pyright: ignore
+    scores = FuzzyArray(_shard_state["scores"][:, :, criteria], validate=False)  # pyright: ignore
+    weights = FuzzyArray(_shard_state["weights"][:, :, criteria], validate=False)  # pyright: ignore
+    return calculate_dense_distances(
+        combine_decision_maker_arrays(scores, how, expertise),
+        combine_decision_maker_arrays(weights, how, expertise),
+        _shard_state["is_negative"][criteria],  # pyright: ignore
+    )
+
+
+@profiled_stage
+def calculate_sharded_closeness_coefficients(
+    stacked: StackedDecisionMatrixes,
+    workers: int,
+    how: str = "mean",
+    expertise: "Optional[np.ndarray | pd.Series]" = None,
+) -> np.ndarray:
+    """Closeness coefficients with criteria split across worker processes reading the stacked arrays from shared memory.
+
+    Aggregation, normalization, ideal solutions and distances are all per criterion, so each worker returns partial
+    per-option distance sums for its criteria and only those are added up here.
+    """
+    if how not in DECISION_MAKER_AGGREGATIONS:
+        msg = f"Unknown aggregation {how!r}, expected one of {DECISION_MAKER_AGGREGATIONS}."
+        raise ValueError(msg)
+    bounds = np.linspace(0, len(stacked.criteria), min(workers, len(stacked.criteria)) + 1).astype(int)
+    shards = [slice(start, stop) for start, stop in pairwise(bounds)]
+
+    with SharedArray(stacked.scores.values) as scores, SharedArray(stacked.weights.values) as weights:
+        with ProcessPoolExecutor(
+            max_workers=len(shards),
+            initializer=_initialize_shard_worker,
+            initargs=(scores.spec, weights.spec, stacked.is_negative, how, stacked.align_expertise(expertise)),
+        ) as executor:
+            partial_distances = list(executor.map(_calculate_shard_distances, shards))
+
+    distance_best = np.sum([best for best, _ in partial_distances], axis=0)
+    distance_worst = np.sum([worst for _, worst in partial_distances], axis=0)
+    return distance_worst / (distance_worst + distance_best)
+
+
+def calculate_dense_fuzzy_topsis(
+    decision_matrixes: pd.DataFrame,
+    how: str = "mean",
+    expertise: "Optional[np.ndarray | pd.Series]" = None,
+    dtype: type = np.float64,
+    workers: int = 1,
+    *,
+    deduplicate: bool = False,
+) -> pd.DataFrame:
+    stacked = stack_decision_makers(decision_matrixes, dtype)
+    if workers > 1 and len(stacked.criteria) > 1:
+        if deduplicate:
+            # Options evaluated identically by every decision maker combine identically, so only distinct ones ship.
+            first, inverse, _ = find_duplicate_rows(
+                np.concatenate([stacked.scores.values, stacked.weights.values], axis=-1).swapaxes(0, 1)
+            )
+            performance_scores = calculate_sharded_closeness_coefficients(
+                stacked.select_options(first), workers, how, expertise
+            )[inverse]
+        else:
+            performance_scores = calculate_sharded_closeness_coefficients(stacked, workers, how, expertise)
+    else:
+        scores, weights = stacked.combine(how, expertise)
+        if deduplicate:
+            # Duplicates leave every column extreme, and so the normalization and ideal solutions, unchanged.
+            first, inverse, _ = find_duplicate_rows(np.concatenate([scores.values, weights.values], axis=-1))
+            performance_scores = calculate_dense_closeness_coefficients(
+                scores[first], weights[first], stacked.is_negative
+            )[inverse]
+        else:
+            performance_scores = calculate_dense_closeness_coefficients(scores, weights, stacked.is_negative)
+
+    performance = pd.DataFrame({"Option": stacked.options.to_numpy(), "Performance Score": performance_scores})
+    performance["Rank"] = performance["Performance Score"].rank(ascending=False)
+
+    return performance
+
+
+def calculate_fuzzy_topsis_top_k(decision_matrixes: pd.DataFrame, k: int) -> pd.DataFrame:
+    stacked = stack_decision_makers(decision_matrixes)
+    scores, weights = stacked.combine()
+    return select_top_k(
+        stacked.options, calculate_dense_closeness_coefficients(scores, weights, stacked.is_negative), k
+    )
+
+
+def calculate_exact_fuzzy_topsis(decision_matrixes: pd.DataFrame) -> pd.DataFrame:
     return calculate_closeness_coefficient(
         calculate_distance_from_solutions(
             calculate_ideal_solutions(
@@ -214,3 +460,53 @@ def calculate_fuzzy_topsis(decision_matrixes: pd.DataFrame) -> pd.DataFrame:
             )
         )
     )[["Option", "ClosenessCoefficient", "Rank"]].rename(columns={"ClosenessCoefficient": "Performance Score"})  # pyright: ignore
+
+
+def to_exact_fuzzy_number(number: TriangularFuzzyNumber) -> TriangularFuzzyNumber:
+    return TriangularFuzzyNumber(to_decimal(number.a), to_decimal(number.b), to_decimal(number.c))
+
+
+def calculate_fuzzy_topsis(
+    decision_matrixes: pd.DataFrame,
+    precision: str = "float64",
+    deviation_sample: int = DEFAULT_DEVIATION_SAMPLE,
+    workers: int = 1,
+    *,
+    deduplicate: bool = False,
+    how: str = "mean",
+    expertise: "Optional[np.ndarray | pd.Series]" = None,
+) -> pd.DataFrame:
+    """Fuzzy TOPSIS of the long decision matrix frame, combining decision makers by `how` weighted by `expertise`.
+
+    The exact pipeline only knows the unweighted mean, so other aggregations report a NaN score deviation.
+    """
+    mean_aggregation = how == "mean" and expertise is None
+    if precision == "exact":
+        if not mean_aggregation:
+            msg = "Exact fuzzy TOPSIS only combines decision makers by their unweighted mean."
+            raise ValueError(msg)
+        if deduplicate:
+            msg = "Deduplication only applies to the float precisions."
+            raise ValueError(msg)
+        performance = calculate_exact_fuzzy_topsis(decision_matrixes)
+        performance.attrs["max_score_deviation"] = 0.0
+        return performance
+    if precision not in FLOAT_PRECISIONS:
+        msg = f"Unknown precision {precision!r}, expected one of {PRECISIONS}."
+        raise ValueError(msg)
+
+    dtype = FLOAT_PRECISIONS[precision]
+    performance = calculate_dense_fuzzy_topsis(
+        decision_matrixes, how, expertise, dtype=dtype, workers=workers, deduplicate=deduplicate
+    )
+    performance.attrs["max_score_deviation"] = measure_max_score_deviation(
+        decision_matrixes,
+        lambda sample: calculate_dense_fuzzy_topsis(sample, dtype=dtype),
+        lambda sample: calculate_exact_fuzzy_topsis(
+            sample.assign(
+                Score=sample["Score"].map(to_exact_fuzzy_number), Weight=sample["Weight"].map(to_exact_fuzzy_number)
+            )
+        ),
+        deviation_sample if mean_aggregation else 0,
+    )
+    return performance
@@ -0,0 +1,203 @@
+import heapq
+from collections.abc import Hashable, Mapping, Sequence
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.core import validate_weights
+from mcdm_app.mcdm.topsis import pivot_scores
+
+SUM_OF_SQUARES_RECOMPUTE_RATIO = 1e-6
+
+
+class _ExtremeHeap:
+    """Max-heap of one criterion's scores with lazy deletion of removed or overwritten slots."""
+
+    def __init__(self, sign: float):
+        self._sign = sign
+        self._heap: list[tuple[float, int]] = []
+
+    def push(self, value: float, slot: int) -> None:
+        heapq.heappush(self._heap, (-self._sign * value, slot))
+
+    def peek(self, column: np.ndarray, active: np.ndarray) -> float:
+        while self._heap:
+            key, slot = self._heap[0]
+            if active[slot] and column[slot] == -self._sign * key:
+                return -self._sign * key
+            heapq.heappop(self._heap)
+        return np.nan
+
+    def rebuild(self, column: np.ndarray, active: np.ndarray) -> None:
+        slots = np.flatnonzero(active)
+        self._heap = list(zip((-self._sign * column[slots]).tolist(), slots.tolist(), strict=True))
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class IncrementalTopsis:
+    def __init__(self, criteria: Sequence[Hashable], weights: Sequence[float], is_negative: Sequence[bool]):
+        self.criteria = pd.Index(criteria)
+        self.weights = validate_weights(weights)
+        self.is_negative = np.asarray(is_negative, dtype=bool)
+
+        self._slots: dict[Hashable, int] = {}
+        self._free_slots: list[int] = []
+        self._options: list[Optional[Hashable]] = []
+        self._matrix = np.empty((0, len(self.criteria)))
+        self._active = np.zeros(0, dtype=bool)
+        self._squared_distance_best = np.empty((0, len(self.criteria)))
+        self._squared_distance_worst = np.empty((0, len(self.criteria)))
+
+        self._sum_of_squares = np.zeros(len(self.criteria))
+        self._peak_sum_of_squares = np.zeros(len(self.criteria))
+        self._max_heaps = [_ExtremeHeap(1) for _ in self.criteria]
+        self._min_heaps = [_ExtremeHeap(-1) for _ in self.criteria]
+        self._ideal_best = np.full(len(self.criteria), np.nan)
+        self._ideal_worst = np.full(len(self.criteria), np.nan)
+        self._performance: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_scores(cls, scores: pd.DataFrame) -> "IncrementalTopsis":
+        options, criteria, matrix, weights, is_negative = pivot_scores(scores)
+        topsis = cls(criteria, weights, is_negative)
+        topsis._load(options, matrix)
+        return topsis
+
+    def _load(self, options: Sequence[Hashable], matrix: np.ndarray) -> None:
+        self._slots = {option: slot for slot, option in enumerate(options)}
+        if len(self._slots) != len(matrix):
+            msg = "Options must be unique."
+            raise ValueError(msg)
+        self._free_slots = []
+        self._options = list(options)
+        self._matrix = matrix.copy()
+        self._active = np.ones(len(matrix), dtype=bool)
+        self._squared_distance_best = np.empty_like(self._matrix)
+        self._squared_distance_worst = np.empty_like(self._matrix)
+        self._recompute_sum_of_squares()
+        for j, column in enumerate(self._matrix.T):
+            self._max_heaps[j].rebuild(column, self._active)
+            self._min_heaps[j].rebuild(column, self._active)
+        self._ideal_best = np.full(len(self.criteria), np.nan)
+        self._ideal_worst = np.full(len(self.criteria), np.nan)
+        self._refresh_ideals()
+        self._performance = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, option: Hashable) -> bool:
+        return option in self._slots
+
+    def _row(self, scores: "Mapping[Hashable, float] | Sequence[float] | np.ndarray") -> np.ndarray:
+        if isinstance(scores, Mapping):
+            scores = [scores[criterion] for criterion in self.criteria]
+        row = np.asarray(scores, dtype=np.float64)
+        if row.shape != (len(self.criteria),):
+            msg = f"Expected {len(self.criteria)} scores, got shape {row.shape}."
+            raise ValueError(msg)
+        return row
+
+    def _grow(self) -> None:
+        capacity = max(2 * len(self._active), 16)
+        for name in ("_matrix", "_squared_distance_best", "_squared_distance_worst"):
+            grown = np.zeros((capacity, len(self.criteria)))
+            grown[: len(self._active)] = getattr(self, name)
+            setattr(self, name, grown)
+        self._free_slots.extend(range(capacity - 1, len(self._active) - 1, -1))
+        self._options.extend([None] * (capacity - len(self._active)))
+        self._active = np.concatenate([self._active, np.zeros(capacity - len(self._active), dtype=bool)])
+
+    def _recompute_sum_of_squares(self) -> None:
+        self._sum_of_squares = np.square(self._matrix[self._active]).sum(axis=0)
+        self._peak_sum_of_squares = self._sum_of_squares.copy()
+
+    def _remove_squares(self, row: np.ndarray) -> None:
+        """Subtract a row from the running sums, recomputing them once cancellation has eaten most of their peak."""
+        self._sum_of_squares -= np.square(row)
+        if (self._sum_of_squares < SUM_OF_SQUARES_RECOMPUTE_RATIO * self._peak_sum_of_squares).any():
+            self._recompute_sum_of_squares()
+
+    def _refresh_ideals(self) -> None:
+        column_max = np.array([heap.peek(self._matrix[:, j], self._active) for j, heap in enumerate(self._max_heaps)])
+        column_min = np.array([heap.peek(self._matrix[:, j], self._active) for j, heap in enumerate(self._min_heaps)])
+        ideal_best = np.where(self.is_negative, column_min, column_max)
+        ideal_worst = np.where(self.is_negative, column_max, column_min)
+
+        for ideal, current, squared_distance in (
+            (ideal_best, self._ideal_best, self._squared_distance_best),
+            (ideal_worst, self._ideal_worst, self._squared_distance_worst),
+        ):
+            for j in np.flatnonzero(ideal != current):
+                squared_distance[:, j] = np.square(self._matrix[:, j] - ideal[j])
+        self._ideal_best = ideal_best
+        self._ideal_worst = ideal_worst
+
+        for heap in (*self._max_heaps, *self._min_heaps):
+            if len(heap) > 2 * len(self._slots) + 16:
+                for j, column in enumerate(self._matrix.T):
+                    self._max_heaps[j].rebuild(column, self._active)
+                    self._min_heaps[j].rebuild(column, self._active)
+                break
+
+    def _place(self, slot: int, row: np.ndarray) -> None:
+        self._matrix[slot] = row
+        self._active[slot] = True
+        self._sum_of_squares += np.square(row)
+        np.maximum(self._peak_sum_of_squares, self._sum_of_squares, out=self._peak_sum_of_squares)
+        for j, value in enumerate(row.tolist()):
+            self._max_heaps[j].push(value, slot)
+            self._min_heaps[j].push(value, slot)
+        self._squared_distance_best[slot] = np.square(row - self._ideal_best)
+        self._squared_distance_worst[slot] = np.square(row - self._ideal_worst)
+        self._refresh_ideals()
+        self._performance = None
+
+    def insert(self, option: Hashable, scores: "Mapping[Hashable, float] | Sequence[float] | np.ndarray") -> None:
+        if option in self._slots:
+            msg = f"Option {option!r} is already present."
+            raise KeyError(msg)
+        row = self._row(scores)
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+        self._slots[option] = slot
+        self._options[slot] = option
+        self._place(slot, row)
+
+    def update(self, option: Hashable, scores: "Mapping[Hashable, float] | Sequence[float] | np.ndarray") -> None:
+        row = self._row(scores)
+        slot = self._slots[option]
+        self._active[slot] = False
+        self._remove_squares(self._matrix[slot])
+        self._place(slot, row)
+
+    def delete(self, option: Hashable) -> None:
+        slot = self._slots.pop(option)
+        self._active[slot] = False
+        self._remove_squares(self._matrix[slot])
+        self._options[slot] = None
+        self._free_slots.append(slot)
+        self._refresh_ideals()
+        self._performance = None
+
+    def performance_scores(self) -> pd.DataFrame:
+        if self._performance is None:
+            slots = np.flatnonzero(self._active)
+            squared_weights = np.square(self.weights / np.sqrt(self._sum_of_squares))
+            distance_best = np.sqrt(self._squared_distance_best[slots] @ squared_weights)
+            distance_worst = np.sqrt(self._squared_distance_worst[slots] @ squared_weights)
+
+            performance = pd.DataFrame(
+                {
+                    "Option": [self._options[slot] for slot in slots],
+                    "Performance Score": distance_worst / (distance_best + distance_worst),
+                }
+            )
+            performance["Rank"] = performance["Performance Score"].rank(ascending=False)
+            self._performance = performance.sort_values("Option", ignore_index=True)
+        return self._performance.copy()
@@ -0,0 +1,231 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray
+from mcdm_app.mcdm.fuzzy_topsis import (
+    TriangularFuzzyNumber,
+    calculate_dense_closeness_coefficients,
+    calculate_fuzzy_topsis,
+    index_decision_matrixes,
+)
+from mcdm_app.mcdm.profiling import profiled_stage
+from mcdm_app.mcdm.topsis import DEFAULT_DEVIATION_SAMPLE, measure_max_score_deviation
+
+MISSING_CODE = np.iinfo(np.uint8).max
+
+
+@dataclass(frozen=True)
+class LinguisticScale:
+    """Ordered linguistic terms, each standing for one shared triangular fuzzy number and stored as a uint8 code."""
+
+    terms: tuple[str, ...]
+    numbers: tuple[TriangularFuzzyNumber, ...]
+
+    def __post_init__(self):
+        if len(self.terms) != len(self.numbers):
+            msg = "Every linguistic term needs exactly one fuzzy number."
+            raise ValueError(msg)
+        if len(set(self.terms)) != len(self.terms):
+            msg = "Linguistic terms need to be unique."
+            raise ValueError(msg)
+        if not 0 < len(self.terms) < MISSING_CODE:
+            msg = f"A linguistic scale holds between 1 and {MISSING_CODE - 1} terms."
+            raise ValueError(msg)
+
+    @classmethod
+    def from_vertices(cls, vertices: dict[str, tuple[str, str, str]]) -> "LinguisticScale":
+        return cls(
+            tuple(vertices),
+            tuple(TriangularFuzzyNumber(*(Decimal(vertex) for vertex in number)) for number in vertices.values()),
+        )
+
+    @cached_property
+    def values(self) -> np.ndarray:
+        return FuzzyArray.from_numbers(self.numbers).values
+
+    def encode(self, terms: Iterable[str]) -> np.ndarray:
+        terms = pd.Series(list(terms), dtype=object)
+        codes = pd.Categorical(terms, categories=self.terms).codes
+        unknown = terms[codes < 0].unique()
+        if len(unknown):
+            msg = f"Unknown linguistic terms {sorted(map(str, unknown))}, expected one of {list(self.terms)}."
+            raise ValueError(msg)
+        return codes.astype(np.uint8)
+
+    def to_fuzzy_numbers(self, terms: Iterable[str]) -> list[TriangularFuzzyNumber]:
+        """The interned fuzzy number of every term, so repeated terms share a single object."""
+        return [self.numbers[code] for code in self.encode(terms)]
+
+
+DEFAULT_SCALE = LinguisticScale.from_vertices(
+    {
+        "Very Low": ("1", "1", "3"),
+        "Low": ("1", "3", "5"),
+        "Medium": ("3", "5", "7"),
+        "High": ("5", "7", "9"),
+        "Very High": ("7", "9", "9"),
+    }
+)
+
+
+@dataclass(frozen=True)
+class LinguisticDecisionMatrixes:
+    """Decision makers x options x criteria score and weight codes, with MISSING_CODE where nothing was evaluated."""
+
+    options: pd.Index
+    criteria: pd.Index
+    decision_makers: pd.Index
+    scores: np.ndarray
+    weights: np.ndarray
+    is_negative: np.ndarray
+
+    def combine(self, score_scale: LinguisticScale, weight_scale: LinguisticScale) -> tuple[FuzzyArray, FuzzyArray]:
+        return (
+            combine_term_counts(count_terms(self.scores, score_scale), score_scale),
+            combine_term_counts(count_terms(self.weights, weight_scale), weight_scale),
+        )
+
+
+def count_terms(codes: np.ndarray, scale: LinguisticScale) -> np.ndarray:
+    """How many decision makers chose each term in every options x criteria cell, counted one term at a time."""
+    return np.stack([(codes == code).sum(axis=0, dtype=np.int32) for code in range(len(scale.terms))], axis=-1)
+
+
+def combine_term_counts(counts: np.ndarray, scale: LinguisticScale) -> FuzzyArray:
+    """The mean aggregation of each cell's chosen terms: the smallest a, the mean b and the largest c."""
+    evaluations = counts.sum(axis=-1)
+    if (evaluations == 0).any():
+        msg = "Every option and criterion needs at least one evaluation."
+        raise ValueError(msg)
+    chosen = counts > 0
+    return FuzzyArray(
+        np.stack(
+            [
+                np.where(chosen, scale.values[:, 0], np.inf).min(axis=-1),
+                counts @ scale.values[:, 1] / evaluations,
+                np.where(chosen, scale.values[:, 2], -np.inf).max(axis=-1),
+            ],
+            axis=-1,
+        ),
+        validate=False,
+    )
+
+
+@profiled_stage
+def encode_decision_makers(
+    decision_matrixes: pd.DataFrame, score_scale: LinguisticScale, weight_scale: LinguisticScale
+) -> LinguisticDecisionMatrixes:
+    cells = index_decision_matrixes(decision_matrixes)
+    shape = (len(cells.decision_makers), len(cells.options), len(cells.criteria))
+    scores = np.full(shape, MISSING_CODE, dtype=np.uint8)
+    scores[cells.decision_maker_codes, cells.option_codes, cells.criterion_codes] = score_scale.encode(
+        decision_matrixes["Score"]
+    )
+    weights = np.full(shape, MISSING_CODE, dtype=np.uint8)
+    weights[cells.decision_maker_codes, cells.option_codes, cells.criterion_codes] = weight_scale.encode(
+        decision_matrixes["Weight"]
+    )
+
+    return LinguisticDecisionMatrixes(
+        cells.options, cells.criteria, cells.decision_makers, scores, weights, cells.is_negative
+    )
+
+
+@profiled_stage
+def calculate_linguistic_closeness_coefficients(
+    scores: np.ndarray,
+    weights: np.ndarray,
+    is_negative: np.ndarray,
+    score_values: np.ndarray,
+    weight_values: np.ndarray,
+) -> np.ndarray:
+    """Closeness coefficients of options x criteria code matrixes, with every product and distance read from tables.
+
+    A criterion's weighted normalized cell depends only on its score and weight codes, so the criteria x score terms
+    x weight terms table of those products, and of their distances to the ideal solutions, replaces per-cell math.
+    """
+    criteria = np.arange(scores.shape[1])
+    normalization_factor = np.where(
+        is_negative, score_values[scores, 0].min(axis=0), score_values[scores, 2].max(axis=0)
+    )
+    normalized = np.where(
+        is_negative[:, None, None],
+        normalization_factor[:, None, None] / score_values[None, :, ::-1],
+        score_values[None] / normalization_factor[:, None, None],
+    )
+    products = normalized[:, :, None] * weight_values[None, None]
+
+    used = np.zeros(products.shape[:3], dtype=bool)
+    used[criteria, scores, weights] = True
+    ideal_best = np.where(used[..., None], products, -np.inf).max(axis=(1, 2))
+    ideal_worst = np.where(used[..., None], products, np.inf).min(axis=(1, 2))
+
+    distance_best = np.sqrt(np.square(products - ideal_best[:, None, None]).mean(axis=-1))
+    distance_worst = np.sqrt(np.square(products - ideal_worst[:, None, None]).mean(axis=-1))
+    option_distance_best = distance_best[criteria, scores, weights].sum(axis=-1)
+    option_distance_worst = distance_worst[criteria, scores, weights].sum(axis=-1)
+    return option_distance_worst / (option_distance_worst + option_distance_best)
+
+
+def calculate_dense_linguistic_fuzzy_topsis(
+    decision_matrixes: pd.DataFrame,
+    score_scale: LinguisticScale = DEFAULT_SCALE,
+    weight_scale: Optional[LinguisticScale] = None,
+) -> pd.DataFrame:
+    weight_scale = weight_scale or score_scale
+    encoded = encode_decision_makers(decision_matrixes, score_scale, weight_scale)
+    if len(encoded.decision_makers) == 1 and (encoded.scores != MISSING_CODE).all():
+        performance_scores = calculate_linguistic_closeness_coefficients(
+            encoded.scores[0], encoded.weights[0], encoded.is_negative, score_scale.values, weight_scale.values
+        )
+    else:
+        # Aggregating several decision makers leaves the scale, so the tables only serve a single one; the others are
+        # combined from per-cell term counts rather than decoding every decision maker's evaluations to floats.
+        scores, weights = encoded.combine(score_scale, weight_scale)
+        performance_scores = calculate_dense_closeness_coefficients(scores, weights, encoded.is_negative)
+
+    performance = pd.DataFrame({"Option": encoded.options.to_numpy(), "Performance Score": performance_scores})
+    performance["Rank"] = performance["Performance Score"].rank(ascending=False)
+
+    return performance
+
+
+def to_fuzzy_decision_matrixes(
+    decision_matrixes: pd.DataFrame, score_scale: LinguisticScale, weight_scale: LinguisticScale
+) -> pd.DataFrame:
+    return decision_matrixes.assign(
+        Score=score_scale.to_fuzzy_numbers(decision_matrixes["Score"]),
+        Weight=weight_scale.to_fuzzy_numbers(decision_matrixes["Weight"]),
+    )
+
+
+def calculate_linguistic_fuzzy_topsis(
+    decision_matrixes: pd.DataFrame,
+    score_scale: LinguisticScale = DEFAULT_SCALE,
+    weight_scale: Optional[LinguisticScale] = None,
+    precision: str = "float64",
+    deviation_sample: int = DEFAULT_DEVIATION_SAMPLE,
+) -> pd.DataFrame:
+    """Fuzzy TOPSIS over a frame whose Score and Weight columns hold linguistic terms instead of fuzzy numbers."""
+    weight_scale = weight_scale or score_scale
+    if precision != "float64":
+        return calculate_fuzzy_topsis(
+            to_fuzzy_decision_matrixes(decision_matrixes, score_scale, weight_scale), precision, deviation_sample
+        )
+
+    performance = calculate_dense_linguistic_fuzzy_topsis(decision_matrixes, score_scale, weight_scale)
+    performance.attrs["max_score_deviation"] = measure_max_score_deviation(
+        decision_matrixes,
+        lambda sample: calculate_dense_linguistic_fuzzy_topsis(sample, score_scale, weight_scale),
+        lambda sample: calculate_fuzzy_topsis(
+            to_fuzzy_decision_matrixes(sample, score_scale, weight_scale), precision="exact"
+        ),
+        deviation_sample,
+    )
+    return performance
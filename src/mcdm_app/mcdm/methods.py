@@ -0,0 +1,33 @@
+from collections.abc import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix, as_decision_matrix
+from mcdm_app.mcdm.topsis import calculate_dense_topsis
+from mcdm_app.mcdm.vikor import calculate_vikor
+from mcdm_app.mcdm.weighted import calculate_wpm, calculate_wsm
+
+METHODS: dict[str, Callable[[DecisionMatrix], pd.DataFrame]] = {
+    "TOPSIS": calculate_dense_topsis,
+    "VIKOR": calculate_vikor,
+    "WSM": calculate_wsm,
+    "WPM": calculate_wpm,
+}
+
+
+def calculate_method_ranks(
+    scores: "pd.DataFrame | DecisionMatrix", methods: Sequence[str] = tuple(METHODS), dtype: type = np.float64
+) -> pd.DataFrame:
+    """Rank the same options with several methods, pivoting and normalizing the scores only once."""
+    unknown = [method for method in methods if method not in METHODS]
+    if unknown:
+        msg = f"Unknown methods {unknown}, expected some of {tuple(METHODS)}."
+        raise ValueError(msg)
+
+    decision_matrix = as_decision_matrix(scores, dtype)
+    ranks = pd.DataFrame({"Option": decision_matrix.options.to_numpy()})
+    for method in methods:
+        ranks[f"{method} Rank"] = METHODS[method](decision_matrix)["Rank"].to_numpy()
+
+    return ranks
@@ -0,0 +1,110 @@
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray
+from mcdm_app.mcdm.fuzzy_topsis import TriangularFuzzyNumber, calculate_dense_closeness_coefficients
+from mcdm_app.mcdm.topsis import to_decimal
+
+
+class RunningFuzzyAggregate:
+    """Running min-a / sum-b / count / max-c of fuzzy numbers per option and criterion, the state behind "mean"."""
+
+    def __init__(self, shape: tuple[int, int]):
+        self.min_a = np.full(shape, np.inf)
+        self.sum_b = np.zeros(shape)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.max_c = np.full(shape, -np.inf)
+
+    def add(self, options: np.ndarray, criteria: np.ndarray, numbers: FuzzyArray) -> None:
+        # The unbuffered ufunc.at forms fold repeated cells in one call, so a batch may hold many respondents.
+        np.minimum.at(self.min_a, (options, criteria), numbers.a)
+        np.add.at(self.sum_b, (options, criteria), numbers.b)
+        np.add.at(self.count, (options, criteria), 1)
+        np.maximum.at(self.max_c, (options, criteria), numbers.c)
+
+    def combined(self) -> FuzzyArray:
+        if (self.count == 0).any():
+            msg = "Every option and criterion needs at least one evaluation."
+            raise ValueError(msg)
+        return FuzzyArray(np.stack([self.min_a, self.sum_b / self.count, self.max_c], axis=-1), validate=False)
+
+
+class OnlineDecisionMakerAggregator:
+    """Folds decision-maker evaluations into the "mean" combination as they arrive, without keeping them.
+
+    Memory stays at a few floats per option and criterion however many respondents are added; the combined matrix can
+    be taken at any point and fed to calculate_fuzzy_topsis or scored directly.
+    """
+
+    def __init__(self, options: Sequence[str], criteria: Sequence[str], is_negative: Sequence[bool]):
+        self.options = pd.Index(options)
+        self.criteria = pd.Index(criteria)
+        if self.options.has_duplicates or self.criteria.has_duplicates:
+            msg = "Options and criteria need to be unique."
+            raise ValueError(msg)
+        self.is_negative = np.asarray(is_negative, dtype=bool)
+        if self.is_negative.shape != (len(self.criteria),):
+            msg = f"Directions need shape ({len(self.criteria)},), got {self.is_negative.shape}."
+            raise ValueError(msg)
+
+        shape = (len(self.options), len(self.criteria))
+        self.scores = RunningFuzzyAggregate(shape)
+        self.weights = RunningFuzzyAggregate(shape)
+        self.evaluations = 0
+
+    @classmethod
+    def from_decision_matrixes(cls, decision_matrixes: pd.DataFrame) -> "OnlineDecisionMakerAggregator":
+        criteria = decision_matrixes.drop_duplicates("Criterion").sort_values("Criterion")
+        aggregator = cls(
+            np.sort(decision_matrixes["Option"].unique()),
+            criteria["Criterion"].to_numpy(),
+            criteria["Is Negative"].to_numpy(dtype=bool),
+        )
+        aggregator.add(decision_matrixes)
+        return aggregator
+
+    def add(self, evaluations: pd.DataFrame) -> None:
+        """Fold in Option / Criterion / Score / Weight rows, each row one evaluation by one respondent."""
+        options = self.options.get_indexer(evaluations["Option"])
+        criteria = self.criteria.get_indexer(evaluations["Criterion"])
+        if (options < 0).any() or (criteria < 0).any():
+            unknown = sorted(
+                {*evaluations["Option"][options < 0].astype(str), *evaluations["Criterion"][criteria < 0].astype(str)}
+            )
+            msg = f"Evaluations of unknown options or criteria {unknown}."
+            raise ValueError(msg)
+
+        # Both are converted before either is folded in, so an invalid row leaves the running state untouched.
+        scores = FuzzyArray.from_numbers(evaluations["Score"])
+        weights = FuzzyArray.from_numbers(evaluations["Weight"])
+        self.scores.add(options, criteria, scores)
+        self.weights.add(options, criteria, weights)
+        self.evaluations += len(evaluations)
+
+    def combined(self) -> tuple[FuzzyArray, FuzzyArray]:
+        return self.scores.combined(), self.weights.combined()
+
+    def to_decision_matrix(self) -> pd.DataFrame:
+        """The combined matrix in the long Option / Criterion / Is Negative / Score / Weight form, one row per cell."""
+        scores, weights = self.combined()
+        return pd.DataFrame(
+            {
+                "Option": np.repeat(self.options.to_numpy(), len(self.criteria)),
+                "Criterion": np.tile(self.criteria.to_numpy(), len(self.options)),
+                "Is Negative": np.tile(self.is_negative, len(self.options)),
+                "Score": to_fuzzy_numbers(scores),
+                "Weight": to_fuzzy_numbers(weights),
+            }
+        )
+
+    def calculate_closeness_coefficients(self) -> np.ndarray:
+        return calculate_dense_closeness_coefficients(*self.combined(), self.is_negative)
+
+
+def to_fuzzy_numbers(numbers: FuzzyArray) -> list[TriangularFuzzyNumber]:
+    return [
+        TriangularFuzzyNumber(to_decimal(a), to_decimal(b), to_decimal(c))
+        for a, b, c in numbers.values.reshape(-1, 3).tolist()
+    ]
@@ -0,0 +1,133 @@
+import functools
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, TypeVar
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class StageRecord:
+    stage: str
+    depth: int
+    seconds: float
+    rows_in: Optional[int]
+    rows_out: Optional[int]
+    allocated_bytes: Optional[int]
+
+
+@dataclass
+class StageProfile:
+    """Per-stage wall time, row counts and peak traced allocations collected by `profile_stages`."""
+
+    trace_memory: bool = True
+    records: list[Optional[StageRecord]] = field(default_factory=list)
+    _child_peaks: list[int] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        stages = [asdict(record) for record in self.records if record is not None]
+        return {
+            "stages": stages,
+            "seconds": sum(stage["seconds"] for stage in stages if stage["depth"] == 0),
+        }
+
+    def to_frame(self) -> "pd.DataFrame":
+        # Imported here so array-only callers of the profiled kernels never pay for pandas.
+        import pandas as pd
+
+        return pd.DataFrame(self.to_dict()["stages"], columns=list(StageRecord.__dataclass_fields__))
+
+    def log(self, target: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        for stage in self.to_dict()["stages"]:
+            (target or logger).log(
+                level,
+                "stage=%s depth=%d seconds=%.6f rows_in=%s rows_out=%s allocated_bytes=%s",
+                stage["stage"],
+                stage["depth"],
+                stage["seconds"],
+                stage["rows_in"],
+                stage["rows_out"],
+                stage["allocated_bytes"],
+                extra={"mcdm_stage": stage},
+            )
+
+
+_active_profile: ContextVar[Optional[StageProfile]] = ContextVar("mcdm_stage_profile", default=None)
+
+
+@contextmanager
+def profile_stages(*, trace_memory: bool = True) -> Iterator[StageProfile]:
+    profile = StageProfile(trace_memory=trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _active_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _active_profile.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def _rows(value: Any) -> Optional[int]:
+    if isinstance(value, tuple):
+        return _rows(value[0]) if value else None
+    shape = getattr(value, "shape", None)
+    if shape:
+        return shape[0]
+    return len(value) if isinstance(value, list | dict) else None
+
+
+def profiled_stage(function: Function) -> Function:
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profile = _active_profile.get()
+        if profile is None:
+            return function(*args, **kwargs)
+
+        position = len(profile.records)
+        profile.records.append(None)
+        depth = len(profile._child_peaks)
+
+        trace_memory = profile.trace_memory and tracemalloc.is_tracing()
+        if trace_memory:
+            start_bytes, enclosing_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        profile._child_peaks.append(0)
+        started = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - started
+            child_peak = profile._child_peaks.pop()
+
+        allocated_bytes = None
+        if trace_memory:
+            # Nested stages reset the tracemalloc peak, so they hand theirs up to be folded into the enclosing one.
+            peak = max(tracemalloc.get_traced_memory()[1], child_peak)
+            allocated_bytes = max(peak - start_bytes, 0)
+            if profile._child_peaks:
+                profile._child_peaks[-1] = max(profile._child_peaks[-1], enclosing_peak, peak)
+
+        profile.records[position] = StageRecord(
+            function.__name__,
+            depth,
+            seconds,
+            _rows(args[0]) if args else None,
+            _rows(result),
+            allocated_bytes,
+        )
+        return result
+
+    return wrapper  # pyright: ignore
@@ -0,0 +1,140 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.profiling import profiled_stage
+from mcdm_app.mcdm.topsis import pivot_scores
+
+PREFERENCE_FUNCTIONS = ("usual", "linear")
+FLOW_METHODS = ("auto", "sorted", "pairwise")
+PAIRWISE_MAX_OPTIONS = 64
+
+
+@dataclass(frozen=True)
+class PreferenceFunction:
+    """Usual (strict) or linear-with-indifference (type V) preference on the difference between two scores."""
+
+    shape: str = "usual"
+    indifference_threshold: float = 0.0
+    preference_threshold: float = 0.0
+
+    def __post_init__(self):
+        if self.shape not in PREFERENCE_FUNCTIONS:
+            msg = f"Unknown preference function {self.shape!r}, expected one of {PREFERENCE_FUNCTIONS}."
+            raise ValueError(msg)
+        if not (0 <= self.indifference_threshold <= self.preference_threshold):
+            msg = "Thresholds need 0 <= indifference threshold <= preference threshold."
+            raise ValueError(msg)
+
+    @property
+    def thresholds(self) -> tuple[float, float]:
+        # The usual function is the linear one with both thresholds at zero: any positive difference is preferred.
+        if self.shape == "usual":
+            return 0.0, 0.0
+        return self.indifference_threshold, self.preference_threshold
+
+    def __call__(self, difference: np.ndarray) -> np.ndarray:
+        q, p = self.thresholds
+        if p == q:
+            return (difference > q).astype(np.float64)
+        return np.clip((difference - q) / (p - q), 0.0, 1.0)
+
+
+def calculate_sorted_preference_sums(values: np.ndarray, function: PreferenceFunction) -> tuple[np.ndarray, np.ndarray]:
+    """Sum P(x_a - x_b) and P(x_b - x_a) over every b for each option a, in O(n log n) with sorting and prefix sums."""
+    q, p = function.thresholds
+    ordered = np.sort(values)
+    prefix = np.concatenate([[0.0], np.cumsum(ordered)])
+
+    # b is fully preferred to by a when x_b < x_a - p, and partially when x_a - p <= x_b < x_a - q.
+    full_below = np.searchsorted(ordered, values - p, side="left")
+    # b fully beats a when x_b > x_a + p, and partially when x_a + q < x_b <= x_a + p.
+    full_above = len(values) - np.searchsorted(ordered, values + p, side="right")
+    if p == q:
+        return full_below.astype(np.float64), full_above.astype(np.float64)
+
+    partial_below_end = np.searchsorted(ordered, values - q, side="left")
+    partial_below = partial_below_end - full_below
+    partial_below_sum = prefix[partial_below_end] - prefix[full_below]
+    preferred = full_below + ((values - q) * partial_below - partial_below_sum) / (p - q)
+
+    partial_above_start = np.searchsorted(ordered, values + q, side="right")
+    partial_above_end = len(values) - full_above
+    partial_above = partial_above_end - partial_above_start
+    partial_above_sum = prefix[partial_above_end] - prefix[partial_above_start]
+    dominated = full_above + (partial_above_sum - (values + q) * partial_above) / (p - q)
+
+    return preferred, dominated
+
+
+def calculate_pairwise_preference_sums(
+    values: np.ndarray, function: PreferenceFunction
+) -> tuple[np.ndarray, np.ndarray]:
+    preference = function(values[:, None] - values[None, :])
+    return preference.sum(axis=1), preference.sum(axis=0)
+
+
+@profiled_stage
+def calculate_promethee_flows(
+    matrix: np.ndarray, weights: np.ndarray, functions: list[PreferenceFunction], method: str = "auto"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Positive and negative outranking flows of an options x criteria matrix whose negative criteria are negated."""
+    if method not in FLOW_METHODS:
+        msg = f"Unknown flow method {method!r}, expected one of {FLOW_METHODS}."
+        raise ValueError(msg)
+    if method == "auto":
+        method = "pairwise" if len(matrix) <= PAIRWISE_MAX_OPTIONS else "sorted"
+    preference_sums = calculate_pairwise_preference_sums if method == "pairwise" else calculate_sorted_preference_sums
+
+    options = len(matrix)
+    positive_flow = np.zeros(options)
+    negative_flow = np.zeros(options)
+    if options <= 1:
+        return positive_flow, negative_flow
+
+    normalized_weights = weights / weights.sum()
+    for criterion, function in enumerate(functions):
+        preferred, dominated = preference_sums(matrix[:, criterion], function)
+        positive_flow += normalized_weights[criterion] * preferred
+        negative_flow += normalized_weights[criterion] * dominated
+
+    return positive_flow / (options - 1), negative_flow / (options - 1)
+
+
+def calculate_promethee(
+    scores: pd.DataFrame,
+    preference_functions: Optional[Mapping[str, PreferenceFunction]] = None,
+    method: str = "auto",
+) -> pd.DataFrame:
+    """Rank options by PROMETHEE II net flow, using the long Option / Criterion / Weight / Is Negative / Score frame.
+
+    Criteria missing from `preference_functions` use the usual preference function.
+    """
+    options, criteria, matrix, weights, is_negative = pivot_scores(scores)
+    preference_functions = preference_functions or {}
+    unknown = set(preference_functions) - set(criteria)
+    if unknown:
+        msg = f"Preference functions given for unknown criteria {sorted(unknown)}."
+        raise ValueError(msg)
+
+    positive_flow, negative_flow = calculate_promethee_flows(
+        np.where(is_negative, -matrix, matrix),
+        weights,
+        [preference_functions.get(criterion, PreferenceFunction()) for criterion in criteria],
+        method,
+    )
+
+    flows = pd.DataFrame(
+        {
+            "Option": options.to_numpy(),
+            "Positive Flow": positive_flow,
+            "Negative Flow": negative_flow,
+            "Net Flow": positive_flow - negative_flow,
+        }
+    )
+    flows["Rank"] = flows["Net Flow"].rank(ascending=False)
+
+    return flows
@@ -0,0 +1,259 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.fuzzy_topsis import stack_decision_makers
+from mcdm_app.mcdm.shared_arrays import SharedArray, SharedArraySpec, attach_shared_array
+from mcdm_app.mcdm.topsis import calculate_dense_performance_scores, pivot_scores
+
+CRISP_DISTRIBUTIONS = ("none", "normal", "uniform")
+FUZZY_DISTRIBUTIONS = ("triangular", "uniform")
+SAMPLE_BATCH_CELLS = 2**20
+
+
+@dataclass(frozen=True)
+class Perturbation:
+    """Relative noise on crisp values, or for fuzzy numbers how far the sampled support stretches around each mode."""
+
+    distribution: str = "normal"
+    scale: float = 0.1
+
+
+DEFAULT_PERTURBATION = Perturbation()
+DEFAULT_FUZZY_PERTURBATION = Perturbation("triangular", 1.0)
+
+
+@dataclass(frozen=True)
+class RankStability:
+    options: pd.Index
+    samples: int
+    seed: int
+    baseline_ranks: np.ndarray
+    rank_counts: np.ndarray
+    rank_reversal_counts: np.ndarray
+
+    def rank_distribution(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            self.rank_counts / self.samples,
+            index=self.options,
+            columns=pd.RangeIndex(1, len(self.options) + 1, name="Rank"),
+        )
+
+    def first_rank_probability(self) -> pd.Series:
+        return self.rank_distribution()[1].rename("P(Rank = 1)")
+
+    def rank_reversal_frequency(self) -> pd.DataFrame:
+        return pd.DataFrame(self.rank_reversal_counts / self.samples, index=self.options, columns=self.options)
+
+    def to_frame(self) -> pd.DataFrame:
+        rank_distribution = self.rank_distribution()
+        return pd.DataFrame(
+            {
+                "Option": self.options.to_numpy(),
+                "Rank": self.baseline_ranks,
+                "P(Rank = 1)": rank_distribution[1].to_numpy(),
+                "Mean Rank": rank_distribution.to_numpy() @ rank_distribution.columns.to_numpy(),
+                "Rank Reversal Frequency": self.rank_reversal_counts.sum(axis=1) / self.samples,
+            }
+        )
+
+
+def sample_crisp(rng: np.random.Generator, base: np.ndarray, perturbation: Perturbation, size: int) -> np.ndarray:
+    shape = (size, *base.shape)
+    if perturbation.distribution == "none" or perturbation.scale == 0:
+        return np.broadcast_to(base, shape)
+    if perturbation.distribution == "normal":
+        noise = rng.normal(0, perturbation.scale, shape)
+    elif perturbation.distribution == "uniform":
+        noise = rng.uniform(-perturbation.scale, perturbation.scale, shape)
+    else:
+        msg = f"Unknown distribution {perturbation.distribution!r}, expected one of {CRISP_DISTRIBUTIONS}."
+        raise ValueError(msg)
+    return np.clip(base * (1 + noise), 0, None)
+
+
+def sample_fuzzy(rng: np.random.Generator, base: np.ndarray, perturbation: Perturbation, size: int) -> np.ndarray:
+    """Crisp draws from each fuzzy number with its support scaled about the mode, so a scale of 1 keeps `[a, c]`."""
+    b = base[..., 1]
+    a = np.clip(b - perturbation.scale * (b - base[..., 0]), 0, None)
+    c = b + perturbation.scale * (base[..., 2] - b)
+    uniform = rng.uniform(size=(size, *a.shape))
+    if perturbation.distribution == "uniform":
+        return a + uniform * (c - a)
+    if perturbation.distribution != "triangular":
+        msg = f"Unknown distribution {perturbation.distribution!r}, expected one of {FUZZY_DISTRIBUTIONS}."
+        raise ValueError(msg)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mode = np.where(c > a, (b - a) / (c - a), 0)
+    return np.where(
+        uniform < mode,
+        a + np.sqrt(uniform * (c - a) * (b - a)),
+        c - np.sqrt((1 - uniform) * (c - a) * (c - b)),
+    )
+
+
+@dataclass(frozen=True)
+class _Problem:
+    fuzzy: bool
+    is_negative: np.ndarray
+    weight_perturbation: Perturbation
+    score_perturbation: Perturbation
+    baseline_ranks: np.ndarray
+
+
+def _simulate_block(
+    problem: _Problem, matrix: np.ndarray, weights: np.ndarray, seed: np.random.SeedSequence, samples: int
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    sample = sample_fuzzy if problem.fuzzy else sample_crisp
+    number_of_options = len(problem.baseline_ranks)
+    baseline_above = problem.baseline_ranks[:, None] < problem.baseline_ranks[None, :]
+    batch_size = max(1, SAMPLE_BATCH_CELLS // max(matrix.size, number_of_options**2))
+
+    rank_counts = np.zeros(number_of_options * number_of_options, dtype=np.int64)
+    rank_reversal_counts = np.zeros((number_of_options, number_of_options), dtype=np.int64)
+    for start in range(0, samples, batch_size):
+        size = min(batch_size, samples - start)
+        sampled_weights = sample(rng, weights, problem.weight_perturbation, size)
+        sampled_matrix = sample(rng, matrix, problem.score_perturbation, size)
+
+        performance_scores = calculate_dense_performance_scores(sampled_matrix, sampled_weights, problem.is_negative)
+        ranks = np.argsort(np.argsort(-performance_scores, axis=1, kind="stable"), axis=1, kind="stable")
+
+        rank_counts += np.bincount(
+            (np.arange(number_of_options) * number_of_options + ranks).ravel(),
+            minlength=number_of_options * number_of_options,
+        )
+        rank_reversal_counts += ((ranks[:, :, None] > ranks[:, None, :]) & baseline_above).sum(axis=0)
+
+    return rank_counts.reshape(number_of_options, number_of_options), rank_reversal_counts
+
+
+_worker_state: dict[str, object] = {}
+
+
+def _initialize_worker(problem: _Problem, matrix: SharedArraySpec, weights: SharedArraySpec) -> None:
+    _worker_state["problem"] = problem
+    _worker_state["matrix"] = attach_shared_array(matrix)
+    _worker_state["weights"] = attach_shared_array(weights)
+
+
+def _simulate_shared_block(seed: np.random.SeedSequence, samples: int) -> tuple[np.ndarray, np.ndarray]:
+    return _simulate_block(
+        _worker_state["problem"],  # pyright: ignore
+        _worker_state["matrix"],  # pyright: ignore
+        _worker_state["weights"],  # pyright: ignore
+        seed,
+        samples,
+    )
+
+
+def _simulate(
+    options: pd.Index,
+    problem: _Problem,
+    matrix: np.ndarray,
+    weights: np.ndarray,
+    samples: int,
+    seed: Optional[int],
+    workers: Optional[int],
+    block_size: int,
+) -> RankStability:
+    if samples < 1:
+        msg = f"Rank stability needs at least one sample, got {samples}."
+        raise ValueError(msg)
+    seed_sequence = np.random.SeedSequence(seed)
+    block_sizes = [min(block_size, samples - start) for start in range(0, samples, block_size)]
+    block_seeds = seed_sequence.spawn(len(block_sizes))
+    workers = min(workers or os.cpu_count() or 1, len(block_sizes))
+
+    if workers <= 1:
+        results = [
+            _simulate_block(problem, matrix, weights, block_seed, size)
+            for block_seed, size in zip(block_seeds, block_sizes, strict=True)
+        ]
+    else:
+        with SharedArray(matrix) as shared_matrix, SharedArray(weights) as shared_weights:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_initialize_worker,
+                initargs=(problem, shared_matrix.spec, shared_weights.spec),
+            ) as executor:
+                results = list(executor.map(_simulate_shared_block, block_seeds, block_sizes))
+
+    return RankStability(
+        options=options,
+        samples=samples,
+        seed=seed_sequence.entropy,  # pyright: ignore
+        baseline_ranks=problem.baseline_ranks + 1,
+        rank_counts=sum(rank_counts for rank_counts, _ in results),  # pyright: ignore
+        rank_reversal_counts=sum(rank_reversal_counts for _, rank_reversal_counts in results),  # pyright: ignore
+    )
+
+
+def _baseline_ranks(performance_scores: np.ndarray) -> np.ndarray:
+    return np.argsort(np.argsort(-performance_scores, kind="stable"), kind="stable")
+
+
+def simulate_topsis_rank_stability(
+    scores: pd.DataFrame,
+    samples: int = 10_000,
+    *,
+    weight_perturbation: Perturbation = DEFAULT_PERTURBATION,
+    score_perturbation: Perturbation = DEFAULT_PERTURBATION,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    block_size: int = 10_000,
+) -> RankStability:
+    options, _, matrix, weights, is_negative = pivot_scores(scores)
+    problem = _Problem(
+        fuzzy=False,
+        is_negative=is_negative,
+        weight_perturbation=weight_perturbation,
+        score_perturbation=score_perturbation,
+        baseline_ranks=_baseline_ranks(calculate_dense_performance_scores(matrix, weights, is_negative)),
+    )
+    return _simulate(options, problem, matrix, weights, samples, seed, workers, block_size)
+
+
+def simulate_fuzzy_topsis_rank_stability(
+    decision_matrixes: pd.DataFrame,
+    samples: int = 10_000,
+    *,
+    weight_perturbation: Perturbation = DEFAULT_FUZZY_PERTURBATION,
+    score_perturbation: Perturbation = DEFAULT_FUZZY_PERTURBATION,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    block_size: int = 10_000,
+) -> RankStability:
+    """Rank stability of fuzzy TOPSIS inputs, with every sample drawing crisp scores and weights from the fuzzy numbers.
+
+    Samples are crisp, so they are scored with crisp TOPSIS and the baseline is crisp TOPSIS at the modes; ranking the
+    baseline by closeness coefficient would count every disagreement between the two methods as a rank reversal.
+    """
+    stacked = stack_decision_makers(decision_matrixes)
+    combined_scores, combined_weights = stacked.combine()
+    criterion_weights = combined_weights.combine(axis=0)
+    problem = _Problem(
+        fuzzy=True,
+        is_negative=stacked.is_negative,
+        weight_perturbation=weight_perturbation,
+        score_perturbation=score_perturbation,
+        baseline_ranks=_baseline_ranks(
+            calculate_dense_performance_scores(combined_scores.b, criterion_weights.b, stacked.is_negative)
+        ),
+    )
+    return _simulate(
+        stacked.options,
+        problem,
+        combined_scores.values,
+        criterion_weights.values,
+        samples,
+        seed,
+        workers,
+        block_size,
+    )
@@ -0,0 +1,426 @@
+import argparse
+import asyncio
+import ipaddress
+import json
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Hashable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.cli import positive_int, ranking_records, score_problem, to_fuzzy_number
+from mcdm_app.mcdm.core import validate_weights
+from mcdm_app.mcdm.fuzzy_topsis import calculate_segmented_closeness_coefficients, stack_decision_makers
+from mcdm_app.mcdm.topsis import FLOAT_PRECISIONS, calculate_segmented_performance_scores, pivot_scores
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+MAX_BODY_BYTES = 16 * 2**20
+LISTEN_BACKLOG = 1024
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+ROUTES = ("/topsis", "/fuzzy-topsis", "/metrics", "/health")
+UNKNOWN_ROUTE = "unknown"
+# Errors a malformed problem raises while being parsed or scored; anything else is a server bug.
+VALIDATION_ERRORS = (AttributeError, KeyError, TypeError, ValueError)
+
+# Each batch function returns one (ranking, error) pair per item so one bad problem fails only its own request.
+Outcome = tuple[Optional[list[dict[str, Any]]], Optional[Exception]]
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: dict[str, str]) -> list[str]:
+        label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{label_text}}} {self.sum}")
+        lines.append(f"{name}_count{{{label_text}}} {self.count}")
+        return lines
+
+
+@dataclass(frozen=True)
+class CrispProblem:
+    options: np.ndarray
+    criteria: tuple[str, ...]
+    matrix: np.ndarray
+    weights: np.ndarray
+    is_negative: np.ndarray
+    precision: str
+
+    def batch_key(self) -> Hashable:
+        return self.criteria, self.is_negative.tobytes(), self.precision
+
+
+@dataclass(frozen=True)
+class FuzzyProblem:
+    """A fuzzy problem with its decision makers already combined into options x criteria x 3 scores and weights."""
+
+    options: np.ndarray
+    criteria: tuple[str, ...]
+    scores: np.ndarray
+    weights: np.ndarray
+    is_negative: np.ndarray
+    precision: str
+
+    def batch_key(self) -> Hashable:
+        return self.criteria, self.is_negative.tobytes(), self.precision
+
+
+def batch_precision(body: dict[str, Any]) -> str:
+    precision = body.get("precision", "float64")
+    if precision not in FLOAT_PRECISIONS:
+        msg = f"Batched scoring needs a float precision, got {precision!r}."
+        raise ValueError(msg)
+    return precision
+
+
+def read_score_records(body: dict[str, Any]) -> pd.DataFrame:
+    scores = pd.DataFrame.from_records(body["scores"])
+    scores["Is Negative"] = scores["Is Negative"].fillna(False).astype(bool) if "Is Negative" in scores else False
+    return scores
+
+
+def parse_crisp_problem(body: dict[str, Any]) -> CrispProblem:
+    """Read `{"criteria": [...], "options": {option: [score per criterion]}}` or the long `{"scores": [...]}` form."""
+    precision = batch_precision(body)
+
+    if "scores" in body:
+        options, criteria, matrix, weights, is_negative = pivot_scores(read_score_records(body))
+        return CrispProblem(options.to_numpy(), tuple(criteria), matrix, weights, is_negative, precision)
+
+    # Building these straight from the parsed JSON skips a DataFrame per request, which dominates small problems.
+    criteria = tuple(criterion["Criterion"] for criterion in body["criteria"])
+    if len(set(criteria)) != len(criteria):
+        msg = "Every criterion needs a single weight and direction."
+        raise ValueError(msg)
+    weights = validate_weights([criterion["Weight"] for criterion in body["criteria"]])
+    is_negative = np.array([bool(criterion.get("Is Negative")) for criterion in body["criteria"]])
+
+    options = np.array(list(body["options"]), dtype=object)
+    matrix = np.array(list(body["options"].values()), dtype=np.float64).reshape(len(options), -1)
+    if len(options) == 0 or matrix.shape[1] != len(criteria) or np.isnan(matrix).any():
+        msg = "Every option needs a score for every criterion."
+        raise ValueError(msg)
+    return CrispProblem(options, criteria, matrix, weights, is_negative, precision)
+
+
+def parse_fuzzy_problem(body: dict[str, Any]) -> FuzzyProblem:
+    """Read the long `{"scores": [...]}` form with `[a, b, c]` scores and weights and combine its decision makers."""
+    precision = batch_precision(body)
+    scores = read_score_records(body)
+    scores["Score"] = scores["Score"].map(to_fuzzy_number)
+    scores["Weight"] = scores["Weight"].map(to_fuzzy_number)
+
+    stacked = stack_decision_makers(scores, FLOAT_PRECISIONS[precision])
+    combined_scores, combined_weights = stacked.combine()
+    return FuzzyProblem(
+        stacked.options.to_numpy(),
+        tuple(stacked.criteria),
+        combined_scores.values,
+        combined_weights.values,
+        stacked.is_negative,
+        precision,
+    )
+
+
+def segment_bounds(problems: "list[CrispProblem] | list[FuzzyProblem]") -> tuple[np.ndarray, np.ndarray]:
+    lengths = np.array([len(problem.options) for problem in problems])
+    return lengths, np.concatenate([[0], np.cumsum(lengths[:-1])])
+
+
+def segmented_outcomes(
+    problems: "list[CrispProblem] | list[FuzzyProblem]", performance_scores: np.ndarray
+) -> list[Outcome]:
+    lengths, starts = segment_bounds(problems)
+    ranks = pd.Series(performance_scores).groupby(np.repeat(np.arange(len(problems)), lengths)).rank(ascending=False)
+    return [
+        (
+            ranking_records(pd.DataFrame({"Option": problem.options, "Performance Score": scores, "Rank": rank})),
+            None,
+        )
+        for problem, scores, rank in zip(
+            problems, np.split(performance_scores, starts[1:]), np.split(ranks.to_numpy(), starts[1:]), strict=True
+        )
+    ]
+
+
+def score_crisp_batch(problems: list[CrispProblem]) -> list[Outcome]:
+    """Score problems sharing criteria, directions and precision in one segmented vectorized pass."""
+    dtype = FLOAT_PRECISIONS[problems[0].precision]
+    performance_scores = calculate_segmented_performance_scores(
+        np.concatenate([problem.matrix for problem in problems]).astype(dtype),
+        segment_bounds(problems)[1],
+        np.stack([problem.weights for problem in problems]).astype(dtype),
+        problems[0].is_negative,
+    )
+    return segmented_outcomes(problems, performance_scores)
+
+
+def score_fuzzy_batch(problems: list[FuzzyProblem]) -> list[Outcome]:
+    """Score fuzzy problems sharing criteria, directions and precision in one segmented vectorized pass."""
+    performance_scores = calculate_segmented_closeness_coefficients(
+        np.concatenate([problem.scores for problem in problems]),
+        np.concatenate([problem.weights for problem in problems]),
+        segment_bounds(problems)[1],
+        problems[0].is_negative,
+    )
+    return segmented_outcomes(problems, performance_scores)
+
+
+def score_problem_batch(problems: list[dict[str, Any]]) -> list[Outcome]:
+    outcomes: list[Outcome] = []
+    for problem in problems:
+        try:
+            outcomes.append((ranking_records(score_problem(problem, "float64", 0)), None))
+        except Exception as error:  # One bad problem must not fail the rest of the batch.
+            outcomes.append((None, error))
+    return outcomes
+
+
+class MicroBatcher:
+    """Coalesce items submitted under the same key within `window` seconds into one executor call."""
+
+    def __init__(
+        self, function: Callable[[list[Any]], list[Outcome]], executor: Executor, window: float, max_batch: int
+    ):
+        self.function = function
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self._pending: dict[Hashable, list[tuple[Any, asyncio.Future]]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._running: set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, item: Any) -> Outcome:
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if batch:
+            self.batch_sizes.observe(len(batch))
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        try:
+            outcomes = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.function, [item for item, _ in batch]
+            )
+        except Exception as error:  # A failed batch fails each of its requests rather than the service.
+            outcomes = [(None, error)] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes, strict=True):
+            if not future.done():
+                future.set_result(outcome)
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ScoringService:
+    """Localhost HTTP service scoring TOPSIS and fuzzy TOPSIS problems with request micro-batching."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        window: float = 0.005,
+        max_batch: int = 256,
+        executor: Optional[Executor] = None,
+    ):
+        if not is_loopback(host):
+            msg = f"The scoring service only listens on localhost, got {host!r}."
+            raise ValueError(msg)
+        self.host = host
+        self.port = port
+        self.executor = executor or ThreadPoolExecutor()
+        self.crisp = MicroBatcher(score_crisp_batch, self.executor, window, max_batch)
+        self.fuzzy = MicroBatcher(score_fuzzy_batch, self.executor, window, max_batch)
+        self.problems = MicroBatcher(score_problem_batch, self.executor, window, max_batch)
+        self.latencies: dict[tuple[str, int], Histogram] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=LISTEN_BACKLOG)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:  # pyright: ignore
+            await self._server.serve_forever()  # pyright: ignore
+
+    async def score_topsis(self, body: dict[str, Any]) -> Outcome:
+        if body.get("precision", "float64") not in FLOAT_PRECISIONS:
+            return await self.problems.submit("topsis", body)
+        # The long form pivots a DataFrame, so parsing runs in the executor like scoring does.
+        problem = await asyncio.get_running_loop().run_in_executor(self.executor, parse_crisp_problem, body)
+        return await self.crisp.submit(problem.batch_key(), problem)
+
+    async def score_fuzzy_topsis(self, body: dict[str, Any]) -> Outcome:
+        if body.get("precision", "float64") not in FLOAT_PRECISIONS:
+            return await self.problems.submit("fuzzy_topsis", {**body, "method": "fuzzy_topsis"})
+        problem = await asyncio.get_running_loop().run_in_executor(self.executor, parse_fuzzy_problem, body)
+        return await self.fuzzy.submit(problem.batch_key(), problem)
+
+    def render_metrics(self) -> str:
+        lines = [
+            "# TYPE mcdm_request_duration_seconds histogram",
+            *(
+                line
+                for (route, status), histogram in sorted(self.latencies.items())
+                for line in histogram.render("mcdm_request_duration_seconds", {"route": route, "status": str(status)})
+            ),
+            "# TYPE mcdm_batch_size histogram",
+            *self.crisp.batch_sizes.render("mcdm_batch_size", {"batcher": "crisp"}),
+            *self.fuzzy.batch_sizes.render("mcdm_batch_size", {"batcher": "fuzzy"}),
+            *self.problems.batch_sizes.render("mcdm_batch_size", {"batcher": "problems"}),
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple[int, str, str]:
+        if path == "/metrics" and method == "GET":
+            return 200, self.render_metrics(), "text/plain; version=0.0.4"
+        if path == "/health" and method == "GET":
+            return 200, json.dumps({"status": "ok"}), "application/json"
+
+        handlers = {"/topsis": self.score_topsis, "/fuzzy-topsis": self.score_fuzzy_topsis}
+        if path not in handlers:
+            return 404, json.dumps({"error": f"Unknown path {path!r}."}), "application/json"
+        if method != "POST":
+            return 405, json.dumps({"error": f"{path} only accepts POST."}), "application/json"
+
+        try:
+            request = json.loads(body)
+            ranking, error = await handlers[path](request)
+        except Exception as raised:  # Even a server bug gets a response rather than a dropped connection.
+            ranking, error = None, raised
+        if error is not None:
+            status = 400 if isinstance(error, VALIDATION_ERRORS) else 500
+            return status, json.dumps({"error": f"{type(error).__name__}: {error}"}), "application/json"
+
+        response = {"ranking": ranking}
+        if isinstance(request, dict) and "id" in request:
+            response = {"id": request["id"], **response}
+        return 200, json.dumps(response, default=str), "application/json"
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request_line := await reader.readline():
+                started = time.perf_counter()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                request = request_line.decode("latin-1").split(" ", 2)
+                # Content-Length is a plain run of digits, so signs and other forms int() would accept are malformed.
+                length_text = headers.get("content-length", "0")
+                if len(request) != 3 or not length_text.isdecimal():  # noqa: PLR2004
+                    await self._respond(writer, 400, json.dumps({"error": "Malformed request."}), "application/json")
+                    break
+                method, path, _ = request
+                length = int(length_text)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, json.dumps({"error": "Body too large."}), "application/json")
+                    break
+
+                body = await reader.readexactly(length) if length else b""
+                status, payload, content_type = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, content_type, keep_alive=keep_alive)
+                # Client paths are unbounded, so unknown ones share a label rather than each adding a series.
+                route = path if path in ROUTES else UNKNOWN_ROUTE
+                self.latencies.setdefault((route, status), Histogram(LATENCY_BUCKETS)).observe(
+                    time.perf_counter() - started
+                )
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter, status: int, payload: str, content_type: str, *, keep_alive: bool = False
+    ) -> None:
+        body = payload.encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve TOPSIS and fuzzy TOPSIS scoring over HTTP on localhost.")
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address to listen on")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--window-ms", type=float, default=5.0, help="how long to wait for requests to coalesce")
+    parser.add_argument(
+        "--max-batch", type=positive_int, default=256, help="flush a batch early once it has this many requests"
+    )
+    parser.add_argument("--workers", type=positive_int, help="executor workers; defaults to the executor's own default")
+    parser.add_argument("--processes", action="store_true", help="score in worker processes instead of threads")
+    args = parser.parse_args()
+
+    executor = ProcessPoolExecutor(args.workers) if args.processes else ThreadPoolExecutor(args.workers)
+    service = ScoringService(args.host, args.port, args.window_ms / 1000, args.max_batch, executor)
+    asyncio.run(service.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedArray:
+    """Copy of a NumPy array in shared memory that worker processes attach to by name instead of unpickling."""
+
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        self._memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self._memory.buf)
+        self.array[...] = array
+        self.spec = SharedArraySpec(self._memory.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        del self.array
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+_attached: list[shared_memory.SharedMemory] = []
+
+
+def attach_shared_array(spec: SharedArraySpec) -> np.ndarray:
+    # Pool workers share the parent's resource tracker, so attaching re-registers the same name and the parent's
+    # unlink stays the single point of cleanup.
+    memory = shared_memory.SharedMemory(name=spec.name)
+    _attached.append(memory)
+    array = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=memory.buf)
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,215 @@
+import heapq
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.core import validate_weights
+from mcdm_app.mcdm.topsis import rank_among, select_top_k, validate_top_k
+
+CSV_SUFFIXES = (".csv",)
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+@dataclass(frozen=True)
+class CriterionStatistics:
+    sum_of_squares: np.ndarray
+    column_max: np.ndarray
+    column_min: np.ndarray
+    options: int
+
+
+@dataclass(frozen=True)
+class StreamingCriteria:
+    criteria: pd.Index
+    weights: np.ndarray
+    is_negative: np.ndarray
+
+    def __post_init__(self):
+        validate_weights(self.weights)
+
+    @classmethod
+    def from_frame(cls, criteria: pd.DataFrame) -> "StreamingCriteria":
+        if criteria["Criterion"].duplicated().any():
+            msg = "Every criterion needs a single weight and direction."
+            raise ValueError(msg)
+        return cls(
+            pd.Index(criteria["Criterion"]),
+            criteria["Weight"].to_numpy(dtype=np.float64),
+            criteria["Is Negative"].fillna(False).to_numpy(dtype=bool),
+        )
+
+
+def import_parquet():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        msg = "Reading and writing Parquet files requires pyarrow."
+        raise ImportError(msg) from error
+    return pa, pq
+
+
+def read_chunks(path: "str | Path", columns: list[str], chunk_size: int) -> Iterator[pd.DataFrame]:
+    suffix = Path(path).suffix.lower()
+    if suffix in CSV_SUFFIXES:
+        with pd.read_csv(path, usecols=columns, chunksize=chunk_size) as reader:
+            yield from reader
+    elif suffix in PARQUET_SUFFIXES:
+        _, pq = import_parquet()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        msg = f"Unsupported file type {suffix!r}, expected one of {CSV_SUFFIXES + PARQUET_SUFFIXES}."
+        raise ValueError(msg)
+
+
+def accumulate_criterion_statistics(chunks: Iterator[np.ndarray], criteria: int) -> CriterionStatistics:
+    sum_of_squares = np.zeros(criteria)
+    column_max = np.full(criteria, -np.inf)
+    column_min = np.full(criteria, np.inf)
+    options = 0
+    for matrix in chunks:
+        sum_of_squares += np.square(matrix).sum(axis=0)
+        np.maximum(column_max, matrix.max(axis=0, initial=-np.inf), out=column_max)
+        np.minimum(column_min, matrix.min(axis=0, initial=np.inf), out=column_min)
+        options += len(matrix)
+    return CriterionStatistics(sum_of_squares, column_max, column_min, options)
+
+
+def calculate_chunk_performance_scores(
+    matrix: np.ndarray, criteria: StreamingCriteria, statistics: CriterionStatistics
+) -> np.ndarray:
+    """Scores of options x criteria rows, or of a stack of them with statistics and weights given per leading index."""
+    scale = (criteria.weights / np.sqrt(statistics.sum_of_squares))[..., None, :]
+    ideal_best = np.where(criteria.is_negative, statistics.column_min, statistics.column_max)[..., None, :]
+    ideal_worst = np.where(criteria.is_negative, statistics.column_max, statistics.column_min)[..., None, :]
+
+    distance_best = np.sqrt(np.square((matrix - ideal_best) * scale).sum(axis=-1))
+    distance_worst = np.sqrt(np.square((matrix - ideal_worst) * scale).sum(axis=-1))
+
+    return distance_worst / (distance_best + distance_worst)
+
+
+def _matrix_chunks(
+    source: "str | Path", criteria: StreamingCriteria, option_column: str, chunk_size: int
+) -> Iterator[tuple[pd.Series, np.ndarray]]:
+    for chunk in read_chunks(source, [option_column, *criteria.criteria], chunk_size):
+        matrix = chunk[criteria.criteria].to_numpy(dtype=np.float64)
+        if np.isnan(matrix).any():
+            msg = "Every option needs a score for every criterion."
+            raise ValueError(msg)
+        yield chunk[option_column], matrix
+
+
+def scan_criterion_statistics(
+    source: "str | Path", criteria: StreamingCriteria, option_column: str = "Option", chunk_size: int = 100_000
+) -> CriterionStatistics:
+    return accumulate_criterion_statistics(
+        (matrix for _, matrix in _matrix_chunks(source, criteria, option_column, chunk_size)),
+        len(criteria.criteria),
+    )
+
+
+def stream_topsis(
+    source: "str | Path",
+    criteria: pd.DataFrame,
+    output: "str | Path",
+    option_column: str = "Option",
+    chunk_size: int = 100_000,
+) -> CriterionStatistics:
+    """Score a wide options x criteria CSV or Parquet file in two passes, writing `Option, Performance Score` rows.
+
+    Ranks are left out because they need every score at once; `stream_topsis_top_k` ranks the best options instead.
+    """
+    streaming_criteria = StreamingCriteria.from_frame(criteria)
+    statistics = scan_criterion_statistics(source, streaming_criteria, option_column, chunk_size)
+
+    suffix = Path(output).suffix.lower()
+    if suffix not in CSV_SUFFIXES + PARQUET_SUFFIXES:
+        msg = f"Unsupported file type {suffix!r}, expected one of {CSV_SUFFIXES + PARQUET_SUFFIXES}."
+        raise ValueError(msg)
+
+    writer = None
+    try:
+        for index, (options, matrix) in enumerate(
+            _matrix_chunks(source, streaming_criteria, option_column, chunk_size)
+        ):
+            performance = pd.DataFrame(
+                {
+                    "Option": options.to_numpy(),
+                    "Performance Score": calculate_chunk_performance_scores(matrix, streaming_criteria, statistics),
+                }
+            )
+            if suffix in CSV_SUFFIXES:
+                performance.to_csv(output, mode="w" if index == 0 else "a", header=index == 0, index=False)
+                continue
+
+            pa, pq = import_parquet()
+            table = pa.Table.from_pandas(performance, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return statistics
+
+
+def stream_topsis_top_k(
+    source: "str | Path",
+    criteria: pd.DataFrame,
+    k: int,
+    option_column: str = "Option",
+    chunk_size: int = 100_000,
+) -> pd.DataFrame:
+    validate_top_k(k)
+    streaming_criteria = StreamingCriteria.from_frame(criteria)
+    statistics = scan_criterion_statistics(source, streaming_criteria, option_column, chunk_size)
+
+    best: list[tuple[float, int, object]] = []
+    # Occurrences of every score that can still tie with or precede a survivor, so ties get their average rank.
+    score_counts: dict[float, int] = {}
+    position = 0
+    for options, matrix in _matrix_chunks(source, streaming_criteria, option_column, chunk_size):
+        performance_scores = calculate_chunk_performance_scores(matrix, streaming_criteria, statistics)
+        ordering_scores = np.where(np.isnan(performance_scores), -np.inf, performance_scores)
+        threshold = best[0][0] if len(best) == k else -np.inf
+        scores, counts = np.unique(ordering_scores[ordering_scores >= threshold], return_counts=True)
+        for score, count in zip(scores.tolist(), counts.tolist(), strict=True):
+            score_counts[score] = score_counts.get(score, 0) + count
+
+        chunk_best = select_top_k(options.to_numpy(), performance_scores, k)
+        for option, performance_score in zip(chunk_best["Option"], chunk_best["Performance Score"], strict=True):
+            # Ties keep the earlier option, matching the in-memory selection.
+            candidate = (-np.inf if np.isnan(performance_score) else performance_score, -position, option)
+            position += 1
+            if len(best) < k:
+                heapq.heappush(best, candidate)
+            elif candidate > best[0]:
+                heapq.heapreplace(best, candidate)
+
+        if len(best) == k:
+            score_counts = {score: count for score, count in score_counts.items() if score >= best[0][0]}
+
+    best.sort(reverse=True)
+    ordering_scores = np.array([performance_score for performance_score, _, _ in best])
+    performance_scores = np.where(np.isneginf(ordering_scores), np.nan, ordering_scores)
+    return pd.DataFrame(
+        {
+            "Option": np.array([option for _, _, option in best], dtype=object),
+            "Performance Score": performance_scores,
+            "Rank": np.where(
+                np.isnan(performance_scores),
+                np.nan,
+                rank_among(
+                    ordering_scores,
+                    np.fromiter(score_counts, dtype=np.float64, count=len(score_counts)),
+                    np.fromiter(score_counts.values(), dtype=np.int64, count=len(score_counts)),
+                ),
+            ),
+        }
+    )
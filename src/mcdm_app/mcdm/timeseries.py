@@ -0,0 +1,201 @@
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from mcdm_app.mcdm.decision_matrix import pivot_scores
+from mcdm_app.mcdm.profiling import profiled_stage
+from mcdm_app.mcdm.streaming import CriterionStatistics, StreamingCriteria, calculate_chunk_performance_scores
+
+
+@dataclass(frozen=True)
+class SnapshotRankings:
+    """TOPSIS scores and ranks of one option set over consecutive snapshots, each of shape (snapshots, options)."""
+
+    options: pd.Index
+    criteria: pd.Index
+    scores: np.ndarray
+    ranks: np.ndarray
+    previous_ranks: Optional[np.ndarray] = None
+
+    @property
+    def rank_changes(self) -> np.ndarray:
+        """Places gained since the previous snapshot, positive when an option moved up, NaN for the first snapshot."""
+        previous = np.full((1, len(self.options)), np.nan) if self.previous_ranks is None else self.previous_ranks
+        return np.concatenate([previous[None, -1], self.ranks[:-1]]) - self.ranks
+
+    def to_frame(self) -> pd.DataFrame:
+        snapshots, options = self.scores.shape
+        return pd.DataFrame(
+            {
+                "Snapshot": np.repeat(np.arange(snapshots), options),
+                "Option": np.tile(self.options.to_numpy(), snapshots),
+                "Performance Score": self.scores.reshape(-1),
+                "Rank": self.ranks.reshape(-1),
+                "Rank Change": self.rank_changes.reshape(-1),
+            }
+        )
+
+
+def rank_snapshots(scores: np.ndarray) -> np.ndarray:
+    return pd.DataFrame(scores).rank(axis=1, ascending=False).to_numpy()
+
+
+def stack_snapshots(
+    snapshots: Sequence[pd.DataFrame],
+) -> tuple[pd.Index, pd.Index, np.ndarray, np.ndarray, np.ndarray]:
+    """Pivot long snapshot frames into a snapshots x options x criteria tensor and snapshots x criteria weights."""
+    pivots = [pivot_scores(snapshot) for snapshot in snapshots]
+    options, criteria, _, _, is_negative = pivots[0]
+    for snapshot_options, snapshot_criteria, _, _, snapshot_is_negative in pivots[1:]:
+        if not (
+            snapshot_options.equals(options)
+            and snapshot_criteria.equals(criteria)
+            and np.array_equal(snapshot_is_negative, is_negative)
+        ):
+            msg = "Every snapshot needs the same options, criteria and criterion directions."
+            raise ValueError(msg)
+    return (
+        options,
+        criteria,
+        np.stack([matrix for _, _, matrix, _, _ in pivots]),
+        np.stack([weights for _, _, _, weights, _ in pivots]),
+        is_negative,
+    )
+
+
+def summarize_snapshots(tensor: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per snapshot and criterion sum of squared scores, maximum and minimum."""
+    return np.square(tensor).sum(axis=-2), tensor.max(axis=-2), tensor.min(axis=-2)
+
+
+def calculate_snapshot_performance_scores(
+    tensor: np.ndarray,
+    weights: np.ndarray,
+    is_negative: np.ndarray,
+    squared_sums: np.ndarray,
+    column_max: np.ndarray,
+    column_min: np.ndarray,
+) -> np.ndarray:
+    """Scores of each snapshot against the squared sums and column extremes given for it as (snapshots, criteria)."""
+    return calculate_chunk_performance_scores(
+        tensor,
+        StreamingCriteria(pd.RangeIndex(tensor.shape[-1]), weights, is_negative),
+        CriterionStatistics(squared_sums, column_max, column_min, tensor.shape[-2]),
+    )
+
+
+def roll(values: np.ndarray, window: int, fill: float, reduce: np.ufunc) -> np.ndarray:
+    padded = np.concatenate([np.full((window - 1, *values.shape[1:]), fill), values])
+    return reduce.reduce(sliding_window_view(padded, window, axis=0), axis=-1)
+
+
+@profiled_stage
+def calculate_snapshot_topsis(
+    tensor: np.ndarray,
+    weights: np.ndarray,
+    is_negative: np.ndarray,
+    window: int = 1,
+    options: Optional[pd.Index] = None,
+    criteria: Optional[pd.Index] = None,
+) -> SnapshotRankings:
+    """Rank a snapshots x options x criteria tensor in one pass.
+
+    Each snapshot is normalized with the vector norms and column extremes pooled over itself and the `window - 1`
+    snapshots before it, so a window of 1 scores every snapshot on its own. Weights are per criterion or per snapshot
+    and criterion.
+    """
+    tensor = np.asarray(tensor, dtype=np.float64)
+    if tensor.ndim != 3:  # noqa: PLR2004
+        msg = f"Snapshots need shape (snapshots, options, criteria), got {tensor.shape}."
+        raise ValueError(msg)
+    if window < 1:
+        msg = "The normalization window needs at least one snapshot."
+        raise ValueError(msg)
+    weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), (len(tensor), tensor.shape[2]))
+
+    squared_sums, column_max, column_min = summarize_snapshots(tensor)
+    if window > 1:
+        squared_sums = roll(squared_sums, window, 0.0, np.add)
+        column_max = roll(column_max, window, -np.inf, np.maximum)
+        column_min = roll(column_min, window, np.inf, np.minimum)
+
+    scores = calculate_snapshot_performance_scores(
+        tensor, weights, np.asarray(is_negative, dtype=bool), squared_sums, column_max, column_min
+    )
+    return SnapshotRankings(
+        pd.RangeIndex(tensor.shape[1]) if options is None else options,
+        pd.RangeIndex(tensor.shape[2]) if criteria is None else criteria,
+        scores,
+        rank_snapshots(scores),
+    )
+
+
+class RollingTopsis:
+    """Ranks snapshots as they arrive, holding only the last `window` per-criterion summaries and the last ranks."""
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        is_negative: np.ndarray,
+        window: int = 1,
+        options: Optional[pd.Index] = None,
+        criteria: Optional[pd.Index] = None,
+    ):
+        if window < 1:
+            msg = "The normalization window needs at least one snapshot."
+            raise ValueError(msg)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.is_negative = np.asarray(is_negative, dtype=bool)
+        self.options = options
+        self.criteria = criteria
+        self._summaries: deque[tuple[np.ndarray, np.ndarray, np.ndarray]] = deque(maxlen=window)
+        self._previous_ranks: Optional[np.ndarray] = None
+
+    def update(self, matrix: np.ndarray, weights: Optional[np.ndarray] = None) -> SnapshotRankings:
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if self.options is None:
+            self.options = pd.RangeIndex(len(matrix))
+        if self.criteria is None:
+            self.criteria = pd.RangeIndex(matrix.shape[1])
+        if matrix.shape != (len(self.options), len(self.criteria)):
+            msg = f"Snapshots need shape ({len(self.options)}, {len(self.criteria)}), got {matrix.shape}."
+            raise ValueError(msg)
+
+        self._summaries.append(summarize_snapshots(matrix))
+        squared_sums, column_max, column_min = (np.stack(summary) for summary in zip(*self._summaries, strict=True))
+        scores = calculate_snapshot_performance_scores(
+            matrix[None],
+            (self.weights if weights is None else np.asarray(weights, dtype=np.float64))[None],
+            self.is_negative,
+            squared_sums.sum(axis=0, keepdims=True),
+            column_max.max(axis=0, keepdims=True),
+            column_min.min(axis=0, keepdims=True),
+        )
+
+        rankings = SnapshotRankings(
+            self.options, self.criteria, scores, rank_snapshots(scores), previous_ranks=self._previous_ranks
+        )
+        self._previous_ranks = rankings.ranks
+        return rankings
+
+
+def iter_snapshot_topsis(snapshots: Iterable[pd.DataFrame], window: int = 1) -> Iterator[SnapshotRankings]:
+    """Rank a stream of long snapshot frames one by one with RollingTopsis."""
+    rolling = None
+    for snapshot in snapshots:
+        options, criteria, matrix, weights, is_negative = pivot_scores(snapshot)
+        if rolling is None:
+            rolling = RollingTopsis(weights, is_negative, window, options, criteria)
+        elif not (
+            options.equals(rolling.options)
+            and criteria.equals(rolling.criteria)
+            and np.array_equal(is_negative, rolling.is_negative)
+        ):
+            msg = "Every snapshot needs the same options, criteria and criterion directions."
+            raise ValueError(msg)
+        yield rolling.update(matrix, weights)
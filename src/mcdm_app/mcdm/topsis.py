@@ -1,8 +1,22 @@
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from decimal import Decimal
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
+from mcdm_app.mcdm.core import calculate_dense_performance_scores, normalize_matrix, validate_weights
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix, as_decision_matrix, pivot_scores, rank_options
+from mcdm_app.mcdm.profiling import profiled_stage
 
+FLOAT_PRECISIONS = {"float64": np.float64, "float32": np.float32}
+PRECISIONS = ("exact", *FLOAT_PRECISIONS)
+DEVIATION_SAMPLE_SEED = 0
+DEFAULT_DEVIATION_SAMPLE = 10
+
+
+@profiled_stage
 def calculate_normalized_weighted_scores(scores: pd.DataFrame) -> pd.DataFrame:
     normalization_factor = scores
     normalization_factor["SqueredScore"] = normalization_factor["Score"] ** Decimal("2")
@@ -23,6 +37,7 @@ def calculate_normalized_weighted_scores(scores: pd.DataFrame) -> pd.DataFrame:
     return normalized_weighted
 
 
+@profiled_stage
 def calculate_ideal_best_and_worst(normalized_weighted_scores: pd.DataFrame) -> pd.DataFrame:
     positive_criteria = normalized_weighted_scores[~normalized_weighted_scores["Is Negative"]]
     best_positive = (
@@ -65,6 +80,7 @@ def calculate_ideal_best_and_worst(normalized_weighted_scores: pd.DataFrame) ->
     return with_ideal_best_and_worst
 
 
+@profiled_stage
 def calculate_euclidian_distance(ideal_best_and_worst: pd.DataFrame) -> pd.DataFrame:
     ideal_best_and_worst["EuclidianDistanceBest"] = (
         ideal_best_and_worst["NormalizedWeightedScore"] - ideal_best_and_worst["IdealBest"]
@@ -82,6 +98,7 @@ def calculate_euclidian_distance(ideal_best_and_worst: pd.DataFrame) -> pd.DataF
     return euclidian_distance
 
 
+@profiled_stage
 def calculate_performance_score(euclidian_distance: pd.DataFrame) -> pd.DataFrame:
     euclidian_distance["Performance Score"] = euclidian_distance["EuclidianDistanceWorst"] / (
         euclidian_distance["EuclidianDistanceBest"] + euclidian_distance["EuclidianDistanceWorst"]
@@ -92,7 +109,245 @@ def calculate_performance_score(euclidian_distance: pd.DataFrame) -> pd.DataFram
     return euclidian_distance
 
 
-def calculate_topsis(scores: pd.DataFrame) -> pd.DataFrame:
+def calculate_segmented_performance_scores(
+    matrix: np.ndarray, segment_starts: np.ndarray, weights: np.ndarray, is_negative: np.ndarray
+) -> np.ndarray:
+    """Score many independent problems stacked row-wise, each starting at a row in `segment_starts`.
+
+    `weights` holds one row per problem; every problem needs at least one option.
+    """
+    segment_lengths = np.diff(segment_starts, append=len(matrix))
+    scale = np.repeat(weights / np.sqrt(np.add.reduceat(np.square(matrix), segment_starts)), segment_lengths, axis=0)
+    column_max = np.repeat(np.maximum.reduceat(matrix, segment_starts), segment_lengths, axis=0)
+    column_min = np.repeat(np.minimum.reduceat(matrix, segment_starts), segment_lengths, axis=0)
+
+    distance_best = np.sqrt(np.square((matrix - np.where(is_negative, column_min, column_max)) * scale).sum(axis=1))
+    distance_worst = np.sqrt(np.square((matrix - np.where(is_negative, column_max, column_min)) * scale).sum(axis=1))
+
+    return distance_worst / (distance_best + distance_worst)
+
+
+@profiled_stage
+def calculate_decision_matrix_performance_scores(decision_matrix: DecisionMatrix) -> np.ndarray:
+    scale = decision_matrix.weights / decision_matrix.vector_norms
+    weighted = decision_matrix.weighted_vector_normalized
+
+    distance_best = np.sqrt(np.square(weighted - decision_matrix.best * scale).sum(axis=1))
+    distance_worst = np.sqrt(np.square(weighted - decision_matrix.worst * scale).sum(axis=1))
+
+    return distance_worst / (distance_best + distance_worst)
+
+
+def calculate_dense_topsis(
+    scores: "pd.DataFrame | DecisionMatrix", dtype: type = np.float64, *, deduplicate: bool = False
+) -> pd.DataFrame:
+    decision_matrix = as_decision_matrix(scores, dtype)
+    if deduplicate:
+        # Identical options score identically, so each distinct row is scored once and copied back.
+        distinct, inverse = decision_matrix.deduplicate()
+        performance_scores = calculate_decision_matrix_performance_scores(distinct)[inverse]
+    else:
+        performance_scores = calculate_decision_matrix_performance_scores(decision_matrix)
+    return rank_options(decision_matrix.options, performance_scores)
+
+
+def rank_among(ordering_scores: np.ndarray, scores: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Average ranks of `ordering_scores` given the distinct `scores` of every option scoring at least as high.
+
+    Options tied on a score share the mean of the ranks they span, like the Rank of a full ranking.
+    """
+    descending = np.argsort(-scores)
+    descending_counts = counts[descending]
+    positions = np.searchsorted(-scores[descending], -ordering_scores)
+    higher = np.concatenate([[0], np.cumsum(descending_counts)])[positions]
+    return higher + (descending_counts[positions] + 1) / 2
+
+
+def validate_top_k(k: int) -> None:
+    if k < 1:
+        msg = f"Top-k selection needs k of at least 1, got {k}."
+        raise ValueError(msg)
+
+
+def select_top_k(options: "pd.Index | np.ndarray", performance_scores: np.ndarray, k: int) -> pd.DataFrame:
+    validate_top_k(k)
+    ordering_scores = np.where(np.isnan(performance_scores), -np.inf, performance_scores)
+    k = min(k, len(ordering_scores))
+    if k < len(ordering_scores):
+        # argpartition is not stable, so options tied on the k-th score are taken in input order explicitly.
+        kth_score = -np.partition(-ordering_scores, k - 1)[k - 1]
+        above = np.flatnonzero(ordering_scores > kth_score)
+        top = np.concatenate([above, np.flatnonzero(ordering_scores == kth_score)[: k - len(above)]])
+    else:
+        top = np.arange(k)
+    top = top[np.argsort(-ordering_scores[top], kind="stable")]
+
+    top_scores = performance_scores[top]
+    # Only options scoring at least the lowest survivor can share or precede a survivor's rank.
+    scores, counts = np.unique(
+        ordering_scores[ordering_scores >= ordering_scores[top].min(initial=np.inf)], return_counts=True
+    )
+    return pd.DataFrame(
+        {
+            "Option": np.asarray(options)[top],
+            "Performance Score": top_scores,
+            "Rank": np.where(np.isnan(top_scores), np.nan, rank_among(ordering_scores[top], scores, counts)),
+        }
+    )
+
+
+def calculate_topsis_top_k(scores: pd.DataFrame, k: int) -> pd.DataFrame:
+    options, _, matrix, weights, is_negative = pivot_scores(scores)
+    return select_top_k(options, calculate_dense_performance_scores(matrix, weights, is_negative), k)
+
+
+@dataclass(frozen=True)
+class ScenarioRanking:
+    options: pd.Index
+    criteria: pd.Index
+    scores: np.ndarray
+    ranks: np.ndarray
+
+
+def calculate_topsis_scenarios(
+    scores: pd.DataFrame, scenario_weights: "np.ndarray | pd.DataFrame", chunk_size: int = 1024
+) -> ScenarioRanking:
+    if chunk_size < 1:
+        msg = f"Scenarios are scored in chunks of at least one, got chunk_size={chunk_size}."
+        raise ValueError(msg)
+    options, criteria, matrix, _, is_negative = pivot_scores(scores)
+
+    if isinstance(scenario_weights, pd.DataFrame):
+        scenario_weights = scenario_weights[criteria]
+    weights = validate_weights(scenario_weights)
+    if weights.ndim != 2 or weights.shape[1] != len(criteria):  # noqa: PLR2004
+        msg = f"Scenario weights need shape (scenarios, {len(criteria)}), got {weights.shape}."
+        raise ValueError(msg)
+
+    normalized = normalize_matrix(matrix)
+    column_max = normalized.max(axis=0)
+    column_min = normalized.min(axis=0)
+    squared_distance_best = np.square(normalized - np.where(is_negative, column_min, column_max))
+    squared_distance_worst = np.square(normalized - np.where(is_negative, column_max, column_min))
+
+    performance_scores = np.empty((len(weights), len(options)))
+    ranks = np.empty((len(weights), len(options)))
+    for start in range(0, len(weights), chunk_size):
+        squared_weights = np.square(weights[start : start + chunk_size])
+        distance_best = np.sqrt(squared_weights @ squared_distance_best.T)
+        distance_worst = np.sqrt(squared_weights @ squared_distance_worst.T)
+
+        chunk_scores = distance_worst / (distance_best + distance_worst)
+        performance_scores[start : start + chunk_size] = chunk_scores
+        ranks[start : start + chunk_size] = pd.DataFrame(chunk_scores).rank(axis=1, ascending=False).to_numpy()
+
+    return ScenarioRanking(options, criteria, performance_scores, ranks)
+
+
+class WhatIfSession:
+    """TOPSIS ranking of one matrix that re-ranks new weights from cached per-criterion squared ideal distances.
+
+    Weights are non-negative, so d^2 of every option is its squared gaps weighted by the squared weights and a weight
+    change costs a single options x criteria matrix-vector product.
+    """
+
+    def __init__(self, scores: "pd.DataFrame | DecisionMatrix"):
+        decision_matrix = as_decision_matrix(scores)
+        self.options = decision_matrix.options
+        self.criteria = decision_matrix.criteria
+        self.weights = decision_matrix.weights
+        self._squared_gap_best = decision_matrix.squared_gap_best
+        self._squared_gap_worst = decision_matrix.squared_gap_worst
+
+    def align_weights(self, weights: "Optional[Mapping[str, float] | np.ndarray]" = None) -> np.ndarray:
+        if weights is None:
+            return self.weights
+        if isinstance(weights, Mapping):
+            unknown = set(weights) - set(self.criteria)
+            if unknown:
+                msg = f"Weights given for unknown criteria {sorted(unknown)}."
+                raise ValueError(msg)
+            weights = [
+                weights.get(criterion, weight) for criterion, weight in zip(self.criteria, self.weights, strict=True)
+            ]
+        weights = validate_weights(weights)
+        if weights.shape != self.weights.shape:
+            msg = f"Weights need shape {self.weights.shape}, got {weights.shape}."
+            raise ValueError(msg)
+        return weights
+
+    def performance_scores(self, weights: "Optional[Mapping[str, float] | np.ndarray]" = None) -> np.ndarray:
+        squared_weights = np.square(self.align_weights(weights))
+        distance_best = np.sqrt(self._squared_gap_best @ squared_weights)
+        distance_worst = np.sqrt(self._squared_gap_worst @ squared_weights)
+        return distance_worst / (distance_best + distance_worst)
+
+    def rank(self, weights: "Optional[Mapping[str, float] | np.ndarray]" = None) -> pd.DataFrame:
+        """Options ranked under `weights`, given in criteria order or by name with left-out criteria unchanged."""
+        return rank_options(self.options, self.performance_scores(weights))
+
+
+def calculate_exact_topsis(scores: pd.DataFrame) -> pd.DataFrame:
     return calculate_performance_score(  # pyright: ignore
         calculate_euclidian_distance(calculate_ideal_best_and_worst(calculate_normalized_weighted_scores(scores)))
     )[["Option", "Performance Score", "Rank"]]
+
+
+def to_decimal(value: object) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+@profiled_stage
+def measure_max_score_deviation(
+    frame: pd.DataFrame,
+    approximate: Callable[[pd.DataFrame], pd.DataFrame],
+    exact: Callable[[pd.DataFrame], pd.DataFrame],
+    sample_size: int,
+) -> float:
+    """Largest score gap between the approximate and exact pipelines on `sample_size` randomly chosen options.
+
+    Problems with no more options than the sample are compared in full; a sample size of 0 turns the check off and
+    reports NaN.
+    """
+    if sample_size < 1:
+        return np.nan
+    options = frame["Option"].unique()
+    sample = frame
+    if sample_size < len(options):
+        options = np.random.default_rng(DEVIATION_SAMPLE_SEED).choice(options, sample_size, replace=False)
+        sample = frame[frame["Option"].isin(options)]
+
+    approximate_scores = approximate(sample.copy()).set_index("Option")["Performance Score"]
+    exact_scores = exact(sample.copy()).set_index("Option")["Performance Score"]
+    return float(np.abs(approximate_scores - exact_scores.astype(float)).max())
+
+
+def calculate_topsis(
+    scores: pd.DataFrame,
+    precision: str = "float64",
+    deviation_sample: int = DEFAULT_DEVIATION_SAMPLE,
+    *,
+    deduplicate: bool = False,
+) -> pd.DataFrame:
+    if precision == "exact":
+        if deduplicate:
+            msg = "Deduplication only applies to the float precisions."
+            raise ValueError(msg)
+        performance = calculate_exact_topsis(scores)
+        performance.attrs["max_score_deviation"] = 0.0
+        return performance
+    if precision not in FLOAT_PRECISIONS:
+        msg = f"Unknown precision {precision!r}, expected one of {PRECISIONS}."
+        raise ValueError(msg)
+
+    dtype = FLOAT_PRECISIONS[precision]
+    performance = calculate_dense_topsis(scores, dtype, deduplicate=deduplicate)
+    performance.attrs["max_score_deviation"] = measure_max_score_deviation(
+        scores,
+        lambda sample: calculate_dense_topsis(sample, dtype),
+        lambda sample: calculate_exact_topsis(
+            sample.assign(Score=sample["Score"].map(to_decimal), Weight=sample["Weight"].map(to_decimal))
+        ),
+        deviation_sample,
+    )
+    return performance
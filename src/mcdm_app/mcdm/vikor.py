@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix, as_decision_matrix
+from mcdm_app.mcdm.profiling import profiled_stage
+
+
+def rescale(values: np.ndarray) -> np.ndarray:
+    span = values.max() - values.min()
+    return (values - values.min()) / span if span else np.zeros_like(values)
+
+
+@profiled_stage
+def calculate_vikor_indexes(
+    decision_matrix: DecisionMatrix, strategy_weight: float = 0.5
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    weighted_gap = decision_matrix.ideal_gap * decision_matrix.normalized_weights
+    group_utility = weighted_gap.sum(axis=1)
+    individual_regret = weighted_gap.max(axis=1)
+    compromise = strategy_weight * rescale(group_utility) + (1 - strategy_weight) * rescale(individual_regret)
+    return group_utility, individual_regret, compromise
+
+
+def calculate_vikor(scores: "pd.DataFrame | DecisionMatrix", strategy_weight: float = 0.5) -> pd.DataFrame:
+    """Rank options by the VIKOR compromise index, lowest first; `strategy_weight` favours group utility over regret."""
+    if not 0 <= strategy_weight <= 1:
+        msg = "The strategy weight must be between 0 and 1."
+        raise ValueError(msg)
+
+    decision_matrix = as_decision_matrix(scores)
+    group_utility, individual_regret, compromise = calculate_vikor_indexes(decision_matrix, strategy_weight)
+
+    vikor = pd.DataFrame(
+        {
+            "Option": decision_matrix.options.to_numpy(),
+            "Group Utility": group_utility,
+            "Individual Regret": individual_regret,
+            "Compromise": compromise,
+        }
+    )
+    vikor["Rank"] = vikor["Compromise"].rank()
+
+    return vikor
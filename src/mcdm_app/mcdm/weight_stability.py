@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix
+
+ROOT_TOLERANCE = 1e-12
+
+
+def calculate_pair_crossings(
+    gap_best: np.ndarray,
+    gap_worst: np.ndarray,
+    weights: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+) -> np.ndarray:
+    """Weights at which each option pair swaps order when one criterion weight moves and the others stay put.
+
+    With the weights non-negative, d+^2 and d-^2 of every option are `gap @ weights**2`, so as criterion k moves to
+    t each is `slope * t**2 + rest`. Two options tie when d+_i^2 d-_l^2 = d+_l^2 d-_i^2, a quadratic in t**2. The result
+    has shape (criteria, pairs, 2) and holds NaN where a root is missing or negative.
+    """
+    squared_weights = np.square(weights)
+    distance_best = gap_best @ squared_weights
+    distance_worst = gap_worst @ squared_weights
+    rest_best = (distance_best[:, None] - squared_weights * gap_best).T
+    rest_worst = (distance_worst[:, None] - squared_weights * gap_worst).T
+    slope_best = gap_best.T
+    slope_worst = gap_worst.T
+
+    a = slope_best[:, first] * slope_worst[:, second] - slope_best[:, second] * slope_worst[:, first]
+    b = (
+        slope_best[:, first] * rest_worst[:, second]
+        + rest_best[:, first] * slope_worst[:, second]
+        - slope_best[:, second] * rest_worst[:, first]
+        - rest_best[:, second] * slope_worst[:, first]
+    )
+    c = rest_best[:, first] * rest_worst[:, second] - rest_best[:, second] * rest_worst[:, first]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # The cancellation-free form keeps the finite root accurate as the quadratic degenerates to a line.
+        q = -0.5 * (b + np.copysign(np.sqrt(b * b - 4 * a * c), b))
+        squared_roots = np.stack([q / a, c / q], axis=-1)
+    squared_roots[~np.isfinite(squared_roots) | (squared_roots < 0)] = np.nan
+    return np.sqrt(squared_roots)
+
+
+def calculate_weight_bounds(
+    crossings: np.ndarray, weights: np.ndarray, upper_limit: float = np.inf
+) -> tuple[np.ndarray, np.ndarray]:
+    tolerance = ROOT_TOLERANCE * np.maximum(weights, 1.0)[:, None, None]
+    current = weights[:, None, None]
+    below = np.where(crossings < current - tolerance, crossings, -np.inf).max(axis=(1, 2), initial=-np.inf)
+    above = np.where(crossings > current + tolerance, crossings, np.inf).min(axis=(1, 2), initial=np.inf)
+    return np.maximum(below, 0.0), np.minimum(above, upper_limit)
+
+
+def calculate_weight_stability(scores: pd.DataFrame, *, renormalize: bool = False) -> pd.DataFrame:
+    """Per-criterion weight intervals inside which the TOPSIS top option and the full ranking stay unchanged.
+
+    Every other weight is held fixed, or with `renormalize` scaled so the weights keep summing to one; renormalized
+    intervals are reported on the normalized weight scale.
+    """
+    decision_matrix = DecisionMatrix.from_scores(scores)
+    weights = decision_matrix.normalized_weights if renormalize else decision_matrix.weights
+    gap_best = decision_matrix.squared_gap_best
+    gap_worst = decision_matrix.squared_gap_worst
+
+    distance_best = np.sqrt(gap_best @ np.square(weights))
+    distance_worst = np.sqrt(gap_worst @ np.square(weights))
+    order = np.argsort(-(distance_worst / (distance_best + distance_worst)), kind="stable")
+
+    # The ranking can only change once some pair swaps, and the first pair to swap must be adjacent in it.
+    top_lower, top_upper = calculate_weight_bounds(
+        calculate_pair_crossings(gap_best, gap_worst, weights, np.full(len(order) - 1, order[0]), order[1:]), weights
+    )
+    ranking_lower, ranking_upper = calculate_weight_bounds(
+        calculate_pair_crossings(gap_best, gap_worst, weights, order[:-1], order[1:]), weights
+    )
+    bounds = np.stack([top_lower, top_upper, ranking_lower, ranking_upper], axis=1)
+
+    if renormalize:
+        # Scaling the other weights by (1 - t) / (1 - w) orders options exactly like holding them fixed with this
+        # weight at s = t (1 - w) / (1 - t), so the fixed-weight bounds map back through t = s / (s + 1 - w).
+        remainder = (1 - weights)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bounds = np.where(np.isinf(bounds), 1.0, bounds / (bounds + remainder))
+        bounds = np.nan_to_num(bounds, nan=0.0)
+
+    return pd.DataFrame(
+        {
+            "Criterion": decision_matrix.criteria.to_numpy(),
+            "Weight": weights,
+            "Top Lower": bounds[:, 0],
+            "Top Upper": bounds[:, 1],
+            "Ranking Lower": bounds[:, 2],
+            "Ranking Upper": bounds[:, 3],
+        }
+    )
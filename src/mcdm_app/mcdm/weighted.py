@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix, as_decision_matrix, rank_options
+from mcdm_app.mcdm.profiling import profiled_stage
+
+
+@profiled_stage
+def calculate_weighted_sum_scores(decision_matrix: DecisionMatrix) -> np.ndarray:
+    return decision_matrix.ratio_normalized @ decision_matrix.normalized_weights
+
+
+@profiled_stage
+def calculate_weighted_product_scores(decision_matrix: DecisionMatrix) -> np.ndarray:
+    # Summing weighted logs avoids the underflow a running product hits with many criteria.
+    return np.exp(np.log(decision_matrix.ratio_normalized) @ decision_matrix.normalized_weights)
+
+
+def calculate_wsm(scores: "pd.DataFrame | DecisionMatrix") -> pd.DataFrame:
+    decision_matrix = as_decision_matrix(scores)
+    return rank_options(decision_matrix.options, calculate_weighted_sum_scores(decision_matrix))
+
+
+def calculate_wpm(scores: "pd.DataFrame | DecisionMatrix") -> pd.DataFrame:
+    decision_matrix = as_decision_matrix(scores)
+    return rank_options(decision_matrix.options, calculate_weighted_product_scores(decision_matrix))
@@ -3,10 +3,73 @@ from decimal import Decimal
 import pandas as pd
 import streamlit as st
 
-from mcdm.fuzzy_topsis import TriangularFuzzyNumber, calculate_fuzzy_topsis
+from mcdm_app.mcdm.cache import ScoreCache
+from mcdm_app.mcdm.fuzzy_topsis import TriangularFuzzyNumber, calculate_fuzzy_topsis
+from mcdm_app.mcdm.linguistic import DEFAULT_SCALE, calculate_linguistic_fuzzy_topsis
+from mcdm_app.mcdm.profiling import profile_stages
+from mcdm_app.mcdm.topsis import PRECISIONS
 
 st.set_page_config(page_title="Fuzzy TOPSIS", page_icon="🧶")
 
+
+@st.cache_resource
+def get_score_cache() -> ScoreCache:
+    return ScoreCache(maxsize=64)
+
+
+def to_fuzzy_numbers(frame: pd.DataFrame) -> list[TriangularFuzzyNumber]:
+    return [
+        TriangularFuzzyNumber(Decimal(str(a)), Decimal(str(b)), Decimal(str(c)))
+        for a, b, c in zip(frame["a"], frame["b"], frame["c"], strict=True)
+    ]
+
+
+def build_decision_maker_matrix(scores: pd.DataFrame, weights: pd.DataFrame, criteria: pd.DataFrame) -> pd.DataFrame:
+    scores["Score"] = to_fuzzy_numbers(scores)
+    weights["Weight"] = to_fuzzy_numbers(weights)
+
+    return (
+        scores.drop(columns=["a", "b", "c"])
+        .merge(weights.drop(columns=["a", "b", "c"]), on="Criterion", how="left")
+        .merge(criteria, on="Criterion", how="left")
+    )
+
+
+def build_linguistic_decision_maker_matrix(
+    scores: pd.DataFrame, weights: pd.DataFrame, criteria: pd.DataFrame
+) -> pd.DataFrame:
+    return (
+        scores.rename(columns={"Term": "Score"})
+        .merge(weights.rename(columns={"Term": "Weight"}), on="Criterion", how="left")
+        .merge(criteria, on="Criterion", how="left")
+    )
+
+
+def rank_options(
+    criteria: pd.DataFrame,
+    *decision_makers: pd.DataFrame,
+    precision: str,
+    linguistic: bool = False,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    build = build_linguistic_decision_maker_matrix if linguistic else build_decision_maker_matrix
+    decision_matrix = pd.concat(
+        [
+            score_cache.get_or_compute(build, scores, weights, criteria)
+            if use_cache
+            else build(scores.copy(), weights.copy(), criteria.copy())
+            for scores, weights in zip(decision_makers[::2], decision_makers[1::2], strict=True)
+        ]
+    )
+    decision_matrix["Is Negative"] = decision_matrix["Is Negative"].fillna(False)
+
+    if linguistic:
+        return calculate_linguistic_fuzzy_topsis(decision_matrix, precision=precision)
+    return calculate_fuzzy_topsis(decision_matrix, precision=precision)
+
+
+score_cache = get_score_cache()
+
 st.title("🧶Multi-Criteria Decision Making with Fuzzy TOPSIS")
 
 st.markdown(
@@ -44,6 +107,18 @@ st.markdown(
     "representing the maximum value that the fuzzy number can take.\n"
 )
 
+st.markdown(
+    "Instead of entering *a*, *b* and *c*, decision makers can pick terms from a linguistic scale, each standing "
+    "for a fixed fuzzy number:\n"
+    "\n"
+    + "\n".join(
+        f"- {term}: ({number.a}, {number.b}, {number.c})"
+        for term, number in zip(DEFAULT_SCALE.terms, DEFAULT_SCALE.numbers, strict=True)
+    )
+)
+
+linguistic = st.checkbox("Use linguistic terms", help="Pick scores and weights from the linguistic scale above.")
+
 st.header("Options")
 options = pd.DataFrame(columns=["Option"])
 st.write("Add options in the table below.")
@@ -66,18 +141,17 @@ st.header("Scores and Weights")
 st.write("Add scores to options and weights per decision maker.")
 
 weights = edited_criteria.drop(columns="Is Negative")
-weights["a"] = None
-weights["b"] = None
-weights["c"] = None
-
 scores = edited_options.merge(edited_criteria, how="cross").drop(columns="Is Negative")
-scores["a"] = None
-scores["b"] = None
-scores["c"] = None
 
-for column in ["a", "b", "c"]:
-    weights[column] = weights[column].astype(float)
-    scores[column] = scores[column].astype(float)
+if linguistic:
+    weights["Term"] = pd.Categorical([None] * len(weights), categories=DEFAULT_SCALE.terms)
+    scores["Term"] = pd.Categorical([None] * len(scores), categories=DEFAULT_SCALE.terms)
+else:
+    for column in ["a", "b", "c"]:
+        weights[column] = None
+        scores[column] = None
+        weights[column] = weights[column].astype(float)
+        scores[column] = scores[column].astype(float)
 
 weights_dict = {}
 scores_dict = {}
@@ -93,61 +167,42 @@ for decision_maker_number in range(number_of_decision_makers):
 
 st.header("Options Preference")
 
+precision = st.selectbox(
+    "Precision",
+    PRECISIONS,
+    index=PRECISIONS.index("float64"),
+    help="Exact uses decimal arithmetic; float64 is fast; float32 halves memory for huge matrices.",
+)
+profile_pipeline = st.checkbox(
+    "Profile pipeline stages",
+    help="Records time, rows and allocated memory per stage. Bypasses the score cache and slows the calculation.",
+)
+
 if st.button("Calculate options preference"):
-    decision_matrix = pd.DataFrame(columns=["Option", "Criterion", "Weight", "Score"])
+    decision_makers = []
     for decision_maker_number in range(number_of_decision_makers):
-        scores_dict[decision_maker_number]["a"] = scores_dict[decision_maker_number]["a"].apply(
-            lambda x: Decimal(str(x))
-        )
-        scores_dict[decision_maker_number]["b"] = scores_dict[decision_maker_number]["b"].apply(
-            lambda x: Decimal(str(x))
+        decision_makers.extend([scores_dict[decision_maker_number], weights_dict[decision_maker_number]])
+
+    if profile_pipeline:
+        with profile_stages() as profile:
+            fuzzy_topsis = rank_options(
+                edited_criteria, *decision_makers, precision=precision, linguistic=linguistic, use_cache=False
+            )
+        profile.log()
+    else:
+        fuzzy_topsis = score_cache.get_or_compute(
+            rank_options, edited_criteria, *decision_makers, precision=precision, linguistic=linguistic
         )
-        scores_dict[decision_maker_number]["c"] = scores_dict[decision_maker_number]["c"].apply(
-            lambda x: Decimal(str(x))
-        )
-
-        scores_dict[decision_maker_number]["Score"] = scores_dict[decision_maker_number].apply(
-            lambda row: TriangularFuzzyNumber(
-                row["a"],
-                row["b"],
-                row["c"],
-            ),
-            axis=1,
-        )
-        scores_dict[decision_maker_number] = scores_dict[decision_maker_number].drop(columns=["a", "b", "c"])
-
-        weights_dict[decision_maker_number]["a"] = weights_dict[decision_maker_number]["a"].apply(
-            lambda x: Decimal(str(x))
-        )
-        weights_dict[decision_maker_number]["b"] = weights_dict[decision_maker_number]["b"].apply(
-            lambda x: Decimal(str(x))
-        )
-        weights_dict[decision_maker_number]["c"] = weights_dict[decision_maker_number]["c"].apply(
-            lambda x: Decimal(str(x))
-        )
-
-        weights_dict[decision_maker_number]["Weight"] = weights_dict[decision_maker_number].apply(
-            lambda row: TriangularFuzzyNumber(
-                row["a"],
-                row["b"],
-                row["c"],
-            ),
-            axis=1,
-        )
-
-        weights_dict[decision_maker_number] = weights_dict[decision_maker_number].drop(columns=["a", "b", "c"])
-
-        merged = (
-            scores_dict[decision_maker_number]
-            .merge(weights_dict[decision_maker_number], on="Criterion", how="left")
-            .merge(edited_criteria, on="Criterion", how="left")
-        )
-
-        decision_matrix = pd.concat([decision_matrix, merged])
-
-    decision_matrix["Is Negative"] = decision_matrix["Is Negative"].fillna(False)
-
-    fuzzy_topsis = calculate_fuzzy_topsis(decision_matrix)
     st.dataframe(fuzzy_topsis, hide_index=True)
+    max_score_deviation = fuzzy_topsis.attrs["max_score_deviation"]
+    if pd.notna(max_score_deviation):
+        st.caption(f"Maximum score deviation from exact arithmetic on a sample: {max_score_deviation:.2e}")
+    if profile_pipeline:
+        with st.expander("Stage profile"):
+            st.dataframe(profile.to_frame(), hide_index=True)
+
+st.sidebar.header("Score cache")
+st.sidebar.metric("Hits", score_cache.hits)
+st.sidebar.metric("Misses", score_cache.misses)
 
 st.markdown("Made with ❤️ by Maurycy Blaszczak ([maurycyblaszczak.com](https://maurycyblaszczak.com/))")
@@ -3,10 +3,29 @@ from decimal import Decimal
 import pandas as pd
 import streamlit as st
 
-from mcdm.topsis import calculate_topsis
+from mcdm_app.mcdm.cache import ScoreCache, hash_param
+from mcdm_app.mcdm.profiling import profile_stages
+from mcdm_app.mcdm.topsis import PRECISIONS, WhatIfSession, calculate_topsis
 
 st.set_page_config(page_title="TOPSIS", page_icon="🎯")
 
+
+@st.cache_resource
+def get_score_cache() -> ScoreCache:
+    return ScoreCache(maxsize=64)
+
+
+def rank_options(data_for_topsis: pd.DataFrame, precision: str) -> pd.DataFrame:
+    if precision == "exact":
+        data_for_topsis["Score"] = data_for_topsis["Score"].apply(lambda x: Decimal(str(x)))
+        data_for_topsis["Weight"] = data_for_topsis["Weight"].apply(lambda x: Decimal(str(x)))
+    data_for_topsis["Is Negative"] = data_for_topsis["Is Negative"].fillna(False)
+
+    return calculate_topsis(data_for_topsis, precision=precision)
+
+
+score_cache = get_score_cache()
+
 st.title("🎯Multi-Criteria Decision Making with TOPSIS")
 
 st.markdown(
@@ -47,21 +66,67 @@ edited_criteria_scores = st.data_editor(criteria_scores, num_rows="dynamic")
 
 st.header("Options Preference")
 
+precision = st.selectbox(
+    "Precision",
+    PRECISIONS,
+    index=PRECISIONS.index("float64"),
+    help="Exact uses decimal arithmetic; float64 is fast; float32 halves memory for huge matrices.",
+)
+profile_pipeline = st.checkbox(
+    "Profile pipeline stages",
+    help="Records time, rows and allocated memory per stage. Bypasses the score cache and slows the calculation.",
+)
+
+data_for_topsis = edited_criteria_scores.melt(
+    id_vars=["Criterion", "Weight", "Is Negative"],
+    var_name="Option",
+    value_name="Score",
+)
+complete = not (data_for_topsis["Weight"].isna().any() or data_for_topsis["Score"].isna().any())  # pyright: ignore
+
 if st.button("Calculate options preference"):
-    data_for_topsis = edited_criteria_scores.melt(
-        id_vars=["Criterion", "Weight", "Is Negative"],
-        var_name="Option",
-        value_name="Score",
-    )
-    if data_for_topsis["Weight"].isna().any() or data_for_topsis["Score"].isna().any():  # pyright: ignore
+    if not complete:
         st.error("Please, fill out all Weights and Scores.")
     else:
-        data_for_topsis["Score"] = data_for_topsis["Score"].apply(lambda x: Decimal(str(x)))
-        data_for_topsis["Weight"] = data_for_topsis["Weight"].apply(lambda x: Decimal(str(x)))
-        data_for_topsis["Is Negative"] = data_for_topsis["Is Negative"].fillna(False)
-
-        topsis = calculate_topsis(data_for_topsis)
+        if profile_pipeline:
+            with profile_stages() as profile:
+                topsis = rank_options(data_for_topsis, precision)
+            profile.log()
+        else:
+            topsis = score_cache.get_or_compute(rank_options, data_for_topsis, precision=precision)
 
         st.dataframe(topsis, hide_index=True)
+        if pd.notna(topsis.attrs["max_score_deviation"]):
+            st.caption(
+                f"Maximum score deviation from exact arithmetic on a sample: {topsis.attrs['max_score_deviation']:.2e}"
+            )
+        if profile_pipeline:
+            with st.expander("Stage profile"):
+                st.dataframe(profile.to_frame(), hide_index=True)
+
+if complete and len(data_for_topsis):
+    st.header("What-if Weights")
+    st.write("Move the sliders to re-rank the options live with other weights.")
+
+    what_if = score_cache.get_or_compute(WhatIfSession, data_for_topsis.fillna({"Is Negative": False}))
+    max_weight = float(max(1.0, 2 * what_if.weights.max()))
+    # Keying the sliders on the table's weights starts them over whenever the table is edited.
+    table_weights = hash_param(what_if.weights)
+    what_if_weights = {
+        criterion: st.slider(
+            str(criterion),
+            0.0,
+            max_weight,
+            float(weight),
+            step=max_weight / 100,
+            key=f"what_if_{criterion}_{table_weights}",
+        )
+        for criterion, weight in zip(what_if.criteria, what_if.weights, strict=True)
+    }
+    st.dataframe(what_if.rank(what_if_weights), hide_index=True)
+
+st.sidebar.header("Score cache")
+st.sidebar.metric("Hits", score_cache.hits)
+st.sidebar.metric("Misses", score_cache.misses)
 
 st.markdown("Made with ❤️ by Maurycy Blaszczak ([maurycyblaszczak.com](https://maurycyblaszczak.com/))")
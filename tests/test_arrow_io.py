@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.arrow_io import (
+    calculate_parquet_topsis,
+    read_decision_matrix,
+    read_fuzzy_decision_matrixes,
+    write_decision_matrix,
+    write_fuzzy_decision_matrixes,
+    write_performance,
+)
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix
+from mcdm_app.mcdm.fuzzy_topsis import calculate_dense_closeness_coefficients, stack_decision_makers
+from mcdm_app.mcdm.topsis import calculate_dense_topsis
+from tests.test_fuzzy_topsis import fuzzy_topsis_in
+from tests.test_topsis import topsis_in
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_decision_matrix_round_trip(tmp_path: Path):
+    path = tmp_path / "matrix.parquet"
+    write_decision_matrix(DecisionMatrix.from_scores(topsis_in), path, row_group_size=2)
+
+    expected = calculate_dense_topsis(topsis_in)
+    result = calculate_dense_topsis(read_decision_matrix(path))
+
+    assert pq.ParquetFile(path).num_row_groups == 3
+    assert result["Option"].tolist() == expected["Option"].tolist()
+    assert result["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+
+
+def test_read_decision_matrix_projects_criteria(tmp_path: Path):
+    path = tmp_path / "matrix.parquet"
+    write_decision_matrix(DecisionMatrix.from_scores(topsis_in), path)
+
+    decision_matrix = read_decision_matrix(path, criteria=["C3", "C1"])
+    expected = calculate_dense_topsis(topsis_in[topsis_in["Criterion"].isin(["C1", "C3"])])
+
+    assert decision_matrix.criteria.tolist() == ["C3", "C1"]
+    assert calculate_dense_topsis(decision_matrix)["Performance Score"].to_numpy() == pytest.approx(
+        expected["Performance Score"].to_numpy()
+    )
+    with pytest.raises(ValueError, match="Unknown criteria"):
+        read_decision_matrix(path, criteria=["C9"])
+
+
+def test_read_decision_matrix_needs_metadata(tmp_path: Path):
+    path = tmp_path / "plain.parquet"
+    pd.DataFrame({"Option": ["O1"], "C1": [1.0]}).to_parquet(path)
+
+    with pytest.raises(ValueError, match="no decision matrix metadata"):
+        read_decision_matrix(path)
+
+
+def test_parquet_topsis_streams_batches(tmp_path: Path):
+    rng = np.random.default_rng(3)
+    decision_matrix = DecisionMatrix(
+        pd.Index([f"O{option}" for option in range(1000)]),
+        pd.Index(["C1", "C2", "C3"]),
+        rng.uniform(1, 10, (1000, 3)),
+        np.array([0.5, 0.3, 0.2]),
+        np.array([False, True, False]),
+    )
+    source, destination = tmp_path / "matrix.parquet", tmp_path / "scores.parquet"
+    write_decision_matrix(decision_matrix, source, row_group_size=128)
+
+    calculate_parquet_topsis(source, destination, batch_rows=100)
+    result = pd.read_parquet(destination)
+    expected = calculate_dense_topsis(decision_matrix)
+
+    assert result["Option"].tolist() == expected["Option"].tolist()
+    assert result["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+    assert result.columns.tolist() == ["Option", "Performance Score"]
+
+
+def test_fuzzy_decision_matrixes_round_trip(tmp_path: Path):
+    path = tmp_path / "fuzzy.parquet"
+    stacked = stack_decision_makers(fuzzy_topsis_in)
+    write_fuzzy_decision_matrixes(stacked, path)
+
+    read = read_fuzzy_decision_matrixes(path)
+
+    np.testing.assert_array_equal(read.scores.values, stacked.scores.values)
+    np.testing.assert_array_equal(read.weights.values, stacked.weights.values)
+    np.testing.assert_array_equal(read.is_negative, stacked.is_negative)
+    assert calculate_dense_closeness_coefficients(*read.combine(), read.is_negative) == pytest.approx(
+        calculate_dense_closeness_coefficients(*stacked.combine(), stacked.is_negative)
+    )
+    assert read_fuzzy_decision_matrixes(path, criteria=["C2"]).scores.values.shape == (2, 3, 1, 3)
+
+
+def test_write_performance(tmp_path: Path):
+    path = tmp_path / "scores.parquet"
+    performance = calculate_dense_topsis(topsis_in)
+    write_performance(performance, path)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(path), performance)
+
+
+def test_missing_pyarrow_is_reported_on_use(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(ImportError, match="requires pyarrow"):
+        write_decision_matrix(DecisionMatrix.from_scores(topsis_in), tmp_path / "matrix.parquet")
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mcdm_app.mcdm.cache import ScoreCache, hash_frame
+from mcdm_app.mcdm.topsis import calculate_topsis
+from tests.test_topsis import topsis_in
+
+
+def test_hash_frame_is_content_addressed():
+    assert hash_frame(topsis_in.copy()) == hash_frame(topsis_in.copy())
+    assert hash_frame(topsis_in.head(19)) != hash_frame(topsis_in)
+    assert hash_frame(pd.DataFrame({"Score": [1.0]})) != hash_frame(pd.DataFrame({"Weight": [1.0]}))
+
+
+def test_repeated_inputs_hit_the_cache():
+    cache = ScoreCache()
+
+    first = cache.get_or_compute(calculate_topsis, topsis_in)
+    first["Rank"] = 0
+    second = cache.get_or_compute(calculate_topsis, topsis_in.copy())
+    cache.get_or_compute(calculate_topsis, topsis_in, precision="exact")
+
+    assert second["Rank"].tolist() == [3.0, 5.0, 1.0, 2.0, 4.0]
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 2, "maxsize": 64}
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = ScoreCache(maxsize=2)
+    frames = [topsis_in.head(size) for size in (12, 16, 20)]
+
+    for frame in frames:
+        cache.get_or_compute(len, frame)
+    cache.get_or_compute(len, frames[0])
+
+    assert cache.stats() == {"hits": 0, "misses": 4, "size": 2, "maxsize": 2}
+
+
+def test_concurrent_sessions_share_one_cache():
+    cache = ScoreCache(maxsize=3)
+    frames = [topsis_in.head(size) for size in (4, 8, 12, 16, 20)]
+
+    def session(offset: int) -> None:
+        for step in range(200):
+            cache.get_or_compute(len, frames[(offset + step) % len(frames)])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(session, range(8)))
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 200
+    assert stats["size"] == 3
+
+
+def test_array_parameters_are_keyed_by_content():
+    cache = ScoreCache()
+    first = np.zeros(2000)
+    second = first.copy()
+    second[1000] = 1
+
+    assert repr(first) == repr(second)
+    assert cache.get_or_compute(lambda values: float(values.sum()), values=first) == 0
+    assert cache.get_or_compute(lambda values: float(values.sum()), values=second) == 1
+    assert cache.get_or_compute(lambda series: series["Bob"], series=pd.Series({"Ann": 0.0, "Bob": 1.0})) == 1
+    assert cache.get_or_compute(lambda series: series["Bob"], series=pd.Series({"Bob": 0.0, "Ann": 1.0})) == 0
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from mcdm_app.mcdm.cli import main, score_batch
+from tests.test_fuzzy_topsis import fuzzy_topsis_in
+from tests.test_topsis import topsis_in
+
+
+def crisp_problem(problem_id: str) -> dict:
+    return {"id": problem_id, "scores": topsis_in.astype({"Score": float, "Weight": float}).to_dict("records")}
+
+
+def fuzzy_problem(problem_id: str) -> dict:
+    scores = fuzzy_topsis_in.copy()
+    for column in ["Score", "Weight"]:
+        scores[column] = [[float(number.a), float(number.b), float(number.c)] for number in scores[column]]
+    return {"id": problem_id, "method": "fuzzy_topsis", "scores": scores.to_dict("records")}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_keeps_input_order_and_reports_failures(tmp_path, workers):
+    source = tmp_path / "problems.jsonl"
+    problems = [crisp_problem(f"crisp-{index}") for index in range(5)]
+    problems.insert(2, {"id": "broken", "scores": [{"Option": "A"}]})
+    problems.insert(4, fuzzy_problem("fuzzy"))
+    source.write_text("\n".join(json.dumps(problem) for problem in problems) + "\n\nnot json\n")
+
+    processed, failures = score_batch(source, tmp_path / "out.jsonl", workers=workers, chunk_size=2)
+
+    results = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert processed == len(results) == 8
+    assert [result["id"] for result in results] == [*(problem["id"] for problem in problems), "line 9"]
+    assert [failure.split(":")[0] for failure in failures] == ["broken", "line 9"]
+    assert [row["Rank"] for row in results[0]["ranking"]] == [3.0, 5.0, 1.0, 2.0, 4.0]
+    assert [row["Rank"] for row in results[4]["ranking"]] == [1.0, 3.0, 2.0]
+
+
+def test_csv_directory_detects_fuzzy_columns(tmp_path, capsys):
+    problems = tmp_path / "problems"
+    problems.mkdir()
+    topsis_in.to_csv(problems / "a.csv", index=False)
+    scores = fuzzy_topsis_in.copy()
+    for column in ["Score", "Weight"]:
+        for vertex in "abc":
+            scores[f"{column} {vertex}"] = [getattr(number, vertex) for number in scores[column]]
+    scores.drop(columns=["Score", "Weight"]).to_csv(problems / "b.csv", index=False)
+
+    exit_code = main([str(problems), "-o", str(tmp_path / "out.jsonl"), "--workers", "1", "--precision", "exact"])
+
+    results = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert exit_code == 0
+    assert [result["id"] for result in results] == ["a", "b"]
+    assert [row["Rank"] for row in results[1]["ranking"]] == [1.0, 3.0, 2.0]
+    assert "Scored 2/2 problems" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("workers", ["0", "-2"])
+def test_workers_must_be_positive(tmp_path, capsys, workers):
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "problems.jsonl"), "-o", str(tmp_path / "results.jsonl"), "--workers", workers])
+
+    assert "expected a positive integer" in capsys.readouterr().err
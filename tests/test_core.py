@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.core import fuzzy_topsis, rank_descending, topsis
+from mcdm_app.mcdm.decision_matrix import pivot_scores
+from mcdm_app.mcdm.fuzzy_topsis import calculate_dense_fuzzy_topsis, stack_decision_makers
+from mcdm_app.mcdm.topsis import calculate_dense_topsis
+from tests.test_fuzzy_topsis import fuzzy_topsis_in
+from tests.test_topsis import topsis_in
+
+
+def test_core_import_skips_pandas():
+    code = "import sys, mcdm_app.mcdm.core; print(sorted({'pandas', 'streamlit'} & set(sys.modules)))"
+    loaded = subprocess.run(
+        [sys.executable, "-c", code],  # noqa: S603
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+
+    assert loaded.stdout.strip() == "[]"
+
+
+def test_topsis_on_arrays_and_frames():
+    expected = calculate_dense_topsis(topsis_in)
+    options, _, matrix, weights, is_negative = pivot_scores(topsis_in)
+
+    from_arrays = topsis(matrix.tolist(), weights.tolist(), is_negative.tolist(), options=options.tolist())
+    from_frame = topsis(topsis_in)
+
+    for ranking in (from_arrays, from_frame):
+        assert ranking.options.tolist() == expected["Option"].tolist()
+        assert ranking.scores == pytest.approx(expected["Performance Score"].to_numpy())
+        assert ranking.ranks.tolist() == expected["Rank"].tolist()
+
+
+def test_fuzzy_topsis_on_arrays_and_frames():
+    expected = calculate_dense_fuzzy_topsis(fuzzy_topsis_in)
+    stacked = stack_decision_makers(fuzzy_topsis_in)
+
+    from_arrays = fuzzy_topsis(stacked.scores.values, stacked.weights.values, stacked.is_negative)
+    from_frame = fuzzy_topsis(fuzzy_topsis_in)
+
+    assert from_arrays.options.tolist() == [0, 1, 2]
+    assert from_frame.options.tolist() == expected["Option"].tolist()
+    for ranking in (from_arrays, from_frame):
+        assert ranking.scores == pytest.approx(expected["Performance Score"].to_numpy())
+        assert ranking.ranks.tolist() == expected["Rank"].tolist()
+    with pytest.raises(ValueError, match="Fuzzy scores need shape"):
+        fuzzy_topsis(np.ones((3, 2)))
+
+
+def test_fuzzy_topsis_weighs_decision_makers_by_expertise():
+    stacked = stack_decision_makers(fuzzy_topsis_in)
+    expected = fuzzy_topsis(fuzzy_topsis_in.iloc[6:])
+
+    from_arrays = fuzzy_topsis(
+        stacked.scores.values, stacked.weights.values, stacked.is_negative, how="weighted", expertise=[0.0, 1.0]
+    )
+    from_frame = fuzzy_topsis(fuzzy_topsis_in, how="weighted", expertise=np.array([0.0, 1.0]))
+
+    for ranking in (from_arrays, from_frame):
+        assert ranking.scores == pytest.approx(expected.scores)
+
+
+def test_rank_descending_matches_pandas():
+    scores = np.array([0.3, np.nan, 0.7, 0.3, 0.1, 0.7, 0.3])
+
+    np.testing.assert_array_equal(rank_descending(scores), pd.Series(scores).rank(ascending=False).to_numpy())
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray, FuzzyArrayValidationError
+
+
+def test_validation_reports_bad_cells():
+    with pytest.raises(FuzzyArrayValidationError) as error:
+        FuzzyArray([[[1, 2, 3], [-1, 2, 3]], [[2, 4, 3], [1, 1, 1]]])
+    assert error.value.cells == [(0, 1), (1, 0)]
+
+
+def test_scalar_multiply():
+    assert np.array_equal((FuzzyArray([[1, 2, 3]]) * 2).values, [[2, 4, 6]])
+
+
+def test_elementwise_multiply():
+    assert np.array_equal((FuzzyArray([[1, 2, 3]]) * FuzzyArray([[2, 3, 4]])).values, [[2, 6, 12]])
+
+
+def test_broadcast_divide():
+    assert np.array_equal((FuzzyArray([[2, 4, 6], [3, 6, 9]]) / np.array([2, 3])).values, [[1, 2, 3], [1, 2, 3]])
+
+
+def test_elementwise_divide():
+    assert np.array_equal((FuzzyArray([[2, 6, 12]]) / FuzzyArray([[2, 3, 4]])).values, [[1, 2, 3]])
+
+
+def test_power_negative():
+    assert np.allclose((FuzzyArray([[1, 2, 4]]) ** -1).values, [[0.25, 0.5, 1]])
+
+
+def test_arithmetic_does_not_revalidate(monkeypatch: pytest.MonkeyPatch):
+    numbers = FuzzyArray([[1, 2, 4]])
+    monkeypatch.setattr(FuzzyArray, "validate", lambda _: pytest.fail("intermediate was revalidated"))
+
+    assert np.allclose(((numbers * 2 / 2) ** -1).values, [[0.25, 0.5, 1]])
+
+
+def test_combine():
+    numbers = FuzzyArray([[[1, 2, 3]], [[0, 4, 5]], [[0, 6, 7]]])
+
+    assert np.array_equal(numbers.combine(axis=0).values, [[0, 4, 7]])
+    assert np.array_equal(numbers.combine(axis=0, how="max").values, [[1, 6, 7]])
+    assert np.array_equal(numbers.combine(axis=0, how="min").values, [[0, 2, 3]])
+    assert np.array_equal(numbers.combine(axis=-2).values, [[0, 4, 7]])
+
+
+def test_euclidean_distance():
+    assert np.array_equal(FuzzyArray.euclidean_distance(FuzzyArray([[2, 2, 2]]), FuzzyArray([0, 0, 0])), [2])
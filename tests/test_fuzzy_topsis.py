@@ -0,0 +1,174 @@
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray
+from mcdm_app.mcdm.fuzzy_topsis import (
+    TriangularFuzzyNumber,
+    calculate_dense_fuzzy_topsis,
+    calculate_fuzzy_topsis,
+    calculate_fuzzy_topsis_top_k,
+    combine_decision_maker_arrays,
+)
+
+
+def fuzzy(a: str, b: str, c: str) -> TriangularFuzzyNumber:
+    return TriangularFuzzyNumber(Decimal(a), Decimal(b), Decimal(c))
+
+
+fuzzy_topsis_in = pd.DataFrame(
+    {
+        "Option": ["O1", "O1", "O2", "O2", "O3", "O3"] * 2,
+        "Criterion": ["C1", "C2"] * 6,
+        "Is Negative": [False, True] * 6,
+        "Weight": [fuzzy("5", "7", "9"), fuzzy("3", "5", "7")] * 3 + [fuzzy("7", "9", "9"), fuzzy("1", "3", "5")] * 3,
+        "Score": [
+            fuzzy("5", "7", "9"),
+            fuzzy("1", "3", "5"),
+            fuzzy("3", "5", "7"),
+            fuzzy("5", "7", "9"),
+            fuzzy("7", "9", "9"),
+            fuzzy("3", "5", "7"),
+            fuzzy("3", "5", "7"),
+            fuzzy("1", "1", "3"),
+            fuzzy("5", "7", "9"),
+            fuzzy("7", "9", "9"),
+            fuzzy("5", "7", "9"),
+            fuzzy("3", "5", "7"),
+        ],
+    }
+)
+
+
+def test_calculate_fuzzy_topsis_float64():
+    exact = calculate_fuzzy_topsis(fuzzy_topsis_in.copy(), precision="exact")
+    dense = calculate_fuzzy_topsis(fuzzy_topsis_in.copy())
+
+    assert dense["Option"].tolist() == exact["Option"].tolist()
+    assert dense["Rank"].tolist() == exact["Rank"].tolist()
+    assert np.allclose(dense["Performance Score"], exact["Performance Score"].astype(float))
+
+
+def test_calculate_fuzzy_topsis_float32():
+    exact = calculate_fuzzy_topsis(fuzzy_topsis_in.copy(), precision="exact")
+    compact = calculate_fuzzy_topsis(fuzzy_topsis_in.copy(), precision="float32", deviation_sample=2)
+
+    assert compact["Performance Score"].dtype == np.float32
+    assert compact["Rank"].tolist() == exact["Rank"].tolist()
+    assert compact.attrs["max_score_deviation"] < 1e-6
+
+
+def test_calculate_fuzzy_topsis_float64_masks_missing_evaluations():
+    partial = fuzzy_topsis_in.iloc[1:]
+    exact = calculate_fuzzy_topsis(partial.copy(), precision="exact")
+    dense = calculate_fuzzy_topsis(partial.copy())
+
+    assert dense["Rank"].tolist() == exact["Rank"].tolist()
+    assert np.allclose(dense["Performance Score"], exact["Performance Score"].astype(float))
+
+
+def test_calculate_fuzzy_topsis_float64_rejects_unevaluated_cells():
+    with pytest.raises(ValueError):
+        calculate_fuzzy_topsis(fuzzy_topsis_in.drop(index=[0, 6]))
+
+
+def test_combine_decision_maker_arrays():
+    decision_makers = FuzzyArray([[[1, 2, 4]], [[2, 8, 8]], [[np.nan] * 3]], validate=False)
+
+    assert np.array_equal(combine_decision_maker_arrays(decision_makers).values, [[1, 5, 8]])
+    assert np.allclose(combine_decision_maker_arrays(decision_makers, how="geometric").values, [[2**0.5, 4, 32**0.5]])
+    assert np.allclose(
+        combine_decision_maker_arrays(decision_makers, how="weighted", expertise=np.array([3, 1, 5])).values,
+        [[1.25, 3.5, 5]],
+    )
+
+
+def test_calculate_dense_fuzzy_topsis_with_expertise():
+    decision_makers = fuzzy_topsis_in.assign(**{"Decision Maker": ["Ann"] * 6 + ["Bob"] * 6})
+    only_bob = fuzzy_topsis_in.iloc[6:]
+
+    weighted = calculate_dense_fuzzy_topsis(
+        decision_makers, how="weighted", expertise=pd.Series({"Ann": 0.0, "Bob": 1.0})
+    )
+    expected = calculate_fuzzy_topsis(only_bob.copy())
+
+    assert np.allclose(weighted["Performance Score"], expected["Performance Score"])
+
+
+def test_calculate_fuzzy_topsis_passes_aggregation_through():
+    decision_makers = fuzzy_topsis_in.assign(**{"Decision Maker": ["Ann"] * 6 + ["Bob"] * 6})
+    expertise = pd.Series({"Ann": 0.0, "Bob": 1.0})
+
+    weighted = calculate_fuzzy_topsis(decision_makers, how="weighted", expertise=expertise)
+    expected = calculate_fuzzy_topsis(fuzzy_topsis_in.iloc[6:].copy())
+
+    assert np.allclose(weighted["Performance Score"], expected["Performance Score"])
+    assert np.isnan(weighted.attrs["max_score_deviation"])
+    with pytest.raises(ValueError, match="unweighted mean"):
+        calculate_fuzzy_topsis(decision_makers, precision="exact", how="geometric")
+
+
+@pytest.mark.parametrize("how", ["weighted", "geometric"])
+def test_combine_decision_maker_arrays_rejects_cells_without_expertise(how):
+    decision_makers = FuzzyArray([[[1, 2, 4], [1, 2, 4]], [[2, 8, 8], [np.nan] * 3]], validate=False)
+
+    assert np.allclose(
+        combine_decision_maker_arrays(decision_makers, how=how, expertise=np.array([1.0, 0.0])).values,
+        [[1, 2, 4], [1, 2, 4]],
+    )
+    with pytest.raises(ValueError, match="non-zero expertise"):
+        combine_decision_maker_arrays(decision_makers, how=how, expertise=np.array([0.0, 1.0]))
+
+
+def test_calculate_fuzzy_topsis_top_k():
+    exact = calculate_fuzzy_topsis(fuzzy_topsis_in.copy(), precision="exact").sort_values("Rank")
+    top = calculate_fuzzy_topsis_top_k(fuzzy_topsis_in.copy(), k=2)
+
+    assert top["Option"].tolist() == exact["Option"].head(2).tolist()
+    assert top["Rank"].tolist() == [1.0, 2.0]
+
+
+@pytest.mark.parametrize(("how", "expertise"), [("mean", None), ("weighted", pd.Series({0: 1.0, 1: 3.0, 2: 2.0}))])
+def test_calculate_dense_fuzzy_topsis_sharded_across_workers(how, expertise):
+    rng = np.random.default_rng(0)
+    vertices = np.sort(rng.integers(1, 10, (3 * 30 * 7, 2, 3)), axis=-1)
+    decision_matrixes = pd.DataFrame(
+        {
+            "Decision Maker": np.repeat([0, 1, 2], 30 * 7),
+            "Option": np.tile(np.repeat([f"O{option}" for option in range(30)], 7), 3),
+            "Criterion": np.tile([f"C{criterion}" for criterion in range(7)], 3 * 30),
+            "Is Negative": np.tile(np.arange(7) % 3 == 0, 3 * 30),
+            "Score": [fuzzy(*map(str, row)) for row in vertices[:, 0]],
+            "Weight": [fuzzy(*map(str, row)) for row in np.tile(vertices[: 3 * 7, 1], (30, 1))],
+        }
+    ).drop(index=[0, 250, 400])
+
+    serial = calculate_dense_fuzzy_topsis(decision_matrixes, how=how, expertise=expertise)
+    sharded = calculate_dense_fuzzy_topsis(decision_matrixes, how=how, expertise=expertise, workers=3)
+
+    assert np.allclose(sharded["Performance Score"], serial["Performance Score"])
+    assert sharded["Rank"].tolist() == serial["Rank"].tolist()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_calculate_fuzzy_topsis_deduplicates_identical_options(workers):
+    copies = fuzzy_topsis_in[fuzzy_topsis_in["Option"] == "O2"]
+    decision_matrixes = pd.concat([fuzzy_topsis_in, copies.assign(Option="O4"), copies.assign(Option="O5")])
+
+    expected = calculate_fuzzy_topsis(decision_matrixes)
+    result = calculate_fuzzy_topsis(decision_matrixes, workers=workers, deduplicate=True)
+
+    assert result["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+    assert result["Rank"].tolist() == expected["Rank"].tolist()
+    with pytest.raises(ValueError, match="float precisions"):
+        calculate_fuzzy_topsis(decision_matrixes, precision="exact", deduplicate=True)
+
+
+def test_combine_decision_maker_arrays_geometric_ignores_zero_expertise():
+    decision_makers = FuzzyArray([[[0, 1, 2]], [[2, 8, 8]]], validate=False)
+
+    combined = combine_decision_maker_arrays(decision_makers, how="geometric", expertise=np.array([0, 1]))
+
+    assert np.allclose(combined.values, [[2, 8, 8]])
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.incremental import IncrementalTopsis
+from mcdm_app.mcdm.topsis import calculate_topsis
+from tests.test_topsis import topsis_in
+
+
+def assert_matches_full_recompute(topsis: IncrementalTopsis, scores: pd.DataFrame):
+    expected = calculate_topsis(scores.copy())
+    actual = topsis.performance_scores()
+
+    assert actual["Option"].tolist() == expected["Option"].tolist()
+    assert np.allclose(actual["Performance Score"], expected["Performance Score"])
+    assert actual["Rank"].tolist() == expected["Rank"].tolist()
+
+
+def test_from_scores_matches_full_recompute():
+    assert_matches_full_recompute(IncrementalTopsis.from_scores(topsis_in.copy()), topsis_in)
+
+
+def test_insert_update_delete_match_full_recompute():
+    topsis = IncrementalTopsis.from_scores(topsis_in.copy())
+    scores = topsis_in[["Criterion", "Weight", "Is Negative", "Option", "Score"]].copy()
+    scores["Score"] = scores["Score"].astype(float)
+
+    topsis.insert("O6", {"C1": 150.0, "C2": 40.0, "C3": 20.0, "C4": 1.0})
+    new_option = scores[scores["Option"] == "O1"].assign(Option="O6", Score=[150.0, 40.0, 20.0, 1.0])
+    scores = pd.concat([scores, new_option], ignore_index=True)
+    assert_matches_full_recompute(topsis, scores)
+
+    topsis.delete("O6")
+    scores = scores[scores["Option"] != "O6"]
+    assert_matches_full_recompute(topsis, scores)
+
+    topsis.update("O3", [310.0, 30.0, 16.0, 4.0])
+    scores.loc[scores["Option"] == "O3", "Score"] = [310.0, 30.0, 16.0, 4.0]
+    assert_matches_full_recompute(topsis, scores)
+
+    topsis.delete("O2")
+    scores = scores[scores["Option"] != "O2"]
+    assert_matches_full_recompute(topsis, scores)
+    assert len(topsis) == 4
+
+
+def test_insert_existing_option():
+    topsis = IncrementalTopsis.from_scores(topsis_in.copy())
+
+    with pytest.raises(KeyError):
+        topsis.insert("O1", [1.0, 1.0, 1.0, 1.0])
+
+
+def test_sum_of_squares_is_recomputed_after_large_scores_return_to_small():
+    topsis = IncrementalTopsis(["C1", "C2"], [0.5, 0.5], [False, True])
+    topsis.insert("O1", [1.0, 2.0])
+    topsis.insert("O2", [3.0, 1.0])
+    for _ in range(10):
+        topsis.update("O1", [1e9, 2.0])
+        topsis.update("O1", [1.0, 2.0])
+    topsis.insert("O3", [2.0, 3.0])
+
+    scores = pd.DataFrame(
+        {
+            "Option": ["O1", "O1", "O2", "O2", "O3", "O3"],
+            "Criterion": ["C1", "C2"] * 3,
+            "Weight": [0.5, 0.5] * 3,
+            "Is Negative": [False, True] * 3,
+            "Score": [1.0, 2.0, 3.0, 1.0, 2.0, 3.0],
+        }
+    )
+    assert_matches_full_recompute(topsis, scores)
+
+
+def test_performance_scores_are_returned_as_a_copy():
+    topsis = IncrementalTopsis.from_scores(topsis_in.copy())
+
+    topsis.performance_scores()["Rank"] = 0
+
+    assert_matches_full_recompute(topsis, topsis_in)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.fuzzy_topsis import calculate_dense_fuzzy_topsis
+from mcdm_app.mcdm.linguistic import (
+    DEFAULT_SCALE,
+    LinguisticScale,
+    calculate_dense_linguistic_fuzzy_topsis,
+    calculate_linguistic_fuzzy_topsis,
+    to_fuzzy_decision_matrixes,
+)
+from tests.test_fuzzy_topsis import fuzzy_topsis_in
+
+TERMS = {number: term for term, number in zip(DEFAULT_SCALE.terms, DEFAULT_SCALE.numbers, strict=True)}
+
+
+def to_terms(decision_matrixes: pd.DataFrame) -> pd.DataFrame:
+    return decision_matrixes.assign(
+        Score=decision_matrixes["Score"].map(TERMS), Weight=decision_matrixes["Weight"].map(TERMS)
+    )
+
+
+def test_scale_interns_fuzzy_numbers():
+    numbers = DEFAULT_SCALE.to_fuzzy_numbers(["High", "Low", "High"])
+
+    assert numbers[0] is numbers[2]
+    assert DEFAULT_SCALE.encode(["Very Low", "Very High"]).tolist() == [0, 4]
+    assert DEFAULT_SCALE.encode(["Medium"]).dtype == np.uint8
+
+
+def test_scale_rejects_unknown_terms():
+    with pytest.raises(ValueError, match="Unknown linguistic terms"):
+        DEFAULT_SCALE.encode(["High", "Huge"])
+
+
+@pytest.mark.parametrize("precision", ["float64", "exact"])
+def test_linguistic_fuzzy_topsis_matches_fuzzy_topsis(precision: str):
+    expected = calculate_dense_fuzzy_topsis(fuzzy_topsis_in)
+    result = calculate_linguistic_fuzzy_topsis(to_terms(fuzzy_topsis_in), precision=precision, deviation_sample=2)
+
+    assert result["Performance Score"].astype(float).to_numpy() == pytest.approx(expected["Performance Score"])
+    assert result["Rank"].tolist() == expected["Rank"].tolist()
+    assert result.attrs["max_score_deviation"] < 1e-12
+
+
+def test_lookup_tables_match_dense_fuzzy_topsis():
+    rng = np.random.default_rng(7)
+    options, criteria = 40, 6
+    weight_scale = LinguisticScale.from_vertices({"Unimportant": ("0", "1", "3"), "Important": ("3", "6", "9")})
+    decision_matrix = pd.DataFrame(
+        {
+            "Option": np.repeat(np.arange(options), criteria),
+            "Criterion": np.tile(np.arange(criteria), options),
+            "Is Negative": np.tile(np.arange(criteria) % 2 == 1, options),
+            "Score": rng.choice(DEFAULT_SCALE.terms, options * criteria),
+            "Weight": rng.choice(weight_scale.terms, options * criteria),
+        }
+    )
+
+    result = calculate_dense_linguistic_fuzzy_topsis(decision_matrix, weight_scale=weight_scale)
+    expected = calculate_dense_fuzzy_topsis(to_fuzzy_decision_matrixes(decision_matrix, DEFAULT_SCALE, weight_scale))
+
+    assert result["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+
+
+def test_term_counts_match_dense_fuzzy_topsis_for_many_decision_makers():
+    rng = np.random.default_rng(11)
+    decision_makers, options, criteria = 25, 12, 4
+    decision_matrix = pd.DataFrame(
+        {
+            "Decision Maker": np.repeat(np.arange(decision_makers), options * criteria),
+            "Option": np.tile(np.repeat(np.arange(options), criteria), decision_makers),
+            "Criterion": np.tile(np.arange(criteria), decision_makers * options),
+            "Is Negative": np.tile(np.arange(criteria) == 0, decision_makers * options),
+            "Score": rng.choice(DEFAULT_SCALE.terms, decision_makers * options * criteria),
+            "Weight": rng.choice(DEFAULT_SCALE.terms, decision_makers * options * criteria),
+        }
+    ).sample(frac=0.8, random_state=0)
+
+    result = calculate_dense_linguistic_fuzzy_topsis(decision_matrix)
+    expected = calculate_dense_fuzzy_topsis(to_fuzzy_decision_matrixes(decision_matrix, DEFAULT_SCALE, DEFAULT_SCALE))
+
+    assert result["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+    assert result["Rank"].tolist() == expected["Rank"].tolist()
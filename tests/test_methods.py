@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from mcdm_app.mcdm.decision_matrix import DecisionMatrix
+from mcdm_app.mcdm.methods import calculate_method_ranks
+from mcdm_app.mcdm.topsis import calculate_dense_performance_scores, calculate_dense_topsis
+from mcdm_app.mcdm.vikor import calculate_vikor
+from mcdm_app.mcdm.weighted import calculate_wpm, calculate_wsm
+from tests.test_topsis import topsis_in
+
+scores = topsis_in.astype({"Score": float, "Weight": float})
+
+
+def test_decision_matrix_computes_each_stage_once():
+    decision_matrix = DecisionMatrix.from_scores(scores)
+
+    assert decision_matrix.best is decision_matrix.best
+    assert decision_matrix.weighted_vector_normalized is decision_matrix.weighted_vector_normalized
+    np.testing.assert_allclose(decision_matrix.best, [200.0, 32.0, 16.0, 5.0])
+    expected = calculate_dense_performance_scores(
+        decision_matrix.matrix, decision_matrix.weights, decision_matrix.is_negative
+    )
+    np.testing.assert_allclose(calculate_dense_topsis(decision_matrix)["Performance Score"], expected)
+
+
+def test_vikor_indexes():
+    vikor = calculate_vikor(scores)
+
+    np.testing.assert_allclose(vikor["Group Utility"], [0.5, 2 / 3, 1 / 3, 0.520833, 0.5625], rtol=1e-6)
+    np.testing.assert_allclose(vikor["Individual Regret"], 0.25)
+    np.testing.assert_allclose(vikor["Compromise"], [0.25, 0.5, 0.0, 0.28125, 0.34375])
+    assert vikor["Rank"].tolist() == [2.0, 5.0, 1.0, 3.0, 4.0]
+
+
+def test_weighted_sum_and_product():
+    np.testing.assert_allclose(calculate_wsm(scores)["Performance Score"][0], (0.8 + 0.5 + 0.75 + 1.0) / 4)
+    np.testing.assert_allclose(calculate_wpm(scores)["Performance Score"][0], (0.8 * 0.5 * 0.75 * 1.0) ** 0.25)
+
+    with pytest.raises(ValueError, match="strictly positive"):
+        calculate_wpm(scores.assign(Score=scores["Score"] - 16))
+
+
+def test_method_ranks_share_one_decision_matrix():
+    ranks = calculate_method_ranks(scores)
+
+    assert ranks.columns.tolist() == ["Option", "TOPSIS Rank", "VIKOR Rank", "WSM Rank", "WPM Rank"]
+    assert ranks["TOPSIS Rank"].tolist() == [3.0, 5.0, 1.0, 2.0, 4.0]
+    assert ranks["WSM Rank"].tolist() == [2.0, 5.0, 1.0, 3.0, 4.0]
+    with pytest.raises(ValueError, match="Unknown methods"):
+        calculate_method_ranks(scores, ["ELECTRE"])
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from mcdm_app.mcdm.fuzzy_topsis import calculate_fuzzy_topsis, stack_decision_makers
+from mcdm_app.mcdm.online_aggregation import OnlineDecisionMakerAggregator
+from tests.test_fuzzy_topsis import fuzzy_topsis_in
+
+
+def test_online_aggregation_matches_fuzzy_topsis():
+    aggregator = OnlineDecisionMakerAggregator(["O1", "O2", "O3"], ["C1", "C2"], [False, True])
+    for respondent in (fuzzy_topsis_in.iloc[:6], fuzzy_topsis_in.iloc[6:]):
+        aggregator.add(respondent)
+
+    expected = calculate_fuzzy_topsis(fuzzy_topsis_in)
+    result = calculate_fuzzy_topsis(aggregator.to_decision_matrix())
+
+    assert aggregator.evaluations == len(fuzzy_topsis_in)
+    assert result["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+    assert result["Rank"].tolist() == expected["Rank"].tolist()
+    assert aggregator.calculate_closeness_coefficients() == pytest.approx(expected["Performance Score"].to_numpy())
+
+
+def test_online_aggregation_matches_stacked_combination():
+    aggregator = OnlineDecisionMakerAggregator.from_decision_matrixes(fuzzy_topsis_in)
+    scores, weights = aggregator.combined()
+    expected_scores, expected_weights = stack_decision_makers(fuzzy_topsis_in).combine()
+
+    np.testing.assert_allclose(scores.values, expected_scores.values)
+    np.testing.assert_allclose(weights.values, expected_weights.values)
+
+
+def test_online_aggregation_rejects_unknown_cells():
+    aggregator = OnlineDecisionMakerAggregator(["O1", "O2", "O3"], ["C1", "C2"], [False, True])
+
+    with pytest.raises(ValueError, match="unknown options or criteria"):
+        aggregator.add(fuzzy_topsis_in.assign(Option="O9"))
+    aggregator.add(fuzzy_topsis_in.iloc[:5])
+    with pytest.raises(ValueError, match="at least one evaluation"):
+        aggregator.combined()
+
+    with pytest.raises(ValueError, match="Invalid triangular fuzzy numbers"):
+        aggregator.add(fuzzy_topsis_in.iloc[5:6].assign(Score=[SimpleNamespace(a=3, b=2, c=1)]))
+    assert aggregator.evaluations == 5
@@ -0,0 +1,57 @@
+import logging
+
+from mcdm_app.mcdm.fuzzy_topsis import calculate_fuzzy_topsis
+from mcdm_app.mcdm.profiling import _active_profile, profile_stages
+from mcdm_app.mcdm.topsis import calculate_topsis
+from tests.test_fuzzy_topsis import fuzzy_topsis_in
+from tests.test_topsis import topsis_in
+
+
+def test_exact_topsis_stages_are_recorded_in_call_order():
+    with profile_stages() as profile:
+        calculate_topsis(topsis_in.copy(), precision="exact")
+
+    stages = profile.to_frame()
+    assert stages["stage"].tolist() == [
+        "calculate_normalized_weighted_scores",
+        "calculate_ideal_best_and_worst",
+        "calculate_euclidian_distance",
+        "calculate_performance_score",
+    ]
+    assert stages["rows_in"].tolist() == [20, 20, 20, 5]
+    assert stages["rows_out"].tolist() == [20, 20, 5, 5]
+    assert (stages["allocated_bytes"] > 0).all()
+    assert profile.to_dict()["seconds"] == stages["seconds"].sum()
+
+
+def test_nested_stages_fold_into_the_enclosing_stage():
+    with profile_stages() as profile:
+        calculate_fuzzy_topsis(fuzzy_topsis_in.copy(), deviation_sample=2)
+
+    stages = profile.to_frame().set_index("stage")
+    deviation = stages.loc["measure_max_score_deviation"]
+    nested = stages[stages["depth"] == 1]
+    assert deviation["depth"] == 0
+    assert "calculate_distance_from_solutions" in nested.index
+    assert deviation["allocated_bytes"] >= nested["allocated_bytes"].max()
+    assert deviation["seconds"] >= nested["seconds"].sum()
+
+
+def test_profiling_is_off_outside_the_context(caplog):
+    with profile_stages(trace_memory=False) as profile:
+        calculate_topsis(topsis_in.copy())
+    calculate_topsis(topsis_in.copy())
+
+    assert _active_profile.get() is None
+    assert profile.to_frame()["allocated_bytes"].isna().all()
+    stages = profile.to_frame()
+    assert stages.loc[stages["depth"] == 0, "stage"].tolist() == [
+        "pivot_scores",
+        "calculate_decision_matrix_performance_scores",
+        "measure_max_score_deviation",
+    ]
+
+    with caplog.at_level(logging.INFO, logger="mcdm_app.mcdm.profiling"):
+        profile.log()
+    assert caplog.records[0].getMessage().startswith("stage=pivot_scores depth=0 seconds=")
+    assert caplog.records[0].mcdm_stage["rows_out"] == 5
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.promethee import (
+    PreferenceFunction,
+    calculate_pairwise_preference_sums,
+    calculate_promethee,
+    calculate_sorted_preference_sums,
+)
+from tests.test_topsis import topsis_in
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        PreferenceFunction(),
+        PreferenceFunction("linear", 0.0, 2.0),
+        PreferenceFunction("linear", 1.0, 3.0),
+        PreferenceFunction("linear", 2.0, 2.0),
+    ],
+)
+def test_sorted_preference_sums_match_pairwise(function):
+    values = np.random.default_rng(0).integers(0, 10, 200).astype(float)
+
+    for sorted_sum, pairwise_sum in zip(
+        calculate_sorted_preference_sums(values, function),
+        calculate_pairwise_preference_sums(values, function),
+        strict=True,
+    ):
+        np.testing.assert_allclose(sorted_sum, pairwise_sum, atol=1e-9)
+
+
+def test_promethee_ranks_long_format_scores():
+    flows = calculate_promethee(topsis_in.astype({"Score": float, "Weight": float}))
+
+    assert flows["Option"].tolist() == ["O1", "O2", "O3", "O4", "O5"]
+    np.testing.assert_allclose(flows["Net Flow"], [0.125, -0.1875, 0.1875, -0.0625, -0.0625])
+    assert flows["Rank"].tolist() == [2.0, 5.0, 1.0, 3.5, 3.5]
+
+
+def test_promethee_methods_agree_on_large_catalogs():
+    rng = np.random.default_rng(1)
+    scores = pd.DataFrame(
+        {
+            "Option": np.repeat(np.arange(300), 3),
+            "Criterion": np.tile(["C1", "C2", "C3"], 300),
+            "Weight": np.tile([0.5, 0.3, 0.2], 300),
+            "Is Negative": np.tile([False, True, False], 300),
+            "Score": rng.normal(50, 10, 900).round(1),
+        }
+    )
+    preference_functions = {"C1": PreferenceFunction("linear", 2.0, 10.0), "C3": PreferenceFunction("linear", 0.0, 5.0)}
+
+    sorted_flows = calculate_promethee(scores, preference_functions, method="sorted")
+    pairwise_flows = calculate_promethee(scores, preference_functions, method="pairwise")
+
+    np.testing.assert_allclose(sorted_flows["Net Flow"], pairwise_flows["Net Flow"], atol=1e-12)
+
+
+def test_invalid_preference_functions_are_rejected():
+    with pytest.raises(ValueError, match="Thresholds"):
+        PreferenceFunction("linear", 3.0, 1.0)
+    with pytest.raises(ValueError, match="unknown criteria"):
+        calculate_promethee(topsis_in.astype({"Score": float, "Weight": float}), {"Speed": PreferenceFunction()})
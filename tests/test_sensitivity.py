@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray
+from mcdm_app.mcdm.fuzzy_topsis import TriangularFuzzyNumber
+from mcdm_app.mcdm.sensitivity import (
+    Perturbation,
+    sample_fuzzy,
+    simulate_fuzzy_topsis_rank_stability,
+    simulate_topsis_rank_stability,
+)
+from tests.test_fuzzy_topsis import fuzzy_topsis_in
+from tests.test_topsis import topsis_in
+
+
+def test_unperturbed_ranking_is_stable():
+    stability = simulate_topsis_rank_stability(
+        topsis_in.copy(),
+        samples=50,
+        weight_perturbation=Perturbation("none"),
+        score_perturbation=Perturbation("none"),
+        workers=1,
+    )
+
+    assert stability.first_rank_probability().to_dict() == {"O1": 0, "O2": 0, "O3": 1, "O4": 0, "O5": 0}
+    assert stability.rank_reversal_counts.sum() == 0
+    assert stability.to_frame()["Mean Rank"].tolist() == [3, 5, 1, 2, 4]
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = simulate_topsis_rank_stability(topsis_in.copy(), samples=1_000, seed=7, workers=1, block_size=100)
+    parallel = simulate_topsis_rank_stability(topsis_in.copy(), samples=1_000, seed=7, workers=2, block_size=100)
+
+    assert np.array_equal(serial.rank_counts, parallel.rank_counts)
+    assert np.array_equal(serial.rank_reversal_counts, parallel.rank_reversal_counts)
+    assert serial.rank_counts.sum(axis=1).tolist() == [1_000] * 5
+
+
+@pytest.mark.parametrize("distribution", ["triangular", "uniform"])
+def test_fuzzy_samples_stay_inside_support(distribution):
+    base = FuzzyArray.from_numbers(fuzzy_topsis_in["Score"]).values
+    a, b, c = base[..., 0], base[..., 1], base[..., 2]
+
+    samples = sample_fuzzy(np.random.default_rng(3), base, Perturbation(distribution, 1.0), 500)
+    assert ((samples >= a) & (samples <= c)).all()
+    assert ((samples < b) & (a < b)).any()
+    assert ((samples > b) & (b < c)).any()
+
+    narrowed = sample_fuzzy(np.random.default_rng(3), base, Perturbation(distribution, 0.5), 500)
+    assert ((narrowed >= b - (b - a) / 2) & (narrowed <= b + (c - b) / 2)).all()
+    assert np.array_equal(sample_fuzzy(np.random.default_rng(3), base, Perturbation(distribution, 0), 5)[0], b)
+
+
+def test_fuzzy_rank_stability_counts_every_sample():
+    stability = simulate_fuzzy_topsis_rank_stability(fuzzy_topsis_in.copy(), samples=500, seed=3, workers=2)
+
+    assert stability.rank_counts.sum() == 500 * 3
+    assert np.isclose(stability.rank_distribution().to_numpy().sum(axis=1), 1).all()
+
+
+def test_rank_stability_needs_a_sample():
+    with pytest.raises(ValueError, match="at least one sample"):
+        simulate_fuzzy_topsis_rank_stability(fuzzy_topsis_in.copy(), samples=0, workers=1)
+
+
+def test_fuzzy_baseline_is_scored_like_the_samples():
+    single = fuzzy_topsis_in.iloc[:6]
+    crisp = single.assign(
+        Score=[TriangularFuzzyNumber(score.b, score.b, score.b) for score in single["Score"]],
+        Weight=[TriangularFuzzyNumber(weight.b, weight.b, weight.b) for weight in single["Weight"]],
+    )
+    stability = simulate_fuzzy_topsis_rank_stability(crisp, samples=50, seed=3, workers=1)
+
+    assert stability.rank_reversal_counts.sum() == 0
+    assert (stability.rank_distribution().to_numpy().argmax(axis=1) + 1).tolist() == stability.baseline_ranks.tolist()
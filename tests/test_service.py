@@ -0,0 +1,170 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from mcdm_app.mcdm import service as service_module
+from mcdm_app.mcdm.core import calculate_dense_closeness_coefficients
+from mcdm_app.mcdm.fuzzy_array import FuzzyArray
+from mcdm_app.mcdm.fuzzy_topsis import calculate_segmented_closeness_coefficients
+from mcdm_app.mcdm.service import ScoringService, parse_crisp_problem
+from mcdm_app.mcdm.topsis import calculate_dense_performance_scores, calculate_segmented_performance_scores
+from tests.test_cli import crisp_problem, fuzzy_problem
+
+
+def test_segmented_scores_match_scoring_each_problem_alone():
+    rng = np.random.default_rng(0)
+    lengths = [3, 2, 5, 2]
+    matrixes = [rng.uniform(1, 10, (length, 4)) for length in lengths]
+    weights = rng.uniform(0, 1, (len(lengths), 4))
+    is_negative = np.array([False, True, False, True])
+
+    scores = calculate_segmented_performance_scores(
+        np.concatenate(matrixes), np.array([0, 3, 5, 10]), weights, is_negative
+    )
+
+    expected = [
+        calculate_dense_performance_scores(matrix, weight, is_negative)
+        for matrix, weight in zip(matrixes, weights, strict=True)
+    ]
+    np.testing.assert_allclose(scores, np.concatenate(expected))
+
+
+def test_segmented_fuzzy_scores_match_scoring_each_problem_alone():
+    rng = np.random.default_rng(0)
+    lengths = [3, 2, 5, 2]
+    scores = [np.sort(rng.uniform(1, 10, (length, 4, 3)), axis=-1) for length in lengths]
+    weights = [np.sort(rng.uniform(0, 1, (length, 4, 3)), axis=-1) for length in lengths]
+    is_negative = np.array([False, True, False, True])
+
+    closeness = calculate_segmented_closeness_coefficients(
+        np.concatenate(scores), np.concatenate(weights), np.array([0, 3, 5, 10]), is_negative
+    )
+
+    expected = [
+        calculate_dense_closeness_coefficients(FuzzyArray(score), FuzzyArray(weight), is_negative)
+        for score, weight in zip(scores, weights, strict=True)
+    ]
+    np.testing.assert_allclose(closeness, np.concatenate(expected))
+
+
+def test_parse_crisp_problem_rejects_negative_weights():
+    body = {
+        "criteria": [{"Criterion": "C1", "Weight": 0.6}, {"Criterion": "C2", "Weight": -0.4}],
+        "options": {"A": [1, 5], "B": [3, 2]},
+    }
+
+    with pytest.raises(ValueError, match="non-negative"):
+        parse_crisp_problem(body)
+
+
+async def request(port: int, method: str, path: str, body: object = None) -> tuple[int, str]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = b"" if body is None else json.dumps(body).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode())
+    writer.write(payload)
+    response = (await reader.read()).decode()
+    writer.close()
+    head, _, text = response.partition("\r\n\r\n")
+    return int(head.split(" ")[1]), text
+
+
+def serve(scenario):
+    async def run():
+        service = ScoringService(port=0, window=0.05)
+        await service.start()
+        try:
+            return await scenario(service)
+        finally:
+            await service.close()
+
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_are_coalesced_into_one_batch():
+    wide = {
+        "criteria": [
+            {"Criterion": "C1", "Weight": 0.6, "Is Negative": False},
+            {"Criterion": "C2", "Weight": 0.4, "Is Negative": True},
+        ],
+        "options": {"A": [1, 5], "B": [3, 2], "C": [2, 9]},
+    }
+
+    async def scenario(service):
+        responses = await asyncio.gather(
+            *(request(service.port, "POST", "/topsis", {**wide, "id": index}) for index in range(6)),
+            request(service.port, "POST", "/topsis", crisp_problem("long")),
+            *(request(service.port, "POST", "/fuzzy-topsis", fuzzy_problem(f"fuzzy-{index}")) for index in range(3)),
+            request(service.port, "POST", "/topsis", {"options": {}}),
+        )
+        return responses, await request(service.port, "GET", "/metrics")
+
+    responses, (_, metrics) = serve(scenario)
+
+    assert [status for status, _ in responses] == [200] * 10 + [400]
+    results = [json.loads(text) for _, text in responses]
+    assert [result["id"] for result in results[:6]] == list(range(6))
+    assert [row["Rank"] for row in results[0]["ranking"]] == [3.0, 1.0, 2.0]
+    assert [row["Rank"] for row in results[6]["ranking"]] == [3.0, 5.0, 1.0, 2.0, 4.0]
+    assert [[row["Rank"] for row in result["ranking"]] for result in results[7:10]] == [[1.0, 3.0, 2.0]] * 3
+    assert 'mcdm_batch_size_count{batcher="crisp"} 2' in metrics
+    assert 'mcdm_batch_size_sum{batcher="crisp"} 7.0' in metrics
+    assert 'mcdm_batch_size_count{batcher="fuzzy"} 1' in metrics
+    assert 'mcdm_batch_size_sum{batcher="fuzzy"} 3.0' in metrics
+    assert 'mcdm_request_duration_seconds_count{route="/topsis",status="200"} 7' in metrics
+
+
+def test_unknown_routes_and_remote_hosts_are_rejected():
+    async def scenario(service):
+        responses = [await request(service.port, "GET", path) for path in ("/nope", "/other", "/topsis")]
+        return responses, await request(service.port, "GET", "/metrics")
+
+    responses, (_, metrics) = serve(scenario)
+    assert [status for status, _ in responses] == [404, 404, 405]
+    assert 'mcdm_request_duration_seconds_count{route="unknown",status="404"} 2' in metrics
+    assert "/nope" not in metrics
+    with pytest.raises(ValueError, match="localhost"):
+        ScoringService(host="0.0.0.0")  # noqa: S104
+
+
+def test_unexpected_errors_get_a_server_error_response(monkeypatch: pytest.MonkeyPatch):
+    def fail(body):
+        raise RuntimeError(body["id"])
+
+    monkeypatch.setattr(service_module, "parse_crisp_problem", fail)
+
+    async def scenario(service):
+        return await request(service.port, "POST", "/topsis", {"id": "boom"})
+
+    status, text = serve(scenario)
+    assert status == 500
+    assert json.loads(text) == {"error": "RuntimeError: boom"}
+
+
+def test_unexpected_errors_inside_a_batch_get_a_server_error_response(monkeypatch: pytest.MonkeyPatch):
+    def fail(*_):
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    monkeypatch.setattr(service_module, "calculate_segmented_performance_scores", fail)
+
+    async def scenario(service):
+        return await asyncio.gather(
+            request(service.port, "POST", "/topsis", crisp_problem("crisp")),
+            request(service.port, "POST", "/topsis", {"precision": "exact", "scores": [{"Option": "A"}]}),
+        )
+
+    assert [status for status, _ in serve(scenario)] == [500, 400]
+
+
+@pytest.mark.parametrize(("length", "status"), [("-5", 400), ("+5", 400), ("abc", 400), (str(2**30), 413)])
+def test_bad_content_lengths_are_rejected(length, status):
+    async def scenario(service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(f"POST /topsis HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+        response = (await reader.read()).decode()
+        writer.close()
+        return int(response.split(" ")[1])
+
+    assert serve(scenario) == status
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.streaming import stream_topsis, stream_topsis_top_k
+from mcdm_app.mcdm.topsis import calculate_topsis
+from tests.test_topsis import topsis_in
+
+wide_in = topsis_in.pivot(index="Option", columns="Criterion", values="Score").astype(float).reset_index()
+criteria_in = topsis_in[["Criterion", "Weight", "Is Negative"]].drop_duplicates()
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_stream_topsis_matches_in_memory(tmp_path, suffix):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / f"options{suffix}"
+    output = tmp_path / f"scores{suffix}"
+    if suffix == ".csv":
+        wide_in.to_csv(source, index=False)
+    else:
+        wide_in.to_parquet(source, index=False)
+
+    statistics = stream_topsis(source, criteria_in, output, chunk_size=2)
+
+    scores = pd.read_csv(output) if suffix == ".csv" else pd.read_parquet(output)
+    expected = calculate_topsis(topsis_in.copy())
+    assert statistics.options == 5
+    assert scores["Option"].tolist() == expected["Option"].tolist()
+    assert np.allclose(scores["Performance Score"], expected["Performance Score"])
+
+
+def test_stream_topsis_top_k(tmp_path):
+    source = tmp_path / "options.csv"
+    wide_in.to_csv(source, index=False)
+
+    top = stream_topsis_top_k(source, criteria_in, k=2, chunk_size=2)
+
+    assert top["Option"].tolist() == ["O3", "O4"]
+    assert top["Rank"].tolist() == [1.0, 2.0]
+
+
+def test_stream_topsis_top_k_ranks_ties_across_chunks(tmp_path):
+    source = tmp_path / "options.csv"
+    pd.concat([wide_in, wide_in[wide_in["Option"] == "O3"].assign(Option="O6")]).to_csv(source, index=False)
+
+    top = stream_topsis_top_k(source, criteria_in, k=1, chunk_size=2)
+
+    assert top["Option"].tolist() == ["O3"]
+    assert top["Rank"].tolist() == [1.5]
+
+
+def test_stream_topsis_top_k_rejects_k_below_one(tmp_path):
+    source = tmp_path / "options.csv"
+    wide_in.to_csv(source, index=False)
+
+    with pytest.raises(ValueError, match="at least 1"):
+        stream_topsis_top_k(source, criteria_in, k=0)
+
+
+def test_stream_topsis_rejects_negative_weights(tmp_path):
+    source = tmp_path / "options.csv"
+    wide_in.to_csv(source, index=False)
+
+    with pytest.raises(ValueError, match="non-negative"):
+        stream_topsis(source, criteria_in.assign(Weight=[0.25, -0.25, 0.25, 0.25]), tmp_path / "scores.csv")
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.core import calculate_dense_performance_scores
+from mcdm_app.mcdm.timeseries import (
+    calculate_snapshot_topsis,
+    iter_snapshot_topsis,
+    stack_snapshots,
+)
+from mcdm_app.mcdm.topsis import calculate_topsis
+from tests.test_topsis import topsis_in
+
+
+def daily_snapshots(days: int) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(5)
+    scores = topsis_in.assign(Score=topsis_in["Score"].astype(float), Weight=topsis_in["Weight"].astype(float))
+    return [scores.assign(Score=scores["Score"] * rng.uniform(0.8, 1.25, len(scores))) for _ in range(days)]
+
+
+def test_snapshot_topsis_matches_independent_rankings():
+    snapshots = daily_snapshots(6)
+    options, criteria, tensor, weights, is_negative = stack_snapshots(snapshots)
+
+    rankings = calculate_snapshot_topsis(tensor, weights, is_negative, options=options, criteria=criteria)
+
+    for day, snapshot in enumerate(snapshots):
+        expected = calculate_topsis(snapshot)
+        assert rankings.scores[day] == pytest.approx(expected["Performance Score"].to_numpy())
+        assert rankings.ranks[day].tolist() == expected["Rank"].tolist()
+    assert np.isnan(rankings.rank_changes[0]).all()
+    np.testing.assert_array_equal(rankings.rank_changes[1:], rankings.ranks[:-1] - rankings.ranks[1:])
+    assert rankings.to_frame().shape == (6 * len(options), 5)
+
+
+def test_rolling_window_pools_normalization():
+    rng = np.random.default_rng(1)
+    tensor = rng.uniform(1, 10, (8, 12, 3))
+    weights = np.array([0.5, 0.3, 0.2])
+    is_negative = np.array([False, True, False])
+
+    rankings = calculate_snapshot_topsis(tensor, weights, is_negative, window=3)
+
+    for day in range(len(tensor)):
+        pooled = tensor[max(0, day - 2) : day + 1].reshape(-1, 3)
+        # Scoring the pooled window and keeping the last snapshot's rows reproduces the rolling normalization.
+        expected = calculate_dense_performance_scores(pooled, weights, is_negative)[-12:]
+        assert rankings.scores[day] == pytest.approx(expected)
+
+
+def test_rolling_topsis_streams_like_the_tensor():
+    snapshots = daily_snapshots(5)
+    _, _, tensor, weights, is_negative = stack_snapshots(snapshots)
+    expected = calculate_snapshot_topsis(tensor, weights, is_negative, window=2)
+
+    streamed = list(iter_snapshot_topsis(iter(snapshots), window=2))
+
+    assert np.concatenate([rankings.scores for rankings in streamed]) == pytest.approx(expected.scores)
+    np.testing.assert_array_equal(np.concatenate([rankings.ranks for rankings in streamed]), expected.ranks)
+    np.testing.assert_array_equal(
+        np.concatenate([rankings.rank_changes for rankings in streamed]), expected.rank_changes
+    )
+    with pytest.raises(ValueError, match="same options"):
+        list(iter_snapshot_topsis([snapshots[0], snapshots[1][snapshots[1]["Option"] != "O1"]]))
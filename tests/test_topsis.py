@@ -1,8 +1,16 @@
 from decimal import Decimal
 
+import numpy as np
 import pandas as pd
+import pytest
 
-from mcdm_app.mcdm.topsis import calculate_topsis
+from mcdm_app.mcdm.topsis import (
+    WhatIfSession,
+    calculate_topsis,
+    calculate_topsis_scenarios,
+    calculate_topsis_top_k,
+    select_top_k,
+)
 
 data_topsis_in = {
     "Criterion": [
@@ -151,4 +159,142 @@ topsis_out["Performance Score"] = topsis_out["Performance Score"].apply(lambda x
 
 
 def test_calculate_topsis():
-    assert calculate_topsis(topsis_in).equals(topsis_out)
+    assert calculate_topsis(topsis_in, precision="exact").equals(topsis_out)
+
+
+def test_calculate_topsis_float64():
+    dense = calculate_topsis(topsis_in.copy())
+
+    assert dense["Option"].tolist() == topsis_out["Option"].tolist()
+    assert dense["Rank"].tolist() == topsis_out["Rank"].tolist()
+    assert np.allclose(dense["Performance Score"], topsis_out["Performance Score"].astype(float))
+
+
+def test_calculate_topsis_float32():
+    compact = calculate_topsis(topsis_in.copy(), precision="float32", deviation_sample=3)
+
+    assert compact["Performance Score"].dtype == np.float32
+    assert compact["Rank"].tolist() == topsis_out["Rank"].tolist()
+    assert 0 < compact.attrs["max_score_deviation"] < 1e-6
+
+
+def test_calculate_topsis_reports_deviation_on_a_sample():
+    assert calculate_topsis(topsis_in.copy()).attrs["max_score_deviation"] < 1e-12
+    assert calculate_topsis(topsis_in.copy(), deviation_sample=3).attrs["max_score_deviation"] < 1e-12
+    assert calculate_topsis(topsis_in.copy(), deviation_sample=50).attrs["max_score_deviation"] < 1e-12
+    assert np.isnan(calculate_topsis(topsis_in.copy(), deviation_sample=0).attrs["max_score_deviation"])
+    assert calculate_topsis(topsis_in.copy(), precision="exact").attrs["max_score_deviation"] == 0
+
+
+def test_calculate_topsis_float64_rejects_missing_scores():
+    with pytest.raises(ValueError):
+        calculate_topsis(topsis_in.iloc[1:])
+
+
+def test_calculate_topsis_unknown_precision():
+    with pytest.raises(ValueError):
+        calculate_topsis(topsis_in.copy(), precision="float16")
+
+
+def test_calculate_topsis_scenarios():
+    scenario_weights = pd.DataFrame({"C1": [0.25, 0.7, 0.1], "C2": [0.25, 0.1, 0.1], "C3": [0.25, 0.1, 0.1]})
+    scenario_weights["C4"] = [0.25, 0.1, 0.7]
+
+    ranking = calculate_topsis_scenarios(topsis_in.copy(), scenario_weights, chunk_size=2)
+
+    assert ranking.scores.shape == (3, 5)
+    for scenario, weights in scenario_weights.iterrows():
+        scenario_in = topsis_in.copy()
+        scenario_in["Weight"] = scenario_in["Criterion"].map(weights)
+        expected = calculate_topsis(scenario_in)
+
+        assert np.allclose(ranking.scores[scenario], expected["Performance Score"])
+        assert np.array_equal(ranking.ranks[scenario], expected["Rank"])
+
+
+@pytest.mark.parametrize(
+    ("scenario_weights", "chunk_size", "match"),
+    [
+        (np.array(0.25), 1024, "shape"),
+        (np.full(4, 0.25), 1024, "shape"),
+        (np.full((2, 3), 0.25), 1024, "shape"),
+        (np.full((2, 4), 0.25), 0, "chunk_size=0"),
+    ],
+)
+def test_calculate_topsis_scenarios_rejects_bad_input(scenario_weights, chunk_size, match):
+    with pytest.raises(ValueError, match=match):
+        calculate_topsis_scenarios(topsis_in.copy(), scenario_weights, chunk_size=chunk_size)
+
+
+def test_calculate_topsis_top_k():
+    top = calculate_topsis_top_k(topsis_in.copy(), k=3)
+
+    assert top["Option"].tolist() == ["O3", "O4", "O1"]
+    assert top["Rank"].tolist() == [1.0, 2.0, 3.0]
+    assert np.allclose(top["Performance Score"], topsis_out["Performance Score"].astype(float)[[2, 3, 0]])
+    assert len(calculate_topsis_top_k(topsis_in.copy(), k=10)) == 5
+    with pytest.raises(ValueError, match="at least 1"):
+        calculate_topsis_top_k(topsis_in.copy(), k=0)
+
+
+def test_select_top_k_keeps_the_earliest_of_tied_options():
+    scores = np.tile([0.5, 0.2, 0.5, 0.9], 50)
+
+    top = select_top_k(np.arange(len(scores)), scores, k=60)
+
+    assert top["Option"].tolist() == [*range(3, 200, 4), 0, 2, 4, 6, 8, 10, 12, 14, 16, 18]
+    assert top["Rank"].tolist() == [25.5] * 50 + [100.5] * 10
+
+
+def test_calculate_topsis_top_k_ranks_ties_like_the_full_ranking():
+    tied = pd.concat([topsis_in, topsis_in[topsis_in["Option"] == "O3"].assign(Option="O6")], ignore_index=True)
+    expected = calculate_topsis(tied.copy()).set_index("Option")["Rank"]
+
+    top = calculate_topsis_top_k(tied.copy(), k=1)
+
+    assert top["Rank"].tolist() == [1.5]
+    assert top["Rank"].tolist() == expected[top["Option"]].tolist()
+
+
+def test_what_if_session_matches_topsis():
+    session = WhatIfSession(topsis_in.copy())
+
+    assert session.rank()["Performance Score"].to_numpy() == pytest.approx(
+        calculate_topsis(topsis_in.copy())["Performance Score"].to_numpy()
+    )
+
+    weights = {"C1": 0.7, "C4": 0.05}
+    scenario_in = topsis_in.copy()
+    scenario_in["Weight"] = scenario_in["Criterion"].map(weights).fillna(scenario_in["Weight"])
+    expected = calculate_topsis(scenario_in)
+    ranking = session.rank(weights)
+
+    assert ranking["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+    assert ranking["Rank"].tolist() == expected["Rank"].tolist()
+    with pytest.raises(ValueError, match="unknown criteria"):
+        session.rank({"C9": 1.0})
+    with pytest.raises(ValueError, match="non-negative"):
+        session.rank(np.array([0.5, -0.1, 0.3, 0.3]))
+
+
+def test_calculate_topsis_deduplicates_identical_options():
+    copies = topsis_in[topsis_in["Option"].isin(["O1", "O3"])].assign(Option=lambda frame: frame["Option"] + "b")
+    scores = pd.concat([topsis_in, copies, copies.assign(Option=lambda frame: frame["Option"] + "c")])
+
+    expected = calculate_topsis(scores.copy())
+    result = calculate_topsis(scores.copy(), deduplicate=True)
+
+    assert result["Option"].tolist() == expected["Option"].tolist()
+    assert result["Performance Score"].to_numpy() == pytest.approx(expected["Performance Score"].to_numpy())
+    assert result["Rank"].tolist() == expected["Rank"].tolist()
+    with pytest.raises(ValueError, match="float precisions"):
+        calculate_topsis(scores.copy(), precision="exact", deduplicate=True)
+
+
+@pytest.mark.parametrize("score", [calculate_topsis, lambda scores: calculate_topsis_top_k(scores, k=2)])
+def test_dense_topsis_rejects_negative_weights(score):
+    negative = topsis_in.copy()
+    negative.loc[negative["Criterion"] == "C2", "Weight"] = -0.25
+
+    with pytest.raises(ValueError, match="non-negative"):
+        score(negative)
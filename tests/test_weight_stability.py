@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm_app.mcdm.topsis import calculate_dense_topsis
+from mcdm_app.mcdm.weight_stability import calculate_weight_stability
+
+rng = np.random.default_rng(3)
+scores = pd.DataFrame(
+    {
+        "Option": np.repeat(np.arange(12), 4),
+        "Criterion": np.tile(["C0", "C1", "C2", "C3"], 12),
+        "Weight": np.tile(rng.uniform(0.1, 1, 4), 12),
+        "Is Negative": np.tile([False, True, False, False], 12),
+        "Score": rng.uniform(1, 10, 48),
+    }
+)
+
+
+def rerun(criterion: str, weight: float, *, renormalize: bool) -> pd.DataFrame:
+    weights = scores.drop_duplicates("Criterion").set_index("Criterion")["Weight"]
+    if renormalize:
+        weights = weights / weights.sum()
+        weights = weights * (1 - weight) / (1 - weights[criterion])
+    weights[criterion] = weight
+    return calculate_dense_topsis(scores.assign(Weight=scores["Criterion"].map(weights)))
+
+
+@pytest.mark.parametrize("renormalize", [False, True])
+def test_bounds_match_brute_force_reruns(renormalize):
+    baseline = calculate_dense_topsis(scores)
+    stability = calculate_weight_stability(scores, renormalize=renormalize)
+
+    for criterion, lower, upper, top_lower, top_upper in stability[
+        ["Criterion", "Ranking Lower", "Ranking Upper", "Top Lower", "Top Upper"]
+    ].itertuples(index=False):
+        for weight in np.linspace(lower, upper, 7)[1:-1]:
+            assert rerun(criterion, weight, renormalize=renormalize)["Rank"].equals(baseline["Rank"])
+        for bound, outside in [(lower, lower - 1e-7), (upper, upper + 1e-7)]:
+            if 0 < bound < (1 if renormalize else np.inf):
+                assert not rerun(criterion, outside, renormalize=renormalize)["Rank"].equals(baseline["Rank"])
+
+        top = baseline.loc[baseline["Rank"] == 1, "Option"].item()
+        for weight in [top_lower, min(top_upper, top_lower + 10)]:
+            ranks = rerun(criterion, weight + (1e-7 if weight == top_lower else -1e-7), renormalize=renormalize)
+            assert ranks.loc[ranks["Rank"] == 1, "Option"].item() == top
+
+
+def test_renormalized_bounds_stay_on_the_unit_interval():
+    stability = calculate_weight_stability(scores, renormalize=True)
+
+    np.testing.assert_allclose(stability["Weight"].sum(), 1.0)
+    assert (stability[["Top Lower", "Ranking Lower"]] >= 0).all().all()
+    assert (stability[["Top Upper", "Ranking Upper"]] <= 1).all().all()
+    assert (stability["Ranking Lower"] <= stability["Weight"]).all()
+    assert (stability["Weight"] <= stability["Ranking Upper"]).all()